@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Fault-injection harness for the scrapers
+
+Runs each scraper mode against the stub API (stub_api.py) twice - once
+clean, once injecting 429s with Retry-After, 503s, connection resets,
+truncated bodies and responses slower than the client timeout - and
+reports, per mode and concurrency:
+
+  delivered/s     effective throughput (records actually obtained)
+  amplification   upstream requests per record asked for
+  lost            records the scraper gave up on (None, or (0, "") for RSS)
+  wrong           records delivered but different from the source
+
+Modes:
+  talk-details     fetch_talk_details_concurrently
+  teacher-details  fetch_item_details("teachers", ...)
+  rss-full         count_talks_from_rss (talk count and last date)
+  rss-latest       count_talks_from_rss(latest_only=True) (last date)
+
+The limiters start fresh for every run, at --limiter-rate (both initial and
+maximum rate) or, with --limiter-rate 0, with the scrapers' own settings.
+
+Usage:
+  python bench/fault_injection.py
+  python bench/fault_injection.py --rate-429 0.2 --retry-after 2 --concurrency 1,4,16 -o faults.json
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from synthetic import BENCH_DIR, api_talk, api_teacher, talk_ids, teacher_ids
+from run_benchmarks import free_port, git_commit, start_process
+from stub_api import FAULTS
+
+MODES = ["talk-details", "teacher-details", "rss-full", "rss-latest"]
+DEFAULT_RATES = {"429": 0.05, "5xx": 0.02, "reset": 0.02, "truncate": 0.02, "slow": 0.01}
+
+
+def stub_stats(base: str) -> Dict[str, Any]:
+    import urllib.request
+    with urllib.request.urlopen(f"{base}/_stats") as r:
+        return json.load(r)
+
+
+def fresh_limiter(template, rate: float):
+    from rate_limiter import AdaptiveRateLimiter
+    if rate > 0:
+        return AdaptiveRateLimiter(rate=rate, min_rate=template.min_rate, max_rate=rate,
+                                   increase=template.increase, decrease=template.decrease, burst=template.burst)
+    return AdaptiveRateLimiter(rate=template.rate, min_rate=template.min_rate, max_rate=template.max_rate,
+                               increase=template.increase, decrease=template.decrease, burst=template.burst)
+
+
+def expected_feeds(n_talks: int, n_teachers: int, seed: int) -> Dict[int, Tuple[int, str]]:
+    """(talk count, last talk date) per teacher, as the feeds should report them."""
+    feeds: Dict[int, Tuple[int, str]] = {}
+    for talk_id in talk_ids(n_talks):
+        talk = api_talk(talk_id, n_talks, n_teachers, seed)
+        count, last = feeds.get(talk["teacher_id"], (0, ""))
+        feeds[talk["teacher_id"]] = (count + 1, max(last, talk["rec_date"][:10]))
+    return feeds
+
+
+def mode_jobs(mode: str, ctx: Dict[str, Any]) -> Tuple[List[int], Callable, Callable[[int, Any], bool]]:
+    """IDs to fetch, a runner yielding (id, result), and a check of one result."""
+    import dharmaseed_scrape_talks as T
+    import dharmaseed_scrape_teachers as S
+    n_talks, n_teachers, seed = ctx["talks"], ctx["teachers"], ctx["seed"]
+
+    if mode == "talk-details":
+        ids = talk_ids(n_talks)[:ctx["items"]]
+        def run(concurrency):
+            T.configure_session_pool(concurrency)
+            return T.fetch_talk_details_concurrently(ids, concurrency)
+        return ids, run, lambda i, r: r == api_talk(i, n_talks, n_teachers, seed)
+
+    ids = teacher_ids(n_teachers)[:ctx["items"]]
+    if mode == "teacher-details":
+        fetch = lambda i: S.fetch_item_details("teachers", i)
+        check = lambda i, r: r == api_teacher(i, seed)
+    elif mode == "rss-full":
+        fetch = S.count_talks_from_rss
+        check = lambda i, r: r == ctx["feeds"].get(i, (0, ""))
+    else:
+        fetch = lambda i: S.count_talks_from_rss(i, latest_only=True)
+        check = lambda i, r: r[1] == ctx["feeds"].get(i, (0, ""))[1]
+    def run(concurrency):
+        S.configure_session_pool(concurrency)
+        return S.map_concurrently(fetch, ids, concurrency)
+    return ids, run, check
+
+
+def is_lost(mode: str, result: Any) -> bool:
+    # The RSS counter reports exhausted retries as a teacher without talks
+    return result is None or (mode.startswith("rss") and result == (0, ""))
+
+
+def run_mode(mode: str, concurrency: int, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    import dharmaseed_scrape_talks as T
+    import dharmaseed_scrape_teachers as S
+    module = T if mode == "talk-details" else S
+    module.LIMITER = fresh_limiter(ctx["limiters"][module.__name__], ctx["limiter_rate"])
+
+    ids, run, check = mode_jobs(mode, ctx)
+    before = stub_stats(ctx["stub_base"])
+    delivered = lost = wrong = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for item_id, result in run(concurrency):
+            if is_lost(mode, result):
+                lost += 1
+            else:
+                delivered += 1
+                wrong += not check(item_id, result)
+        elapsed = time.perf_counter() - started
+    after = stub_stats(ctx["stub_base"])
+
+    requests = after["requests"] - before["requests"]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "items": len(ids),
+        "delivered": delivered,
+        "lost": lost,
+        "wrong": wrong,
+        "requests": requests,
+        "amplification": round(requests / len(ids), 3) if ids else None,
+        "faults": {name: after["faults"][name] - before["faults"][name] for name in FAULTS},
+        "elapsed_s": round(elapsed, 3),
+        "delivered_per_s": round(delivered / elapsed, 2) if elapsed > 0 else None,
+        "final_rate": round(module.LIMITER.rate, 2),
+    }
+
+
+def run_scenario(name: str, fault_rates: Dict[str, float], port: int, args) -> List[Dict[str, Any]]:
+    base = f"http://127.0.0.1:{port}"
+    stub_args = [os.path.join(BENCH_DIR, "stub_api.py"), "--port", str(port),
+                 "--talks", str(args.talks), "--teachers", str(args.teachers), "--seed", str(args.seed),
+                 "--latency-ms", str(args.latency_ms), "--retry-after", str(args.retry_after),
+                 "--slow-ms", str(args.slow_ms)]
+    for fault, rate in fault_rates.items():
+        stub_args += [f"--rate-{fault}", str(rate)]
+    stub = start_process(stub_args, f"{base}/_stats")
+
+    ctx = {
+        "talks": args.talks,
+        "teachers": args.teachers,
+        "seed": args.seed,
+        "items": args.items,
+        "stub_base": base,
+        "limiter_rate": args.limiter_rate,
+        "limiters": args.limiters,
+        "feeds": args.feeds,
+    }
+    results = []
+    try:
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                print(f"  {name}: {mode} x{concurrency}...", file=sys.stderr)
+                result = run_mode(mode, concurrency, ctx)
+                result["scenario"] = name
+                results.append(result)
+    finally:
+        stub.terminate()
+        stub.wait()
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]):
+    print(f"\n{'scenario':<8} {'mode':<16} {'c':>3} {'items':>6} {'lost':>5} {'wrong':>5} "
+          f"{'requests':>8} {'ampl':>6} {'deliv/s':>8} {'elapsed':>8} {'rate':>6}")
+    for r in results:
+        print(f"{r['scenario']:<8} {r['mode']:<16} {r['concurrency']:>3} {r['items']:>6} {r['lost']:>5} "
+              f"{r['wrong']:>5} {r['requests']:>8} {r['amplification']:>6.2f} {r['delivered_per_s']:>8.1f} "
+              f"{r['elapsed_s']:>7.1f}s {r['final_rate']:>6.1f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the scrapers against an upstream injecting faults")
+    parser.add_argument("--talks", type=int, default=5_000, help="Talks in the stub corpus (default: 5000)")
+    parser.add_argument("--teachers", type=int, default=200, help="Teachers in the stub corpus (default: 200)")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus and fault seed (default: 1)")
+    parser.add_argument("--items", type=int, default=150, help="Records fetched per run (default: 150)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated modes (default: all): {', '.join(MODES)}")
+    parser.add_argument("--concurrency", default="1,4", help="Comma-separated concurrency levels (default: 1,4)")
+    parser.add_argument("--latency-ms", type=float, default=5, help="Stub delay per response (default: 5)")
+    for fault in FAULTS:
+        parser.add_argument(f"--rate-{fault}", type=float, default=DEFAULT_RATES[fault],
+                            help=f"Probability of a {fault} fault per request (default: {DEFAULT_RATES[fault]})")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of 429 responses (default: 1)")
+    parser.add_argument("--slow-ms", type=float, default=3000, help="Delay of slow responses (default: 3000)")
+    parser.add_argument("--timeout", type=float, default=2,
+                        help="Client request timeout in seconds (default: 2, so slow responses time out)")
+    parser.add_argument("--limiter-rate", type=float, default=20,
+                        help="Initial and maximum limiter rate in req/s, 0 for the scrapers' own (default: 20)")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the fault-free run")
+    parser.add_argument("--output", "-o", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    args.modes = args.modes.split(",")
+    unknown = [mode for mode in args.modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    fault_rates = {fault: getattr(args, f"rate_{fault}") for fault in FAULTS}
+
+    # The scrapers read DHARMASEED_BASE at import time; every scenario
+    # starts its stub on this port
+    port = free_port()
+    os.environ["DHARMASEED_BASE"] = f"http://127.0.0.1:{port}"
+    import dharmaseed_scrape_talks
+    import dharmaseed_scrape_teachers
+    import rate_limiter
+    rate_limiter.REQUEST_TIMEOUT = args.timeout
+    args.limiters = {module.__name__: module.LIMITER for module in (dharmaseed_scrape_talks, dharmaseed_scrape_teachers)}
+    args.feeds = expected_feeds(args.talks, args.teachers, args.seed)
+
+    results = []
+    if not args.no_baseline:
+        results += run_scenario("clean", {}, port, args)
+    results += run_scenario("faulty", fault_rates, port, args)
+    print_table(results)
+
+    if args.output:
+        report = {
+            "meta": {"commit": git_commit(), "talks": args.talks, "teachers": args.teachers, "seed": args.seed,
+                     "latency_ms": args.latency_ms, "fault_rates": fault_rates, "retry_after": args.retry_after,
+                     "slow_ms": args.slow_ms, "timeout": args.timeout, "limiter_rate": args.limiter_rate},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nSaved fault-injection report -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
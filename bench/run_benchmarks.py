@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite
+
+Times the hot paths of the data pipeline and the local server on a
+synthetic corpus (synthetic.py), with a local stub of the Dharmaseed API
+(stub_api.py) standing in for dharmaseed.org:
+
+  parse_talk                      API records -> Talk
+  save_talks_to_json              write dharmaseed_talks.json
+  load_talk_stats_from_talks_json per-teacher stats from the talks file
+  corpus_memory                   talks file as dicts vs TalkColumns (time, MB)
+  binary_corpus                   build dharmaseed_corpus.bin; cold lookups vs JSON
+  generate_redirects              _redirects from the teachers list
+  scrape_talk_details             talk details from the stub, per concurrency
+  count_talks_rss                 RSS talk counts from the stub
+  server_proxy                    server.py /api/ proxy, cache off and on
+
+Scrapers run with their rate limiters lifted so the numbers measure the
+client, not the politeness delay. Results are written as JSON (with the git
+commit) so runs can be compared across commits.
+
+Usage:
+  python bench/run_benchmarks.py -o before.json
+  python bench/run_benchmarks.py --talks 100000 --compare before.json
+  python bench/run_benchmarks.py --only parse_talk,server_proxy
+"""
+
+import contextlib
+import gc
+import http.client
+import io
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from synthetic import BENCH_DIR, ROOT_DIR, api_talk, talk_ids, teacher_ids, write_corpus
+
+BENCHMARKS = [
+    "parse_talk", "save_talks_to_json", "load_talk_stats_from_talks_json", "corpus_memory", "binary_corpus",
+    "generate_redirects", "scrape_talk_details", "count_talks_rss", "server_proxy",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def start_process(args: List[str], ready_url: str, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, *args], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(ready_url)
+    except OSError:
+        proc.kill()
+        raise
+    return proc
+
+
+def stub_requests(base: str) -> int:
+    with urllib.request.urlopen(f"{base}/_stats") as r:
+        return json.load(r)["requests"]
+
+
+def measure(fn: Callable[[], Any], items: int, repeat: int) -> Dict[str, Any]:
+    """Run fn `repeat` times (output silenced) and summarize the wall times."""
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "min_s": round(min(times), 6),
+        "median_s": round(median, 6),
+        "items_per_s": round(items / median, 1) if median > 0 else None,
+    }
+
+
+# --- benchmarks ---
+
+def bench_parse_talk(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from dharmaseed_scrape_talks import parse_talk
+    records = [api_talk(i, ctx["talks"], ctx["teachers"], ctx["seed"]) for i in talk_ids(ctx["talks"])]
+    return measure(lambda: [parse_talk(r) for r in records], len(records), ctx["repeat"])
+
+
+def bench_save_talks_to_json(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from dharmaseed_scrape_talks import save_talks_to_json
+    output = os.path.join(ctx["tmp_dir"], "saved_talks.json")
+    return measure(lambda: save_talks_to_json(ctx["corpus_talks"], output), len(ctx["corpus_talks"]), ctx["repeat"])
+
+
+def bench_load_talk_stats(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from dharmaseed_scrape_teachers import load_talk_stats_from_talks_json
+    return measure(lambda: load_talk_stats_from_talks_json(ctx["talks_file"]), ctx["talks"], ctx["repeat"])
+
+
+def bench_corpus_memory(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from corpus import load_talks
+    from talk_columns import TalkColumns
+    results = {}
+    for name, load in (("dicts", load_talks), ("columns", TalkColumns.load)):
+        result = measure(lambda: load(ctx["talks_file"]), ctx["talks"], ctx["repeat"])
+        gc.collect()
+        tracemalloc.start()
+        talks = load(ctx["talks_file"])
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del talks
+        result["retained_mb"] = round(retained / 2**20, 1)
+        result["peak_mb"] = round(peak / 2**20, 1)
+        results[name] = result
+    return results
+
+
+def bench_binary_corpus(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from binary_corpus import BinaryCorpus, build_binary_corpus
+    from corpus import load_talks
+    output = os.path.join(ctx["tmp_dir"], "dharmaseed_corpus.bin")
+    talks, teachers = ctx["corpus_talks"], ctx["corpus_teachers"]
+
+    def build():
+        with open(output, "wb") as f:
+            f.write(build_binary_corpus(talks, teachers))
+
+    # Open the file and read a page of talks by id, as a cold reader would
+    ids = [t["id"] for t in talks[::max(1, len(talks) // 50)]]
+
+    def lookup_json():
+        by_id = {t["id"]: t for t in load_talks(ctx["talks_file"])}
+        return [by_id[i] for i in ids]
+
+    def lookup_binary():
+        with BinaryCorpus(output) as corpus:
+            return [corpus.talks.get(i) for i in ids]
+
+    results = {"build": measure(build, len(talks), ctx["repeat"])}
+    results["lookup_json"] = measure(lookup_json, len(ids), ctx["repeat"])
+    results["lookup_binary"] = measure(lookup_binary, len(ids), ctx["repeat"])
+    results["json_kb"] = round(os.path.getsize(ctx["talks_file"]) / 1024)
+    results["binary_kb"] = round(os.path.getsize(output) / 1024)
+    return results
+
+
+def bench_generate_redirects(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from generate_redirects import generate_redirects
+    output = os.path.join(ctx["tmp_dir"], "_redirects")
+    teachers = ctx["corpus_teachers"]
+    return measure(lambda: generate_redirects(teachers, output), len(teachers), ctx["repeat"])
+
+
+def bench_scrape_talk_details(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    import dharmaseed_scrape_talks as T
+    from rate_limiter import AdaptiveRateLimiter
+    T.LIMITER = AdaptiveRateLimiter(rate=1e6, max_rate=1e6, burst=1e6)
+    ids = talk_ids(ctx["talks"])[:ctx["requests"]]
+
+    results = {}
+    for concurrency in ctx["concurrency"]:
+        T.configure_session_pool(concurrency)
+        before = stub_requests(ctx["stub_base"])
+        fetched = []
+        run = lambda: fetched.append(sum(1 for _, d in T.fetch_talk_details_concurrently(ids, concurrency) if d))
+        result = measure(run, len(ids), ctx["repeat"])
+        result["fetched"] = min(fetched)
+        result["stub_requests"] = (stub_requests(ctx["stub_base"]) - before) // ctx["repeat"]
+        results[f"c{concurrency}"] = result
+    return results
+
+
+def bench_count_talks_rss(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    import dharmaseed_scrape_teachers as S
+    from rate_limiter import AdaptiveRateLimiter
+    S.LIMITER = AdaptiveRateLimiter(rate=1e6, max_rate=1e6, burst=1e6)
+    ids = teacher_ids(ctx["teachers"])[:ctx["requests"]]
+
+    results = {}
+    for concurrency in ctx["concurrency"]:
+        counted = []
+        run = lambda: counted.append(sum(s["count"] for s in
+                                         S.count_talks_per_teacher(ids, save_to_file=False,
+                                                                   concurrency=concurrency).values()))
+        result = measure(run, len(ids), ctx["repeat"])
+        result["talks_counted"] = min(counted)
+        results[f"c{concurrency}"] = result
+    return results
+
+
+def _drive_server(port: int, paths: List[str], clients: int):
+    """GET every path once, spread over `clients` keep-alive connections."""
+    errors = []
+
+    def client(chunk: List[str]):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        try:
+            for path in chunk:
+                conn.request("GET", path)
+                r = conn.getresponse()
+                r.read()
+                if r.status != 200:
+                    errors.append(r.status)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=client, args=(paths[i::clients],)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise RuntimeError(f"server returned {len(errors)} errors (first: {errors[0]})")
+
+
+def bench_server_proxy(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    env = dict(os.environ, DHARMASEED_BASE=ctx["stub_base"])
+    clients = max(ctx["concurrency"])
+    # Distinct talks, then the same ones again (served from the proxy cache when on)
+    paths = [f"/api/talks/{i}/" for i in talk_ids(ctx["talks"])[:ctx["requests"]]]
+
+    results = {}
+    for name, cache_mb in (("cache_off", 0), ("cache_on", 64)):
+        port = free_port()
+        proc = start_process([os.path.join(ROOT_DIR, "server.py"), "--port", str(port), "--cache-mb", str(cache_mb)],
+                             f"http://127.0.0.1:{port}/index.html", env)
+        try:
+            if cache_mb:
+                _drive_server(port, paths, clients)
+            results[name] = measure(lambda: _drive_server(port, paths, clients), len(paths), ctx["repeat"])
+            results[name]["clients"] = clients
+        finally:
+            proc.terminate()
+            proc.wait()
+    return results
+
+
+RUNNERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "parse_talk": bench_parse_talk,
+    "save_talks_to_json": bench_save_talks_to_json,
+    "load_talk_stats_from_talks_json": bench_load_talk_stats,
+    "corpus_memory": bench_corpus_memory,
+    "binary_corpus": bench_binary_corpus,
+    "generate_redirects": bench_generate_redirects,
+    "scrape_talk_details": bench_scrape_talk_details,
+    "count_talks_rss": bench_count_talks_rss,
+    "server_proxy": bench_server_proxy,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _medians(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten {name: {...median_s...}} / {name: {variant: {...}}} to {name[.variant]: median_s}."""
+    flat = {}
+    for name, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if "median_s" in value:
+            flat[prefix + name] = value["median_s"]
+        else:
+            flat.update(_medians(value, f"{prefix}{name}."))
+    return flat
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]):
+    old, new = _medians(baseline["results"]), _medians(report["results"])
+    print(f"\n{'benchmark':<44} {baseline['meta'].get('commit') or 'baseline':>10} "
+          f"{report['meta'].get('commit') or 'current':>10}  speedup")
+    for name in new:
+        if name in old and new[name] > 0:
+            print(f"{name:<44} {old[name]:>9.3f}s {new[name]:>9.3f}s  {old[name] / new[name]:6.2f}x")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline and server on a synthetic corpus")
+    parser.add_argument("--talks", type=int, default=20_000, help="Talks in the corpus (default: 20000)")
+    parser.add_argument("--teachers", type=int, default=500, help="Teachers in the corpus (default: 500)")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus seed (default: 1)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per benchmark (default: 3)")
+    parser.add_argument("--requests", type=int, default=300,
+                        help="HTTP requests per network benchmark run (default: 300)")
+    parser.add_argument("--concurrency", default="1,8",
+                        help="Comma-separated concurrency levels for the scrapers (default: 1,8)")
+    parser.add_argument("--latency-ms", type=float, default=5,
+                        help="Stub API delay per response (default: 5)")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="Print speedups against an earlier JSON report")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else BENCHMARKS
+    unknown = [name for name in selected if name not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # The scrapers read DHARMASEED_BASE at import time, so start the stub first
+    stub_port = free_port()
+    stub_base = f"http://127.0.0.1:{stub_port}"
+    stub = start_process([os.path.join(BENCH_DIR, "stub_api.py"), "--port", str(stub_port),
+                          "--talks", str(args.talks), "--teachers", str(args.teachers),
+                          "--seed", str(args.seed), "--latency-ms", str(args.latency_ms)],
+                         f"{stub_base}/_stats")
+    os.environ["DHARMASEED_BASE"] = stub_base
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "talks": args.talks,
+            "teachers": args.teachers,
+            "seed": args.seed,
+            "latency_ms": args.latency_ms,
+        },
+        "results": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="dharma-bench-") as tmp_dir:
+            from corpus import load_talks, load_teachers
+            print(f"Writing a synthetic corpus of {args.talks} talks, {args.teachers} teachers...", file=sys.stderr)
+            with contextlib.redirect_stdout(io.StringIO()):
+                write_corpus(args.talks, args.teachers, tmp_dir, args.seed)
+            talks_file = os.path.join(tmp_dir, "dharmaseed_talks.json")
+            ctx = {
+                "talks": args.talks,
+                "teachers": args.teachers,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "requests": args.requests,
+                "concurrency": [int(c) for c in args.concurrency.split(",")],
+                "stub_base": stub_base,
+                "tmp_dir": tmp_dir,
+                "talks_file": talks_file,
+                "corpus_talks": load_talks(talks_file),
+                "corpus_teachers": load_teachers(os.path.join(tmp_dir, "dharmaseed_teachers.json")),
+            }
+            for name in selected:
+                print(f"  {name}...", file=sys.stderr)
+                report["results"][name] = RUNNERS[name](ctx)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Saved benchmark report -> {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Dharmaseed API
+
+Serves a synthetic corpus (see synthetic.py) on the endpoints the scrapers
+and server.py use, with configurable latency and injected faults:
+
+  /api/1/talks/              {"edition": ..., "items": [id, ...]}
+  /api/1/talks/ID/           talk details
+  /api/1/teachers/           {"edition": ..., "items": [id, ...]}
+  /api/1/teachers/ID/        teacher details
+  /feeds/teacher/ID/         RSS feed of a teacher's talks, most recent first
+  /_stats                    {"requests": N, "faults": {...}} so far (never delayed or faulted)
+
+Each other request draws at most one fault, with the given probabilities:
+
+  429        HTTP 429 with Retry-After
+  5xx        HTTP 503
+  reset      connection reset before any response
+  truncate   a 200 whose body is cut in half (Content-Length matches the cut)
+  slow       the normal response after an extra --slow-ms delay
+
+Point the scrapers or server.py at it with DHARMASEED_BASE=http://127.0.0.1:PORT.
+
+Usage:
+  python bench/stub_api.py --port 8765 --talks 100000 --teachers 2000 --latency-ms 50
+  python bench/stub_api.py --rate-429 0.05 --retry-after 2 --rate-reset 0.01 --rate-truncate 0.01
+"""
+
+import json
+import random
+import socket
+import struct
+import threading
+import time
+import zlib
+from email.utils import format_datetime
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from synthetic import api_talk, api_teacher, talk_ids, teacher_for_talk, teacher_ids
+
+FAULTS = ("429", "5xx", "reset", "truncate", "slow")
+
+
+class StubAPI:
+    """The synthetic corpus and response settings shared by all handler threads."""
+
+    def __init__(self, n_talks: int, n_teachers: int, seed: int = 1,
+                 latency_ms: float = 0, jitter_ms: float = 0, etags: bool = False,
+                 fault_rates: Optional[Dict[str, float]] = None,
+                 retry_after: float = 1, slow_ms: float = 5000):
+        self.n_talks = n_talks
+        self.n_teachers = n_teachers
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.etags = etags
+        self.fault_rates = {name: rate for name, rate in (fault_rates or {}).items() if rate > 0}
+        self.retry_after = retry_after
+        self.slow_ms = slow_ms
+        self.requests = 0
+        self.faults = {name: 0 for name in FAULTS}
+        self._talks_by_teacher: Optional[Dict[int, List[int]]] = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count_request(self) -> Optional[str]:
+        """Count a request and draw its fault (None for a normal response)."""
+        with self._lock:
+            self.requests += 1
+            draw = self._random.random()
+            for name, rate in self.fault_rates.items():
+                if draw < rate:
+                    self.faults[name] += 1
+                    return name
+                draw -= rate
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"requests": self.requests, "faults": dict(self.faults)}
+
+    def delay(self):
+        delay_ms = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def talk(self, talk_id: int) -> Optional[Dict]:
+        if not 1 <= talk_id <= self.n_talks:
+            return None
+        return api_talk(talk_id, self.n_talks, self.n_teachers, self.seed)
+
+    def teacher(self, teacher_id: int) -> Optional[Dict]:
+        if not 1 <= teacher_id <= self.n_teachers:
+            return None
+        return api_teacher(teacher_id, self.seed)
+
+    def talks_by_teacher(self, teacher_id: int) -> List[int]:
+        with self._lock:
+            if self._talks_by_teacher is None:
+                index: Dict[int, List[int]] = {}
+                for talk_id in talk_ids(self.n_talks):
+                    index.setdefault(teacher_for_talk(talk_id, self.n_teachers, self.seed), []).append(talk_id)
+                self._talks_by_teacher = index
+        return self._talks_by_teacher.get(teacher_id, [])
+
+    def feed(self, teacher_id: int) -> Optional[str]:
+        teacher = self.teacher(teacher_id)
+        if teacher is None:
+            return None
+        talks = sorted((self.talk(i) for i in self.talks_by_teacher(teacher_id)),
+                       key=lambda t: t["rec_date"], reverse=True)
+        items = []
+        for talk in talks:
+            published = datetime.strptime(talk["rec_date"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+            items.append(
+                f"<item><title>{escape(talk['title'])}</title>"
+                f"<description>{escape(talk['description'])}</description>"
+                f"<enclosure url=\"{escape(talk['audio_url'])}\" type=\"audio/mpeg\"/>"
+                f"<pubDate>{format_datetime(published)}</pubDate></item>\n"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+            f"<title>{escape(teacher['name'])}</title>\n" + "".join(items) + "</channel></rss>\n"
+        )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str,
+                  headers: Optional[Dict[str, str]] = None):
+        if self.fault == "truncate" and status == 200:
+            body = body[:len(body) // 2]
+        etag = f'"{zlib.crc32(body):08x}"' if self.server.api.etags else None
+        if etag and status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, obj, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.send_body(status, json.dumps(obj).encode("utf-8"), "application/json", headers)
+
+    def reset_connection(self):
+        # SO_LINGER with a zero timeout makes close() send RST instead of FIN
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.close_connection = True
+
+    def do_GET(self):
+        api = self.server.api
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        self.fault = None
+        if parts == ["_stats"]:
+            return self.send_json(api.stats())
+
+        self.fault = api.count_request()
+        api.delay()
+        if self.fault == "429":
+            return self.send_json({"detail": "Request was throttled."}, 429,
+                                  {"Retry-After": f"{api.retry_after:g}"})
+        if self.fault == "5xx":
+            return self.send_json({"detail": "Service unavailable."}, 503)
+        if self.fault == "reset":
+            return self.reset_connection()
+        if self.fault == "slow":
+            time.sleep(api.slow_ms / 1000)
+
+        record = None
+        if parts[:3] in (["api", "1", "talks"], ["api", "1", "teachers"]):
+            if len(parts) == 3:
+                ids = talk_ids(api.n_talks) if parts[2] == "talks" else teacher_ids(api.n_teachers)
+                edition = f"synthetic-{parts[2]}-{api.n_talks}-{api.n_teachers}-{api.seed}"
+                return self.send_json({"edition": edition, "items": ids})
+            if parts[3].isdigit():
+                record = api.talk(int(parts[3])) if parts[2] == "talks" else api.teacher(int(parts[3]))
+            if record is not None:
+                return self.send_json(record)
+        elif parts[:2] == ["feeds", "teacher"] and len(parts) > 2 and parts[2].isdigit():
+            feed = api.feed(int(parts[2]))
+            if feed is not None:
+                return self.send_body(200, feed.encode("utf-8"), "application/rss+xml; charset=utf-8")
+        self.send_json({"detail": "Not found."}, 404)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that time out on slow responses close their end first
+        pass
+
+
+def make_server(api: StubAPI, port: int = 0, host: str = "127.0.0.1") -> StubServer:
+    """A stub server for `api`; port 0 picks a free port (see server.server_address)."""
+    server = StubServer((host, port), StubHandler)
+    server.api = api
+    return server
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stub of the Dharmaseed API")
+    parser.add_argument("--port", "-p", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--talks", type=int, default=10_000, help="Number of talks (default: 10000)")
+    parser.add_argument("--teachers", type=int, default=1_000, help="Number of teachers (default: 1000)")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus seed (default: 1)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- variation of the delay (default: 0)")
+    parser.add_argument("--etags", action="store_true", help="Send ETags and answer If-None-Match with 304")
+    for fault in FAULTS:
+        parser.add_argument(f"--rate-{fault}", type=float, default=0,
+                            help=f"Probability of a {fault} fault per request (default: 0)")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After of 429 responses in seconds (default: 1)")
+    parser.add_argument("--slow-ms", type=float, default=5000, help="Extra delay of slow responses (default: 5000)")
+    args = parser.parse_args()
+
+    fault_rates = {fault: getattr(args, f"rate_{fault}") for fault in FAULTS}
+    api = StubAPI(args.talks, args.teachers, args.seed, args.latency_ms, args.jitter_ms, args.etags,
+                  fault_rates, args.retry_after, args.slow_ms)
+    server = make_server(api, args.port)
+    print(f"Stub Dharmaseed API on http://127.0.0.1:{server.server_address[1]} "
+          f"({args.talks} talks, {args.teachers} teachers, {args.latency_ms:g}±{args.jitter_ms:g} ms)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dharmaseed corpus
+
+Deterministic talks and teachers in the shapes the API returns, so the
+scrapers, builders and server can be measured without dharmaseed.org.
+Every record is a pure function of (seed, id): the stub server generates
+records on demand and this script writes the same corpus as artifacts.
+
+Usage:
+  python bench/synthetic.py --talks 100000 --teachers 2000 -o bench/data
+    -> bench/data/dharmaseed_talks.json, bench/data/dharmaseed_teachers.json
+"""
+
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+DB_DIR = os.path.join(ROOT_DIR, "db")
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+
+if DB_DIR not in sys.path:
+    sys.path.insert(0, DB_DIR)
+
+WORDS = (
+    "the of and in to a on with for retreat practice mind heart body breath awareness "
+    "attention kindness compassion joy equanimity wisdom freedom suffering peace love "
+    "fear anger grief healing nature silence presence being letting go opening morning "
+    "evening day instructions guided meditation talk reflection questions answers "
+    "dharma buddha teachings path life death change community everyday"
+).split()
+PALI = (
+    "mettā karuṇā muditā upekkhā dukkha anicca anattā saṅgha sutta citta samādhi jhāna "
+    "vipassanā samatha vedanā dāna sīla sati satipaṭṭhāna ānāpānasati nibbāna kamma "
+    "pāramī paññā taṇhā saṃsāra brahmavihāra"
+).split()
+FIRST_NAMES = (
+    "Ajahn Ayya Bhante Joseph Sharon Gil Tara Jack Christina Kittisaro Thanissara Pascal "
+    "Sally Guy Rodney Ruth Leela Kamala James Mark Eugene Howard Rebecca Martine"
+).split()
+LAST_NAMES = (
+    "Goldstein Salzberg Fronsdal Brach Kornfield Feldman Sumedho Anālayo Auer Armstrong "
+    "Baraz Coleman Denison Smith Nyanaponika Williams Cushman Bodhi Thānissaro Khema"
+).split()
+RECORDING_TYPES = ["Talk"] * 7 + ["Guided Meditation"] * 2 + ["Meditation", "Q&A", "Chanting"]
+
+FIRST_YEAR = 2000
+LAST_YEAR = 2025
+
+
+def _rng(seed: int, kind: int, item_id: int) -> random.Random:
+    return random.Random((seed * 1_000_003 + kind) * 10_000_019 + item_id)
+
+
+def _sentence(rng: random.Random, n: int, pali_rate: float = 0.08) -> str:
+    return " ".join(rng.choice(PALI) if rng.random() < pali_rate else rng.choice(WORDS) for _ in range(n))
+
+
+def talk_ids(n_talks: int) -> List[int]:
+    """IDs of a corpus of n_talks talks, in API list order (most recent first)."""
+    return list(range(n_talks, 0, -1))
+
+
+def teacher_ids(n_teachers: int) -> List[int]:
+    return list(range(1, n_teachers + 1))
+
+
+def teacher_for_talk(talk_id: int, n_teachers: int, seed: int = 1) -> int:
+    """Skewed like the real corpus: a few teachers give most of the talks."""
+    rng = _rng(seed, 0, talk_id)
+    return min(n_teachers, int(rng.paretovariate(1.2))) if rng.random() < 0.6 else rng.randint(1, n_teachers)
+
+
+def api_talk(talk_id: int, n_talks: int, n_teachers: int, seed: int = 1) -> Dict[str, Any]:
+    """One talk as returned by /api/1/talks/ID/."""
+    rng = _rng(seed, 1, talk_id)
+    # Later IDs are more recent, with some noise (uploads are not in date order)
+    span_days = (LAST_YEAR - FIRST_YEAR + 1) * 365
+    day = min(span_days - 1, max(0, int(span_days * talk_id / max(n_talks, 1) + rng.gauss(0, 30))))
+    year, day_of_year = FIRST_YEAR + day // 365, day % 365
+    month, day_of_month = 1 + day_of_year // 31 % 12, 1 + day_of_year % 28
+    return {
+        "id": talk_id,
+        "title": _sentence(rng, rng.randint(2, 8), pali_rate=0.15).capitalize(),
+        "teacher_id": teacher_for_talk(talk_id, n_teachers, seed),
+        "description": _sentence(rng, rng.randint(0, 60)),
+        "rec_date": f"{year}-{month:02d}-{day_of_month:02d} {rng.choice([9, 10, 14, 19, 20]):02d}:{rng.choice([0, 30]):02d}:00",
+        "duration_in_minutes": round(rng.uniform(5, 90), 2),
+        "venue_id": rng.randint(1, 200) if rng.random() < 0.7 else None,
+        "retreat_id": rng.randint(1, 5000) if rng.random() < 0.4 else None,
+        "language_id": 1 if rng.random() < 0.9 else rng.randint(2, 10),
+        "recording_type": rng.choice(RECORDING_TYPES),
+        "audio_url": f"/talks/{talk_id}/talk_{talk_id}.mp3",
+    }
+
+
+def api_teacher(teacher_id: int, seed: int = 1) -> Dict[str, Any]:
+    """One teacher as returned by /api/1/teachers/ID/."""
+    rng = _rng(seed, 2, teacher_id)
+    return {
+        "id": teacher_id,
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "photo": rng.choice(["photo.jpg", "photo.png", ""]),
+        "bio": _sentence(rng, rng.randint(0, 120), pali_rate=0.03),
+        "donation_url": f"https://example.org/donate/{teacher_id}" if rng.random() < 0.3 else "",
+    }
+
+
+def write_corpus(n_talks: int, n_teachers: int, output_dir: str = DATA_DIR, seed: int = 1):
+    """Write dharmaseed_talks.json and dharmaseed_teachers.json as the scrapers would."""
+    from dataclasses import asdict
+    import dharmaseed_scrape_talks
+    import dharmaseed_scrape_teachers
+
+    os.makedirs(output_dir, exist_ok=True)
+    talks = [asdict(dharmaseed_scrape_talks.parse_talk(api_talk(i, n_talks, n_teachers, seed)))
+             for i in talk_ids(n_talks)]
+    dharmaseed_scrape_talks.save_talks_to_json(talks, os.path.join(output_dir, "dharmaseed_talks.json"))
+
+    stats = dharmaseed_scrape_teachers.talk_stats_from_talks(talks)
+    teachers = []
+    for teacher_id in teacher_ids(n_teachers):
+        s = stats.get(teacher_id, {})
+        teachers.append(dharmaseed_scrape_teachers.parse_teacher(
+            api_teacher(teacher_id, seed), s.get("count", 0), s.get("last_talk_date", "")))
+    teachers.sort(key=lambda t: (t.name.lower(), t.id))
+    dharmaseed_scrape_teachers.save_to_json(teachers, os.path.join(output_dir, "dharmaseed_teachers.json"), "teachers")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic talks/teachers corpus")
+    parser.add_argument("--talks", type=int, default=10_000, help="Number of talks (default: 10000)")
+    parser.add_argument("--teachers", type=int, default=1_000, help="Number of teachers (default: 1000)")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus seed (default: 1)")
+    parser.add_argument("--output", "-o", default=DATA_DIR, help=f"Output directory (default: {DATA_DIR})")
+    args = parser.parse_args()
+
+    write_corpus(args.talks, args.teachers, args.output, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Binary talks/teachers corpus
+
+A compact, column-oriented copy of dharmaseed_talks.json and
+dharmaseed_teachers.json (dharmaseed_corpus.bin) that readers can
+memory-map and decode record by record, instead of parsing the whole JSON:
+
+  "DSCORPUS"  u32 header length  u32 0
+  header      JSON: version, source hashes, and the layout below
+  sections    little-endian arrays, each 8-byte aligned; header offsets
+              are relative to the first section
+
+  strings     every distinct string, sorted (so refs compare like the
+              strings): u32 offsets[count + 1] into a UTF-8 blob
+  tables      "talks" and "teachers", rows in artifact order (so row
+              positions are the positions the category index uses):
+    columns   one array per field: i32 (null = -2^31), f64 (null = NaN),
+              str (u32 string ref, null = 0xFFFFFFFF) or json (ref to the
+              value's JSON text)
+    raw       u32 string refs to the JSON of records the columns cannot
+              reproduce exactly (other keys, a value of another type),
+              0xFFFFFFFF for the others; absent if there are none
+    index     i32 ids ascending and u32 row positions: id -> row
+  order       talks only, so listings need no sort:
+    date      u32 rows most recent first (corpus.date_order: rec_date
+              descending, ties in artifact order)
+    ranks     u32 rank in `date` of each row
+    teachers, recording_types
+              rank lists per teacher_id / recording_type string ref
+              (0xFFFFFFFF: none), ascending: u32 keys[count] sorted (i32
+              for teacher ids), u32 starts[count + 1] into u32 ranks
+
+`talks_source_sha256`/`teachers_source_sha256` are the content hashes of
+the JSON files the corpus was built from; netlify/functions/talks.js
+ignores a corpus whose hashes do not match those stamped in
+dharmaseed_sources.json at build time (verify hashes the JSON files
+themselves).
+
+Usage:
+  python binary_corpus.py build             # JSON artifacts -> dharmaseed_corpus.bin
+  python binary_corpus.py verify            # compare every record with the JSON
+  python binary_corpus.py get 94960         # print one talk
+"""
+
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corpus import SCRIPT_DIR, TALKS_JSON, TEACHERS_JSON, file_fingerprint, load_talks, load_teachers
+
+CORPUS_BIN = os.path.join(SCRIPT_DIR, "dharmaseed_corpus.bin")
+MAGIC = b"DSCORPUS"
+VERSION = 2
+PREFIX = struct.Struct("<8sII")
+
+I32_NULL = -2 ** 31
+REF_NULL = 0xFFFFFFFF
+TYPECODES = {"i32": "i", "f64": "d", "str": "I", "json": "I"}
+
+
+def _is_utf8(value: str) -> bool:
+    try:
+        value.encode("utf-8")
+    except UnicodeEncodeError:  # lone surrogates from \ud800-style escapes
+        return False
+    return True
+
+
+def _fits(kind: str, value: Any) -> bool:
+    """True if `value` round-trips exactly through a column of this type."""
+    if value is None or kind == "json":
+        return True
+    if kind == "i32":
+        return type(value) is int and I32_NULL < value < 2 ** 31
+    if kind == "f64":
+        return type(value) is float and math.isfinite(value)
+    return type(value) is str and _is_utf8(value)
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class _Table:
+    """Columns of one record table, before the string refs are known."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        # Read twice; a TalkColumns (or list) is iterated, not copied
+        if not hasattr(records, "__len__"):
+            records = list(records)
+        keys = Counter(tuple(r) for r in records)
+        self.fields: Tuple[str, ...] = keys.most_common(1)[0][0] if keys else ()
+        self.types: List[str] = []
+        for field in self.fields:
+            values = [r[field] for r in records if field in r and r[field] is not None]
+            fits = {kind: sum(_fits(kind, v) for v in values) for kind in ("i32", "f64", "str")}
+            kind = max(fits, key=fits.get)
+            self.types.append(kind if fits[kind] or not values else "json")
+
+        self.count = len(records)
+        self.values: List[List[Any]] = [[] for _ in self.fields]
+        self.raw: List[Optional[str]] = []
+        for r in records:
+            regular = tuple(r) == self.fields
+            for field, kind, column in zip(self.fields, self.types, self.values):
+                value = r.get(field)
+                if kind == "json":
+                    value = json.dumps(value)
+                elif not _fits(kind, value):
+                    # Kept in the column as null; the record comes from `raw`
+                    regular, value = False, None
+                column.append(value)
+            self.raw.append(None if regular else json.dumps(r))
+        if not any(self.raw):
+            self.raw = []
+
+    def strings(self) -> Iterator[str]:
+        for kind, column in zip(self.types, self.values):
+            if kind in ("str", "json"):
+                yield from (v for v in column if v is not None)
+        yield from (v for v in self.raw if v is not None)
+
+
+class _Writer:
+    def __init__(self):
+        self.sections: List[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes) -> int:
+        offset = self.size
+        padded = data + b"\0" * (_aligned(len(data)) - len(data))
+        self.sections.append(padded)
+        self.size += len(padded)
+        return offset
+
+    def add_array(self, typecode: str, values: Iterable) -> int:
+        values = array(typecode, values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return self.add(values.tobytes())
+
+
+def _refs(values: List[Optional[str]], refs: Dict[str, int]) -> Iterator[int]:
+    return (REF_NULL if v is None else refs[v] for v in values)
+
+
+def _write_table(out: _Writer, table: _Table, refs: Dict[str, int]) -> Dict[str, Any]:
+    columns = []
+    for field, kind, values in zip(table.fields, table.types, table.values):
+        if kind == "i32":
+            offset = out.add_array("i", (I32_NULL if v is None else v for v in values))
+        elif kind == "f64":
+            offset = out.add_array("d", (math.nan if v is None else v for v in values))
+        else:
+            offset = out.add_array("I", _refs(values, refs))
+        columns.append({"name": field, "type": kind, "offset": offset})
+
+    index = None
+    if "id" in table.fields and table.types[table.fields.index("id")] == "i32":
+        ids = table.values[table.fields.index("id")]
+        # Stable: duplicate ids resolve to their first row
+        keyed = sorted((i, position) for position, i in enumerate(ids) if i is not None)
+        index = {
+            "count": len(keyed),
+            "ids": out.add_array("i", (i for i, _ in keyed)),
+            "positions": out.add_array("I", (position for _, position in keyed)),
+        }
+    return {
+        "count": table.count,
+        "columns": columns,
+        "raw": out.add_array("I", _refs(table.raw, refs)) if table.raw else None,
+        "index": index,
+    }
+
+
+def _write_groups(out: _Writer, typecode: str, keys: List[Optional[int]], order: List[int]) -> Dict[str, Any]:
+    """Date ranks of the rows of each key (None keys left out), keys ascending."""
+    groups: Dict[int, List[int]] = {}
+    for rank, position in enumerate(order):
+        if keys[position] is not None:
+            groups.setdefault(keys[position], []).append(rank)
+    sorted_keys = sorted(groups)
+    starts = [0]
+    for key in sorted_keys:
+        starts.append(starts[-1] + len(groups[key]))
+    return {
+        "count": len(sorted_keys),
+        "keys": out.add_array(typecode, sorted_keys),
+        "starts": out.add_array("I", starts),
+        "ranks": out.add_array("I", (rank for key in sorted_keys for rank in groups[key])),
+    }
+
+
+def _write_talk_order(out: _Writer, table: _Table, refs: Dict[str, int]) -> Dict[str, Any]:
+    columns = {field: (kind, values) for field, kind, values in zip(table.fields, table.types, table.values)}
+    kind, values = columns.get("rec_date", ("str", [None] * table.count))
+    dates = [(json.loads(v) if kind == "json" else v) or "" for v in values]
+    for position, raw in enumerate(table.raw):
+        if raw is not None:
+            dates[position] = json.loads(raw).get("rec_date") or ""
+    # Same order as corpus.date_order (stable, so ties keep artifact order)
+    order = sorted(range(table.count), key=dates.__getitem__, reverse=True)
+    ranks = [0] * table.count
+    for rank, position in enumerate(order):
+        ranks[position] = rank
+
+    teachers = recording_types = None
+    if columns.get("teacher_id", ("",))[0] == "i32":
+        teachers = _write_groups(out, "i", columns["teacher_id"][1], order)
+    if columns.get("recording_type", ("",))[0] == "str":
+        types = [REF_NULL if v is None else refs[v] for v in columns["recording_type"][1]]
+        recording_types = _write_groups(out, "I", types, order)
+    return {
+        "date": out.add_array("I", order),
+        "ranks": out.add_array("I", ranks),
+        "teachers": teachers,
+        "recording_types": recording_types,
+    }
+
+
+def build_binary_corpus(talks: Iterable[Dict[str, Any]], teachers: Iterable[Dict[str, Any]],
+                        talks_source_sha256: str = "", teachers_source_sha256: str = "") -> bytes:
+    """Encode talk and teacher records (in artifact order) as a binary corpus."""
+    tables = {"talks": _Table(talks), "teachers": _Table(teachers)}
+
+    strings = sorted(set().union(*(table.strings() for table in tables.values())))
+    refs = {s: ref for ref, s in enumerate(strings)}
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    out = _Writer()
+    header = {
+        "version": VERSION,
+        "talks_source_sha256": talks_source_sha256,
+        "teachers_source_sha256": teachers_source_sha256,
+        "strings": {
+            "count": len(strings),
+            "offsets": out.add_array("I", offsets),
+            "data": out.add(b"".join(encoded)),
+        },
+    }
+    header["tables"] = {name: _write_table(out, table, refs) for name, table in tables.items()}
+    header["tables"]["talks"]["order"] = _write_talk_order(out, tables["talks"], refs)
+
+    header_json = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_json += b" " * (_aligned(PREFIX.size + len(header_json)) - PREFIX.size - len(header_json))
+    return PREFIX.pack(MAGIC, len(header_json), 0) + header_json + b"".join(out.sections)
+
+
+def save_binary_corpus(data: bytes, filename: str = CORPUS_BIN):
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(data)
+    os.replace(tmp_filename, filename)
+    print(f"Saved binary corpus ({len(data) / 1024:.0f} KB) -> {filename}")
+
+
+class BinaryTable:
+    """One table of a BinaryCorpus; rows decode to the original record dicts."""
+
+    def __init__(self, corpus: "BinaryCorpus", layout: Dict[str, Any]):
+        self._corpus = corpus
+        self.count = layout["count"]
+        self.fields = [c["name"] for c in layout["columns"]]
+        self.types = {c["name"]: c["type"] for c in layout["columns"]}
+        self._columns = {c["name"]: corpus._array(TYPECODES[c["type"]], c["offset"], self.count)
+                         for c in layout["columns"]}
+        self._raw = corpus._array("I", layout["raw"], self.count) if layout["raw"] is not None else None
+        index = layout["index"]
+        self._index_ids = corpus._array("i", index["ids"], index["count"]) if index else None
+        self._index_positions = corpus._array("I", index["positions"], index["count"]) if index else None
+        self._decoders: Dict[str, Callable[[int], Any]] = {name: self._decoder(name) for name in self.fields}
+
+    def _decoder(self, name: str) -> Callable[[int], Any]:
+        column, kind, string = self._columns[name], self.types[name], self._corpus.string
+        if kind == "i32":
+            return lambda p: None if column[p] == I32_NULL else column[p]
+        if kind == "f64":
+            return lambda p: None if math.isnan(column[p]) else column[p]
+        if kind == "str":
+            return lambda p: None if column[p] == REF_NULL else string(column[p])
+        return lambda p: json.loads(string(column[p]))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str):
+        """
+        The raw column: i32/f64 values as a memoryview (nulls as -2^31/NaN),
+        str/json columns as string refs (see BinaryCorpus.string).
+        Irregular records (see the module docstring) may hold null here.
+        """
+        return self._columns[name]
+
+    def value(self, position: int, name: str) -> Any:
+        """One field of one row, without decoding the rest of the record."""
+        if self._raw is not None and self._raw[position] != REF_NULL:
+            return self.record(position).get(name)
+        return self._decoders[name](position)
+
+    def record(self, position: int) -> Dict[str, Any]:
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        if self._raw is not None and self._raw[position] != REF_NULL:
+            return json.loads(self._corpus.string(self._raw[position]))
+        return {name: decode(position) for name, decode in self._decoders.items()}
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        return self.record(position + self.count if position < 0 else position)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.record(p) for p in range(self.count))
+
+    def position(self, record_id: int) -> int:
+        """Row of the record with this id, or -1."""
+        if self._index_ids is None or type(record_id) is not int:
+            return -1
+        i = bisect.bisect_left(self._index_ids, record_id)
+        if i < len(self._index_ids) and self._index_ids[i] == record_id:
+            return self._index_positions[i]
+        return -1
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        position = self.position(record_id)
+        return self.record(position) if position >= 0 else None
+
+
+class TalkOrder:
+    """The talks' date order and per-teacher / per-recording_type rank lists."""
+
+    def __init__(self, corpus: "BinaryCorpus", layout: Dict[str, Any], count: int):
+        self.date = corpus._array("I", layout["date"], count)     # rows, most recent first
+        self.ranks = corpus._array("I", layout["ranks"], count)   # row -> index in `date`
+        self._teachers = self._groups(corpus, layout["teachers"], "i")
+        self._recording_types = self._groups(corpus, layout["recording_types"], "I")
+        self._string = corpus.string
+
+    @staticmethod
+    def _groups(corpus: "BinaryCorpus", layout: Optional[Dict[str, Any]], typecode: str):
+        if layout is None:
+            return None
+        starts = corpus._array("I", layout["starts"], layout["count"] + 1)
+        return (corpus._array(typecode, layout["keys"], layout["count"]), starts,
+                corpus._array("I", layout["ranks"], starts[-1]))
+
+    def teacher_ranks(self, teacher_id: int) -> List[int]:
+        """Ranks (in `date`) of the talks of one teacher, ascending."""
+        if self._teachers is None:
+            return []
+        keys, starts, ranks = self._teachers
+        i = bisect.bisect_left(keys, teacher_id)
+        if i < len(keys) and keys[i] == teacher_id:
+            return ranks[starts[i]:starts[i + 1]].tolist()
+        return []
+
+    def recording_type_ranks(self) -> Dict[Optional[str], List[int]]:
+        """Ranks (in `date`) of the talks of each recording_type, ascending."""
+        if self._recording_types is None:
+            return {}
+        keys, starts, ranks = self._recording_types
+        return {None if key == REF_NULL else self._string(key): ranks[starts[i]:starts[i + 1]].tolist()
+                for i, key in enumerate(keys)}
+
+
+class BinaryCorpus:
+    """
+    A memory-mapped dharmaseed_corpus.bin. Only the header is parsed on
+    open; records are decoded when they are read.
+
+        with BinaryCorpus(CORPUS_BIN) as corpus:
+            talk = corpus.talks.get(94960)
+            latest = [corpus.talks[p] for p in corpus.order.date[:50]]
+            names = {t["id"]: t["name"] for t in corpus.teachers}
+    """
+
+    def __init__(self, filename: str = CORPUS_BIN):
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._views: List[memoryview] = []
+        try:
+            if len(self._mmap) < PREFIX.size:
+                raise ValueError(f"{filename} is not a binary corpus")
+            magic, header_size, _ = PREFIX.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a binary corpus")
+            self.header = json.loads(bytes(self._view[PREFIX.size:PREFIX.size + header_size]))
+            if self.header.get("version") != VERSION:
+                raise ValueError(f"{filename}: unsupported corpus version {self.header.get('version')}")
+            self._base = PREFIX.size + header_size
+
+            strings = self.header["strings"]
+            self._string_offsets = self._array("I", strings["offsets"], strings["count"] + 1)
+            self._string_data = self._base + strings["data"]
+            self.talks = BinaryTable(self, self.header["tables"]["talks"])
+            self.teachers = BinaryTable(self, self.header["tables"]["teachers"])
+            self.order = TalkOrder(self, self.header["tables"]["talks"]["order"], len(self.talks))
+        except Exception:
+            self.close()
+            raise
+
+    def _array(self, typecode: str, offset: int, count: int):
+        start = self._base + offset
+        size = array(typecode).itemsize * count
+        if start + size > len(self._mmap):
+            raise ValueError("binary corpus is truncated")
+        if sys.byteorder == "little":
+            view = self._view[start:start + size].cast(typecode)
+            self._views.append(view)
+            return view
+        values = array(typecode, self._view[start:start + size])
+        values.byteswap()
+        return values
+
+    def string(self, ref: int) -> str:
+        start = self._string_data + self._string_offsets[ref]
+        end = self._string_data + self._string_offsets[ref + 1]
+        return str(self._view[start:end], "utf-8")
+
+    def close(self):
+        # Release the exported views first, or mmap.close() raises BufferError
+        self.talks = self.teachers = self.order = None
+        for view in self._views:
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "BinaryCorpus":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def verify_binary_corpus(filename: str, talks: List[Dict], teachers: List[Dict]) -> List[str]:
+    """Differences between a binary corpus and the records it was built from."""
+    problems = []
+    with BinaryCorpus(filename) as corpus:
+        for name, table, records in (("talks", corpus.talks, talks), ("teachers", corpus.teachers, teachers)):
+            if len(table) != len(records):
+                problems.append(f"{name}: {len(table)} rows, expected {len(records)}")
+                continue
+            first_rows: Dict[int, int] = {}
+            for position, record in enumerate(records):
+                decoded = table.record(position)
+                if decoded != record or list(decoded) != list(record):
+                    problems.append(f"{name}[{position}] (id {record.get('id')}) differs")
+                if _fits("i32", record.get("id")) and record.get("id") is not None:
+                    first_rows.setdefault(record["id"], position)
+            for record_id, position in first_rows.items():
+                if table.position(record_id) != position:
+                    problems.append(f"{name}: id {record_id} resolves to row {table.position(record_id)}, not {position}")
+
+        if len(corpus.talks) == len(talks):
+            order = corpus.order
+            expected = sorted(range(len(talks)), key=lambda p: talks[p].get("rec_date") or "", reverse=True)
+            if order.date.tolist() != expected:
+                problems.append("talks: date order differs from corpus.date_order")
+            elif any(order.ranks[position] != rank for rank, position in enumerate(expected)):
+                problems.append("talks: ranks are not the inverse of the date order")
+            by_teacher: Dict[int, List[int]] = {}
+            by_type: Dict[Optional[str], List[int]] = {}
+            for rank, position in enumerate(expected):
+                teacher_id, recording_type = talks[position].get("teacher_id"), talks[position].get("recording_type")
+                if _fits("i32", teacher_id) and teacher_id is not None:
+                    by_teacher.setdefault(teacher_id, []).append(rank)
+                by_type.setdefault(recording_type if _fits("str", recording_type) else None, []).append(rank)
+            if any(order.teacher_ranks(teacher_id) != ranks for teacher_id, ranks in by_teacher.items()):
+                problems.append("talks: teacher rank lists differ")
+            if order.recording_type_ranks() != by_type:
+                problems.append("talks: recording_type rank lists differ")
+    return problems
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary talks/teachers corpus")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--teachers", default=TEACHERS_JSON, help="Teachers JSON artifact")
+    parser.add_argument("--output", "-o", default=CORPUS_BIN, help=f"Binary corpus (default: {CORPUS_BIN})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Write the binary corpus from the JSON artifacts")
+    sub.add_parser("verify", help="Check every record of the binary corpus against the JSON artifacts")
+    get = sub.add_parser("get", help="Print one talk from the binary corpus")
+    get.add_argument("id", type=int)
+    args = parser.parse_args()
+
+    if args.command == "get":
+        with BinaryCorpus(args.output) as corpus:
+            talk = corpus.talks.get(args.id)
+        if talk is None:
+            sys.exit(f"Talk {args.id} not found")
+        print(json.dumps(talk, indent=2, ensure_ascii=False))
+        return
+
+    talks = load_talks(args.talks)
+    teachers = load_teachers(args.teachers)
+    if args.command == "build":
+        print(f"Encoding {len(talks)} talks and {len(teachers)} teachers...")
+        data = build_binary_corpus(talks, teachers, file_fingerprint(args.talks), file_fingerprint(args.teachers))
+        save_binary_corpus(data, args.output)
+    else:
+        problems = verify_binary_corpus(args.output, talks, teachers)
+        with BinaryCorpus(args.output) as corpus:
+            for name, source in (("talks", args.talks), ("teachers", args.teachers)):
+                if corpus.header.get(f"{name}_source_sha256") != file_fingerprint(source):
+                    problems.append(f"{name}: built from another {os.path.basename(source)} (sha256 differs)")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        if problems:
+            sys.exit(f"{len(problems)} difference(s) in {args.output}")
+        print(f"{args.output}: {len(talks)} talks and {len(teachers)} teachers match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Build the talks category index
+
+Writes dharmaseed_categories.json, which lets the `categories=` parameter of
+netlify/functions/talks.js filter by precomputed matches instead of scanning
+every title and description:
+
+  {
+    "version": 1,
+    "talk_count": N,
+    "source_sha256": H,         # content hash of the talks file indexed
+    "words": ["metta", ...],    # folded category words; bit i <-> words[i]
+    "lanes": L,                 # 32-bit words per talk mask
+    "masks": [...],             # N * L unsigned ints; talk at position p of
+                                # dharmaseed_talks.json -> masks[p*L : p*L+L]
+    "postings": {"metta": [d0, d1, ...], ...}
+  }
+
+A posting list holds the positions (in dharmaseed_talks.json) of the talks
+matching a word, ascending and delta-encoded. The words are those of the
+Pali glossary, matched exactly like the categories filter (see
+generate_pali_hints.matched_words). The function ignores the index when
+`source_sha256` differs from the talks hash stamped in dharmaseed_sources.json.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from corpus import SCRIPT_DIR, TALKS_JSON, file_fingerprint, load_talks
+from generate_pali_hints import GLOSSARY_JSON, glossary_words, load_glossary, matched_words
+
+CATEGORIES_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_categories.json")
+
+
+def build_category_index(talks: List[Dict], glossary: List[Dict], source_sha256: str = "") -> Dict:
+    """Build the category bitmasks and posting lists for a talk corpus."""
+    words = sorted({w for ws in glossary_words(glossary).values() for w in ws})
+    bits = {word: i for i, word in enumerate(words)}
+    lanes = max(1, (len(words) + 31) // 32)
+
+    masks = [0] * (len(talks) * lanes)
+    positions: Dict[str, List[int]] = {word: [] for word in words}
+    for position, found in enumerate(matched_words(talks, words)):
+        for word in found:
+            bit = bits[word]
+            masks[position * lanes + bit // 32] |= 1 << (bit % 32)
+            positions[word].append(position)
+
+    postings = {
+        word: [p[0]] + [b - a for a, b in zip(p, p[1:])] if p else []
+        for word, p in positions.items()
+    }
+    return {
+        "version": 1,
+        "talk_count": len(talks),
+        "source_sha256": source_sha256,
+        "words": words,
+        "lanes": lanes,
+        "masks": masks,
+        "postings": postings,
+    }
+
+
+def save_category_index(index: Dict, filename: str = CATEGORIES_JSON):
+    """Write the index as compact JSON."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_filename, filename)
+    size_kb = os.path.getsize(filename) / 1024
+    print(f"Saved category index: {len(index['words'])} words, "
+          f"{index['talk_count']} talks ({size_kb:.0f} KB) -> {filename}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the talks category index")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--glossary", default=GLOSSARY_JSON, help="Pali glossary")
+    parser.add_argument("--output", "-o", default=CATEGORIES_JSON, help=f"Output file (default: {CATEGORIES_JSON})")
+    args = parser.parse_args()
+
+    talks = load_talks(args.talks)
+    glossary = load_glossary(args.glossary)
+    print(f"Tagging {len(talks)} talks with {len(glossary)} glossary terms...")
+    save_category_index(build_category_index(talks, glossary, file_fingerprint(args.talks)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build the talks search index
+
+Writes dharmaseed_search_index.json, an inverted index used by the `search=`
+parameter of netlify/functions/talks.js instead of scanning every talk.
+
+Format:
+  {
+    "version": 1,
+    "talk_count": N,              # talks indexed
+    "talks_source_sha256": H,     # content hashes of the JSON files indexed;
+    "teachers_source_sha256": H,  # the function ignores an index built from others
+    "order": [id, ...],           # talk IDs, most recent first (same order as the API)
+    "terms": {"token": [d0, d1, ...], ...}
+  }
+
+Tokens are the whitespace-separated words of each talk's title, description,
+teacher name and rec_date, lowercased and diacritic-folded (see fold_text).
+A posting list holds the ranks of matching talks in `order`, ascending and
+delta-encoded. Because search terms never contain whitespace, "term occurs
+in field" is the same as "term occurs in some token of field", so the
+function can keep its substring semantics by matching terms against the
+vocabulary and intersecting the posting lists.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from corpus import (SCRIPT_DIR, TALKS_JSON, TEACHERS_JSON, date_order, file_fingerprint, fold_text,
+                    load_talks, load_teachers)
+
+INDEX_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_search_index.json")
+
+
+def talk_tokens(talk: Dict, teacher_names: Dict[int, str]) -> set:
+    """Distinct folded tokens of the searchable fields of a talk."""
+    tokens = set()
+    for text in (talk.get("title"), talk.get("description"),
+                 teacher_names.get(talk.get("teacher_id"), "")):
+        tokens.update(fold_text(text or "").split())
+    tokens.update((talk.get("rec_date") or "").lower().split())
+    return tokens
+
+
+def build_search_index(talks: List[Dict], teachers: List[Dict],
+                       talks_source_sha256: str = "", teachers_source_sha256: str = "") -> Dict:
+    """Build the inverted index for a talk corpus."""
+    teacher_names = {t["id"]: t.get("name") or "" for t in teachers}
+    ordered = date_order(talks)
+
+    postings: Dict[str, List[int]] = {}
+    for rank, talk in enumerate(ordered):
+        for token in talk_tokens(talk, teacher_names):
+            postings.setdefault(token, []).append(rank)
+
+    terms = {}
+    for token in sorted(postings):
+        ranks = postings[token]
+        terms[token] = [ranks[0]] + [b - a for a, b in zip(ranks, ranks[1:])]
+
+    return {
+        "version": 1,
+        "talk_count": len(talks),
+        "talks_source_sha256": talks_source_sha256,
+        "teachers_source_sha256": teachers_source_sha256,
+        "order": [t["id"] for t in ordered],
+        "terms": terms,
+    }
+
+
+def save_search_index(index: Dict, filename: str = INDEX_JSON):
+    """Write the index as compact JSON."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_filename, filename)
+    size_kb = os.path.getsize(filename) / 1024
+    print(f"Saved search index: {len(index['terms'])} terms, "
+          f"{index['talk_count']} talks ({size_kb:.0f} KB) -> {filename}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the talks search index")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--teachers", default=TEACHERS_JSON, help="Teachers JSON artifact")
+    parser.add_argument("--output", "-o", default=INDEX_JSON, help=f"Output file (default: {INDEX_JSON})")
+    args = parser.parse_args()
+
+    talks = load_talks(args.talks)
+    teachers = load_teachers(args.teachers)
+    print(f"Indexing {len(talks)} talks...")
+    index = build_search_index(talks, teachers, file_fingerprint(args.talks), file_fingerprint(args.teachers))
+    save_search_index(index, args.output)
+
+
+if __name__ == "__main__":
+    main()
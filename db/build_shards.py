@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build sharded talk artifacts
+
+Writes small JSON files under db/shards/ so netlify/functions/talks.js can
+answer common queries without parsing the whole dharmaseed_talks.json:
+
+  shards/recent/NNNN.json      fixed-size pages of talks, most recent first
+  shards/teachers/ID.json      all talks of one teacher, most recent first
+  shards/index.json            {"version", "talk_count", "source_sha256",
+                                "page_size", "pages", "id_pages": {id: page}}
+
+Recent pages are numbered from the oldest talk: page 0 holds the oldest
+`page_size` talks and the highest page (possibly short) the newest, so new
+talks only rewrite the head page. The talk at rank r (0 = most recent) of
+N is on page (N - 1 - r) // page_size.
+
+`source_sha256` is the content hash of the talks file the shards were built
+from; the function compares it with the hash stamped in
+dharmaseed_sources.json and falls back to the full corpus when they differ.
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, List
+
+from corpus import SCRIPT_DIR, TALKS_JSON, date_order, file_fingerprint, load_talks
+
+SHARDS_DIR = os.path.join(SCRIPT_DIR, "shards")
+PAGE_SIZE = 500
+
+
+def _write_json(data, filename: str):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_shards(talks: List[Dict], output_dir: str = SHARDS_DIR, page_size: int = PAGE_SIZE,
+                 source_sha256: str = "") -> Dict:
+    """Write all shards for `talks` into `output_dir` and return the shard index."""
+    ordered = date_order(talks)
+
+    # Build into a temp dir and swap, so readers never see a half-written set
+    tmp_dir = f"{output_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_dir, "recent"))
+    os.makedirs(os.path.join(tmp_dir, "teachers"))
+
+    id_pages: Dict[int, int] = {}
+    pages = 0
+    for end in range(len(ordered), 0, -page_size):
+        page = ordered[max(end - page_size, 0):end]
+        _write_json(page, os.path.join(tmp_dir, "recent", f"{pages:04d}.json"))
+        for talk in page:
+            id_pages[talk["id"]] = pages
+        pages += 1
+
+    by_teacher: Dict[int, List[Dict]] = {}
+    for talk in ordered:
+        by_teacher.setdefault(talk.get("teacher_id") or 0, []).append(talk)
+    for teacher_id, teacher_talks in by_teacher.items():
+        _write_json(teacher_talks, os.path.join(tmp_dir, "teachers", f"{teacher_id}.json"))
+
+    index = {
+        "version": 2,
+        "talk_count": len(talks),
+        "source_sha256": source_sha256,
+        "page_size": page_size,
+        "pages": pages,
+        "id_pages": id_pages,
+    }
+    _write_json(index, os.path.join(tmp_dir, "index.json"))
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    print(f"Saved {pages} pages and {len(by_teacher)} teacher shards "
+          f"for {len(talks)} talks -> {output_dir}")
+    return index
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build sharded talk artifacts")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--output", "-o", default=SHARDS_DIR, help=f"Output directory (default: {SHARDS_DIR})")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE,
+                        help=f"Talks per recent page (default: {PAGE_SIZE})")
+    args = parser.parse_args()
+
+    talks = load_talks(args.talks)
+    build_shards(talks, args.output, args.page_size, source_sha256=file_fingerprint(args.talks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the talk corpus
+
+Loading the JSON artifacts and the text/ordering rules that every derived
+artifact has to agree on with netlify/functions/talks.js.
+"""
+
+import hashlib
+import json
+import os
+import unicodedata
+from typing import Dict, List
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TALKS_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_talks.json")
+TEACHERS_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
+SOURCES_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_sources.json")
+
+
+def load_talks(filename: str = TALKS_JSON) -> List[Dict]:
+    """Load the talks artifact (list of talk dicts, ID descending)."""
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_teachers(filename: str = TEACHERS_JSON) -> List[Dict]:
+    """Load the teacher records from the teachers artifact."""
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f).get("teachers", [])
+
+
+def file_fingerprint(path: str) -> str:
+    """sha256 of a file's content ("" if it does not exist)."""
+    if not os.path.exists(path):
+        return ""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stamp_source(path: str, sha256: str = ""):
+    """
+    Record the content hash of a just-written talks/teachers artifact in the
+    dharmaseed_sources.json next to it. talks.js compares the hashes stored
+    in the derived artifacts with this stamp, so it never has to hash the
+    source JSON at cold start. Other files are ignored.
+    """
+    name = os.path.basename(path)
+    if name not in (os.path.basename(TALKS_JSON), os.path.basename(TEACHERS_JSON)):
+        return
+    stamp_path = os.path.join(os.path.dirname(os.path.abspath(path)), os.path.basename(SOURCES_JSON))
+    stamp: Dict[str, str] = {}
+    if os.path.exists(stamp_path):
+        try:
+            with open(stamp_path, "r", encoding="utf-8") as f:
+                stamp = json.load(f)
+        except (OSError, ValueError):
+            stamp = {}
+    stamp[name] = sha256 or file_fingerprint(path)
+    tmp_path = f"{stamp_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stamp, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, stamp_path)
+
+
+def fold_text(text: str) -> str:
+    """
+    Lowercase and strip diacritics, like talks.js does:
+    text.toLowerCase().normalize('NFD').replace(/[\\u0300-\\u036f]/g, '')
+    """
+    decomposed = unicodedata.normalize("NFD", (text or "").lower())
+    return "".join(c for c in decomposed if not "\u0300" <= c <= "\u036f")
+
+
+def date_order(talks: List[Dict]) -> List[Dict]:
+    """
+    Talks sorted by rec_date, most recent first.
+    The sort is stable, so talks with the same date keep their artifact
+    order (ID descending) - the same result as the sort in talks.js.
+    """
+    return sorted(talks, key=lambda t: t.get("rec_date") or "", reverse=True)
@@ -7,16 +7,27 @@ Endpoint: https://dharmaseed.org/api/1/talks/
 Individual talk: https://dharmaseed.org/api/1/talks/ID/
 
 Supports incremental updates - will skip talks already in the JSON file.
+When the list edition changes, talks removed upstream are dropped and a
+rolling slice of existing talks is re-fetched to pick up edits.
 """
 
 import json
-import time
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any, Set
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Set, Iterator, Tuple, Union
 import requests
+from corpus import stamp_source
+from http_cache import HTTPCache, install_cache
+from metrics import METRICS, save_metrics
+from profiling import add_profile_arguments, parse_profile_modes, profile_run
+from rate_limiter import AdaptiveRateLimiter, map_concurrently, request_with_retry
+from scrape_state import load_scrape_state, pick_reverify_ids, save_scrape_state, state_path_for
+from talk_columns import TalkColumns
+from talks_journal import TalkJournal, journal_path_for
+from talks_store import TalkStore, DEFAULT_DB
 
-BASE = "https://dharmaseed.org"
+# DHARMASEED_BASE points the scraper at another server (e.g. bench/stub_api.py)
+BASE = os.environ.get("DHARMASEED_BASE", "https://dharmaseed.org")
 API_BASE = f"{BASE}/api/1"
 MEDIA_BASE = "https://media.dharmaseed.org"
 
@@ -25,8 +36,15 @@ SESSION.headers.update({
     "User-Agent": "Mozilla/5.0 (compatible; dharmaseed-api-client/2.0)"
 })
 
+# Conditional (ETag / Last-Modified) response cache shared with the teachers scraper
+HTTP_CACHE = HTTPCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache"))
+install_cache(SESSION, HTTP_CACHE)
+
 TALKS_ENDPOINT = f"{API_BASE}/talks/"
 
+# Shared by all worker threads; adapts to how fast the server lets us go
+LIMITER = AdaptiveRateLimiter(rate=3.0)
+
 
 @dataclass
 class Talk:
@@ -43,22 +61,40 @@ class Talk:
     audio_url: str = ""
 
 
-def load_existing_talks(filename: str) -> tuple[List[Dict], Set[int]]:
+def load_existing_talks(filename: str) -> tuple[TalkColumns, Set[int]]:
     """
-    Load existing talks from JSON file.
-    Returns (list of talk dicts, set of existing IDs)
+    Load existing talks from JSON file (into the compact TalkColumns form).
+    Returns (talks, set of existing IDs)
     """
     if not os.path.exists(filename):
-        return [], set()
+        return TalkColumns(), set()
     
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            talks = json.load(f)
-            existing_ids = {t['id'] for t in talks}
-            return talks, existing_ids
-    except (json.JSONDecodeError, KeyError) as e:
+        talks = TalkColumns.load(filename)
+        return talks, set(talks.ids)
+    except ValueError as e:
         print(f"  Warning: Could not load existing file: {e}")
-        return [], set()
+        return TalkColumns(), set()
+
+
+def _json_or_raise(r: requests.Response) -> Any:
+    r.raise_for_status()
+    return r.json()
+
+
+def fetch_talk_list() -> Tuple[str, List[int]]:
+    """
+    Fetch the talk list from the API endpoint.
+    Returns (edition, IDs) from the 'edition' and 'items' fields.
+    """
+    print(f"Fetching talk IDs from {TALKS_ENDPOINT}...")
+    data = request_with_retry(SESSION, TALKS_ENDPOINT, LIMITER, _json_or_raise, label="talk list")
+    if data is None:
+        raise RuntimeError(f"Could not fetch talk IDs from {TALKS_ENDPOINT}")
+    edition = str(data.get("edition", ""))
+    ids = data.get("items", [])
+    print(f"  Found {len(ids)} talk IDs (edition {edition or 'unknown'})")
+    return edition, ids
 
 
 def fetch_talk_ids() -> List[int]:
@@ -66,40 +102,46 @@ def fetch_talk_ids() -> List[int]:
     Fetch all talk IDs from the API endpoint.
     Returns the list of IDs from the 'items' field.
     """
-    print(f"Fetching talk IDs from {TALKS_ENDPOINT}...")
-    r = SESSION.get(TALKS_ENDPOINT, timeout=30)
-    r.raise_for_status()
-    data = r.json()
-    ids = data.get("items", [])
-    print(f"  Found {len(ids)} talk IDs")
-    return ids
+    return fetch_talk_list()[1]
 
 
 def fetch_talk_details(talk_id: int, max_retries: int = 5) -> Optional[Dict[str, Any]]:
     """
     Fetch details for a specific talk by ID.
     Example: /api/1/talks/12345/
-    Includes retry logic with exponential backoff for rate limiting.
+    Paced by the shared LIMITER; retries 429/5xx with jittered exponential
+    backoff, honoring Retry-After.
     """
     url = f"{TALKS_ENDPOINT}{talk_id}/"
-    
-    for attempt in range(max_retries):
-        try:
-            r = SESSION.get(url, timeout=30)
-            if r.status_code == 429:
-                # Rate limited - wait longer and retry
-                wait_time = (attempt + 1) * 5  # 5, 10, 15, 20, 25 seconds
-                print(f"  Rate limited, waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            if attempt == max_retries - 1:
-                print(f"  Warning: Failed to fetch talk {talk_id}: {e}")
-            else:
-                time.sleep(2)
-    return None
+    return request_with_retry(SESSION, url, LIMITER, _json_or_raise,
+                              max_retries=max_retries, label=f"talk {talk_id}")
+
+
+def configure_session_pool(concurrency: int):
+    """
+    Size the SESSION connection pool for the given number of workers.
+    requests keeps 10 connections per host by default; more workers than that
+    would keep opening and discarding connections.
+    """
+    install_cache(SESSION, HTTP_CACHE, pool_size=max(10, concurrency))
+
+
+def fetch_talk_details_concurrently(
+    talk_ids: List[int],
+    concurrency: int = 4
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Fetch details for many talks with up to `concurrency` requests in flight.
+    The overall request rate is governed by the shared LIMITER, not by the
+    number of workers.
+    Yields (talk_id, details_or_None) in completion order.
+    """
+    return map_concurrently(fetch_talk_details, talk_ids, concurrency)
+
+
+def talk_to_dict(talk: Talk) -> Dict[str, Any]:
+    """asdict() without its recursive deep copy - every Talk field is a scalar."""
+    return dict(talk.__dict__)
 
 
 def parse_talk(data: Dict[str, Any]) -> Talk:
@@ -133,88 +175,176 @@ def fetch_talks_incremental(
     filename: str,
     limit: int = 100,
     delay_s: float = 0.3,
-    save_interval: int = 100
-) -> List[Dict]:
+    save_interval: int = 100,
+    concurrency: int = 1,
+    reverify: int = 100,
+    max_delete_fraction: float = 0.05
+) -> TalkColumns:
     """
     Fetch talks incrementally, skipping already fetched ones.
-    Saves progress periodically to avoid losing work.
+    New talks are appended to a journal next to `filename` and fsync'd every
+    `save_interval` talks; talks left in the journal by an interrupted run are
+    replayed first. Call compact_talks() afterwards to write the JSON file.
+    
+    When the list edition changed since the last run, talks missing from the
+    list are removed and up to `reverify` existing talks are re-fetched (on a
+    rolling cursor) so edits upstream are picked up without a full re-scrape.
     
     Args:
         filename: JSON file to read from and save to
         limit: Maximum number of NEW talks to fetch (default 100)
-        delay_s: Delay between requests in seconds (default 0.3)
+        delay_s: Initial delay between requests in seconds (default 0.3);
+            the limiter adapts the rate from there
         save_interval: Save progress every N new talks (default 100)
+        concurrency: Number of requests kept in flight (default 1)
+        reverify: Existing talks to re-check per changed edition (default 100)
+        max_delete_fraction: Skip deletions if more than this fraction of
+            existing talks would be removed (default 0.05)
     
     Returns:
-        List of all talk dicts (existing + new)
+        All talks (existing + new, minus deleted), ID descending, as TalkColumns
     """
     # Load existing talks
-    existing_talks, existing_ids = load_existing_talks(filename)
+    with METRICS.phase("load"):
+        existing_talks, existing_ids = load_existing_talks(filename)
     print(f"Loaded {len(existing_talks)} existing talks")
     
-    # Fetch all talk IDs
-    all_ids = fetch_talk_ids()
+    # Recover talks journaled by an interrupted run
+    journal = TalkJournal(journal_path_for(filename))
+    with METRICS.phase("load"):
+        recovered = journal.replay()
+    if recovered:
+        existing_talks = existing_talks.merge(recovered)
+        existing_ids = set(existing_talks.ids)
+        print(f"  Recovered {len(recovered)} journal records from {journal.path}")
     
-    # Filter to only new IDs
-    new_ids = [tid for tid in all_ids if tid not in existing_ids]
-    print(f"  {len(new_ids)} new talks to fetch")
+    # Fetch all talk IDs
+    state = load_scrape_state(filename)
+    with METRICS.phase("list_fetch"):
+        edition, all_ids = fetch_talk_list()
+    edition_changed = not edition or edition != state["edition"]
     
-    # Limit new talks to fetch
-    if limit and limit < len(new_ids):
-        new_ids = new_ids[:limit]
-        print(f"  Limiting to {limit} new talks")
+    # Talks that disappeared from the list were removed upstream
+    deleted_ids = existing_ids - set(all_ids) if all_ids else set()
+    if deleted_ids and len(deleted_ids) > max_delete_fraction * len(existing_ids):
+        print(f"  Warning: {len(deleted_ids)} talks missing from the list, "
+              f"more than {max_delete_fraction:.0%} of the archive - not deleting")
+        deleted_ids = set()
+    try:
+        for talk_id in sorted(deleted_ids):
+            journal.append({"id": talk_id, "_deleted": True})
+        if deleted_ids:
+            journal.checkpoint()
+            existing_ids -= deleted_ids
+            METRICS.inc("scrape_items_total", len(deleted_ids), kind="talk", result="deleted")
+            print(f"  {len(deleted_ids)} talks removed upstream")
     
-    if not new_ids:
-        print("No new talks to fetch!")
-        return existing_talks
+        # Filter to only new IDs
+        new_ids = [tid for tid in all_ids if tid not in existing_ids]
+        print(f"  {len(new_ids)} new talks to fetch")
     
-    print(f"Fetching details for {len(new_ids)} new talks...")
-    new_talks = []
-    failed_count = 0
+        # Limit new talks to fetch
+        if limit and limit < len(new_ids):
+            new_ids = new_ids[:limit]
+            print(f"  Limiting to {limit} new talks")
     
-    for i, talk_id in enumerate(new_ids):
-        result = fetch_talk_details(talk_id)
-        if result:
-            talk = parse_talk(result)
-            new_talks.append(asdict(talk))
+        # Re-check a rolling slice of existing talks, only if something changed upstream
+        reverify_ids: List[int] = []
+        if edition_changed:
+            reverify_ids, state["verify_cursor"] = pick_reverify_ids(
+                existing_ids, state["verify_cursor"], reverify)
+            if reverify_ids:
+                print(f"  Edition changed, re-verifying {len(reverify_ids)} existing talks")
         else:
-            failed_count += 1
-        
-        # Progress update every 10 talks
-        if (i + 1) % 10 == 0:
-            print(f"  Progress: {i + 1}/{len(new_ids)} (total: {len(existing_talks) + len(new_talks)})")
-        
-        # Save periodically
-        if (i + 1) % save_interval == 0:
-            all_talks = existing_talks + new_talks
-            # Sort by ID descending (newest first)
-            all_talks.sort(key=lambda t: t['id'], reverse=True)
-            save_talks_to_json(all_talks, filename)
-            print(f"  [Checkpoint] Saved {len(all_talks)} talks")
-        
-        time.sleep(delay_s)
+            print("  Edition unchanged, skipping re-verification")
+        state["edition"] = edition
     
-    print(f"  Completed: {len(new_talks)}/{len(new_ids)} fetched successfully")
-    if failed_count:
-        print(f"  Failed: {failed_count} talks")
+        fetch_ids = new_ids + reverify_ids
+        new_talks = []
+        updated_talks = []
+        failed_count = 0
     
-    # Combine existing and new talks
-    all_talks = existing_talks + new_talks
+        if fetch_ids:
+            print(f"Fetching details for {len(fetch_ids)} talks ({concurrency} concurrent)...")
+            configure_session_pool(concurrency)
+            if delay_s > 0:
+                LIMITER.set_rate(1 / delay_s)
+            with METRICS.phase("detail_fetch"):
+                results = fetch_talk_details_concurrently(fetch_ids, concurrency=concurrency)
+                for i, (talk_id, result) in enumerate(results):
+                    if result:
+                        with METRICS.phase("parse"):
+                            talk = talk_to_dict(parse_talk(result))
+                        old = existing_talks.get(talk_id)
+                        if old is None:
+                            journal.append(talk)
+                            new_talks.append(talk)
+                        elif talk != old:
+                            journal.append(talk)
+                            updated_talks.append(talk)
+                        else:
+                            METRICS.inc("scrape_items_total", kind="talk", result="unchanged")
+                    else:
+                        failed_count += 1
+                
+                    # Progress update every 10 talks
+                    if (i + 1) % 10 == 0:
+                        print(f"  Progress: {i + 1}/{len(fetch_ids)} "
+                              f"(total: {len(existing_ids) + len(new_talks)})")
+                
+                    # Make journaled talks durable periodically
+                    if (i + 1) % save_interval == 0:
+                        journal.checkpoint()
+                        print(f"  [Checkpoint] Journaled {len(new_talks)} new, {len(updated_talks)} updated talks")
+        
+            METRICS.inc("scrape_items_total", len(new_talks), kind="talk", result="new")
+            METRICS.inc("scrape_items_total", len(updated_talks), kind="talk", result="updated")
+            METRICS.inc("scrape_items_total", failed_count, kind="talk", result="failed")
+            print(f"  Completed: {len(fetch_ids) - failed_count}/{len(fetch_ids)} fetched successfully")
+            print(f"  New: {len(new_talks)}, updated: {len(updated_talks)}")
+            if failed_count:
+                print(f"  Failed: {failed_count} talks")
+        else:
+            print("No new talks to fetch!")
+    finally:
+        # Also on the deletions-only path, and when a fetch raises
+        journal.close()
     
-    # Sort by ID descending (newest first)
-    all_talks.sort(key=lambda t: t['id'], reverse=True)
+    save_scrape_state(state, filename)
     
-    return all_talks
+    # Combine existing and fetched talks, sorted by ID descending (newest first)
+    deletions = [{"id": talk_id, "_deleted": True} for talk_id in deleted_ids]
+    with METRICS.phase("merge"):
+        return existing_talks.merge(deletions + new_talks + updated_talks)
 
 
-def save_talks_to_json(talks: List[Dict], filename: str = "dharmaseed_talks.json"):
-    """Save talks list to JSON file."""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(talks, f, indent=2, ensure_ascii=False)
+def save_talks_to_json(talks: Union[TalkColumns, List[Dict]], filename: str = "dharmaseed_talks.json"):
+    """Save talks list to JSON file (atomically, via a temp file)."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'w', encoding='utf-8') as f:
+        if isinstance(talks, TalkColumns):
+            # Same bytes as json.dump, without building the list of dicts
+            talks.write_json(f)
+        else:
+            json.dump(talks, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+    stamp_source(filename)
     
     print(f"Saved {len(talks)} talks to {filename}")
 
 
+def compact_talks(talks: Union[TalkColumns, List[Dict]], filename: str):
+    """
+    Write the merged talk list to the JSON artifact, then drop the journal.
+    The JSON is replaced atomically first, so a crash here never loses
+    journaled talks.
+    """
+    save_talks_to_json(talks, filename)
+    TalkJournal(journal_path_for(filename)).remove()
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -234,7 +364,13 @@ def main():
         "--delay", "-d",
         type=float,
         default=0.3,
-        help="Delay between requests in seconds (default: 0.3)"
+        help="Initial delay between requests in seconds; adapted at runtime (default: 0.3)"
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=1,
+        help="Number of talk detail requests kept in flight (default: 1)"
     )
     parser.add_argument(
         "--output", "-o",
@@ -248,18 +384,51 @@ def main():
         default=100,
         help="Save progress every N talks (default: 100)"
     )
+    parser.add_argument(
+        "--reverify", "-r",
+        type=int,
+        default=100,
+        help="Existing talks to re-check when the list edition changed (default: 100)"
+    )
+    parser.add_argument(
+        "--sqlite",
+        nargs="?",
+        const=DEFAULT_DB,
+        default=None,
+        help=f"Also write talks to the SQLite store (default path: {DEFAULT_DB})"
+    )
     parser.add_argument(
         "--fresh",
         action="store_true",
         help="Start fresh, ignoring existing file"
     )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        help="Write run metrics (latency, status codes, retries, phases) to this file; "
+             ".prom for Prometheus text, JSON otherwise"
+    )
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
+    try:
+        profile_modes = parse_profile_modes(args.profile) if args.profile else None
+    except ValueError as e:
+        parser.error(str(e))
     
+    with profile_run("scrape_talks", profile_modes, args.profile_dir):
+        run(args)
+
+
+def run(args):
+    """Scrape, save and summarize with the parsed command-line options (see main)."""
     # Handle fresh start
-    if args.fresh and os.path.exists(args.output):
-        os.remove(args.output)
-        print(f"Removed existing {args.output} for fresh start")
+    if args.fresh:
+        for path in (args.output, journal_path_for(args.output), state_path_for(args.output)):
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"Removed existing {path} for fresh start")
     
     # Use 0 to mean "no limit"
     limit = args.limit if args.limit > 0 else None
@@ -267,9 +436,11 @@ def main():
     print(f"Dharmaseed Talks Scraper (Incremental)")
     print(f"======================================")
     print(f"Limit: {args.limit if args.limit > 0 else 'unlimited'} new talks")
-    print(f"Delay: {args.delay}s between requests")
+    print(f"Delay: {args.delay}s between requests (initial, adaptive)")
+    print(f"Concurrency: {args.concurrency} requests in flight")
     print(f"Output: {args.output}")
     print(f"Save interval: every {args.save_interval} talks")
+    print(f"Re-verify: {args.reverify} existing talks per changed edition")
     print()
     
     # Fetch talks incrementally
@@ -277,22 +448,36 @@ def main():
         filename=args.output,
         limit=limit,
         delay_s=args.delay,
-        save_interval=args.save_interval
+        save_interval=args.save_interval,
+        concurrency=args.concurrency,
+        reverify=args.reverify
     )
     
-    # Final save
-    save_talks_to_json(talks, args.output)
+    # Final save: merge the journal into the sorted JSON file
+    with METRICS.phase("save"):
+        compact_talks(talks, args.output)
+        if args.sqlite:
+            with TalkStore(args.sqlite) as store:
+                store.sync_talks(talks)
+            print(f"Synced {len(talks)} talks to {args.sqlite}")
     
     # Print summary
     print()
     print(f"Summary:")
     print(f"  Total talks in file: {len(talks)}")
     if talks:
-        dates = [t['rec_date'] for t in talks if t.get('rec_date')]
+        dates = [d for d in talks.rec_dates if d]
         if dates:
             print(f"  Date range: {min(dates)} to {max(dates)}")
-        unique_teachers = len(set(t['teacher_id'] for t in talks))
+        unique_teachers = len(set(talks.teacher_ids))
         print(f"  Unique teachers: {unique_teachers}")
+    
+    print()
+    METRICS.set("rate_limiter_rate", LIMITER.rate)
+    METRICS.set("talks_total", len(talks))
+    METRICS.print_summary()
+    if args.metrics:
+        save_metrics(args.metrics)
 
 
 if __name__ == "__main__":
@@ -14,16 +14,25 @@ To get details for a specific item, append the ID: /api/1/teachers/96/
 """
 
 import json
-import time
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import requests
+from corpus import stamp_source
+from http_cache import HTTPCache, install_cache
+from metrics import METRICS, save_metrics
+from profiling import add_profile_arguments, parse_profile_modes, profile_run
+from rate_limiter import AdaptiveRateLimiter, map_concurrently, request_with_retry
+from scrape_state import load_scrape_state, pick_reverify_ids, save_scrape_state
+from talk_columns import TalkColumns
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-BASE = "https://dharmaseed.org"
+# DHARMASEED_BASE points the scraper at another server (e.g. bench/stub_api.py)
+BASE = os.environ.get("DHARMASEED_BASE", "https://dharmaseed.org")
 API_BASE = f"{BASE}/api/1"
 MEDIA_BASE = "https://media.dharmaseed.org"
 
@@ -32,6 +41,22 @@ SESSION.headers.update({
     "User-Agent": "Mozilla/5.0 (compatible; dharmaseed-api-client/2.0)"
 })
 
+# Conditional (ETag / Last-Modified) response cache shared with the talks scraper
+HTTP_CACHE = HTTPCache(os.path.join(SCRIPT_DIR, ".http_cache"))
+install_cache(SESSION, HTTP_CACHE)
+
+# Paces every request made by this script
+LIMITER = AdaptiveRateLimiter(rate=5.0)
+
+# Feeds fetched in parallel by the RSS counting modes (--concurrency N)
+DEFAULT_CONCURRENCY = 4
+
+# Existing teachers re-fetched per incremental run (--reverify N)
+DEFAULT_REVERIFY = 50
+
+# Bytes fed to the RSS parser at a time (read off the socket with --latest-only)
+RSS_CHUNK_SIZE = 64 * 1024
+
 # API Endpoints
 ENDPOINTS = {
     "teachers": f"{API_BASE}/teachers/",
@@ -100,15 +125,21 @@ def build_photo_url(teacher_id: int, photo_field: str) -> str:
     return ""
 
 
+def _json_or_raise(r: requests.Response) -> Any:
+    r.raise_for_status()
+    return r.json()
+
+
 def fetch_item_ids(endpoint: str) -> List[int]:
     """
     Fetch all item IDs from an API endpoint.
     Returns the list of IDs from the 'items' field.
     """
     url = ENDPOINTS.get(endpoint, endpoint)
-    r = SESSION.get(url, timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    with METRICS.phase("list_fetch"):
+        data = request_with_retry(SESSION, url, LIMITER, _json_or_raise, label=f"{endpoint} list")
+    if data is None:
+        raise RuntimeError(f"Could not fetch {endpoint} IDs from {url}")
     return data.get("items", [])
 
 
@@ -116,35 +147,31 @@ def fetch_item_details(endpoint: str, item_id: int, max_retries: int = 5) -> Opt
     """
     Fetch details for a specific item by ID.
     Example: /api/1/teachers/96/
-    Includes retry logic with exponential backoff for rate limiting.
+    Paced by the shared LIMITER; retries 429/5xx with jittered exponential
+    backoff, honoring Retry-After.
     """
     base_url = ENDPOINTS.get(endpoint, endpoint).rstrip("/")
     url = f"{base_url}/{item_id}/"
-    
-    for attempt in range(max_retries):
-        try:
-            r = SESSION.get(url, timeout=30)
-            if r.status_code == 429:
-                # Rate limited - wait longer and retry
-                wait_time = (attempt + 1) * 5  # 5, 10, 15, 20, 25 seconds
-                print(f"  Rate limited, waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            if attempt == max_retries - 1:
-                print(f"  Warning: Failed to fetch {endpoint}/{item_id}: {e}")
-            else:
-                time.sleep(2)
-    return None
+    return request_with_retry(SESSION, url, LIMITER, _json_or_raise,
+                              max_retries=max_retries, label=f"{endpoint}/{item_id}")
 
 
-def fetch_all_items(endpoint: str, limit: Optional[int] = None, 
-                    delay_s: float = 0.3) -> List[Dict[str, Any]]:
+def fetch_teacher_details_checked(teacher_id: int) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """
+    Fetch teacher details and report whether they changed since the last run.
+    Returns (details, changed), where changed is False when the conditional
+    request was answered from the HTTP cache (304), or None on failure.
+    """
+    url = f"{ENDPOINTS['teachers']}{teacher_id}/"
+    return request_with_retry(SESSION, url, LIMITER,
+                              lambda r: (_json_or_raise(r), not getattr(r, "from_cache", False)),
+                              label=f"teachers/{teacher_id}")
+
+
+def fetch_all_items(endpoint: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Fetch all items from an endpoint with their full details.
-    Uses sequential requests with rate limiting to avoid 429 errors.
+    Uses sequential requests paced by the shared LIMITER to avoid 429 errors.
     """
     ids = fetch_item_ids(endpoint)
     if limit:
@@ -160,8 +187,6 @@ def fetch_all_items(endpoint: str, limit: Optional[int] = None,
         
         if (i + 1) % 50 == 0:
             print(f"  Progress: {i + 1}/{len(ids)}")
-        
-        time.sleep(delay_s)
     
     print(f"  Completed: {len(items)}/{len(ids)} fetched successfully")
     return items
@@ -249,71 +274,149 @@ def parse_rss_date(date_str: str) -> str:
         return ""
 
 
-def count_talks_from_rss(teacher_id: int, max_retries: int = 3) -> tuple[int, str]:
+def scan_rss_text(data: bytes, latest_only: bool = False) -> Tuple[int, str]:
+    """
+    Tolerant scan of raw feed bytes: counts <item> tags and takes the first
+    item's pubDate, whatever else the feed contains (HTML entities, bare &).
+    Returns (item_count, last_talk_date).
+    """
+    count = data.count(b"<item>")
+    last_talk_date = ""
+    match = re.search(rb"<item>.*?<pubDate>([^<]+)</pubDate>", data, re.DOTALL)
+    if match:
+        last_talk_date = parse_rss_date(match.group(1).decode("utf-8", "replace"))
+    return (min(count, 1) if latest_only else count, last_talk_date)
+
+
+def scan_rss_feed(chunks: Iterable[bytes], latest_only: bool = False) -> Tuple[int, str]:
+    """
+    Count <item> elements and find the first item's pubDate, parsing the feed
+    incrementally. Each item is dropped from the tree as soon as it is closed.
+    With latest_only, stops after the first item (the count is then 0 or 1).
+    
+    Feeds that are not well-formed XML (an HTML entity such as &eacute; or a
+    bare &) are scanned again with scan_rss_text() from the bytes read so far
+    plus the rest of the feed. A feed cut short (no </channel>, or no </item>
+    for latest_only) raises ValueError so the request is retried.
+    Returns (item_count, last_talk_date).
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    count = 0
+    last_talk_date = ""
+    channel = None
+    in_item = False
+    chunks = iter(chunks)
+    # Kept for the tolerant fallback; full counts hold the whole body anyway
+    seen: List[bytes] = []
+    try:
+        for chunk in chunks:
+            seen.append(chunk)
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if elem.tag == "channel":
+                        channel = elem
+                    elif elem.tag == "item":
+                        in_item = True
+                    continue
+                if elem.tag == "pubDate" and in_item and not last_talk_date:
+                    last_talk_date = parse_rss_date(elem.text or "")
+                elif elem.tag == "item":
+                    in_item = False
+                    count += 1
+                    if latest_only:
+                        return (count, last_talk_date)
+                    if channel is not None:
+                        channel.remove(elem)
+        parser.close()
+    except ET.ParseError as e:
+        for chunk in chunks:
+            if latest_only and b"</item>" in seen[-1]:
+                break
+            seen.append(chunk)
+        data = b"".join(seen)
+        if b"</channel>" not in data and not (latest_only and b"</item>" in data):
+            # Truncated: retried like any other unreadable response
+            raise ValueError(f"incomplete RSS feed: {e}") from e
+        METRICS.inc("rss_tolerant_scans_total")
+        return scan_rss_text(data, latest_only)
+    return (count, last_talk_date)
+
+
+def count_talks_from_rss(teacher_id: int, max_retries: int = 3,
+                         latest_only: bool = False) -> tuple[int, str]:
     """
     Count talks for a teacher by fetching their RSS feed.
     The RSS feed includes all talks (including private ones with access keys).
+    Full counts fetch the feed in one piece so it goes through the conditional
+    HTTP cache (an unchanged feed is answered with a 304). With latest_only the
+    feed is streamed instead and the download stops after the first (most
+    recent) item; streamed requests bypass the cache.
     Returns (talk_count, last_talk_date) where last_talk_date is ISO format.
     """
-    import re
     url = f"{BASE}/feeds/teacher/{teacher_id}/?max-entries=all"
     
-    for attempt in range(max_retries):
+    def handle(r: requests.Response) -> tuple[int, str]:
         try:
-            r = SESSION.get(url, timeout=30)
-            if r.status_code == 429:
-                wait_time = (attempt + 1) * 5
-                print(f"  Rate limited, waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
             if r.status_code == 404:
                 return (0, "")
             r.raise_for_status()
-            
-            content = r.text
-            
-            # Count <item> elements in RSS feed
-            count = content.count('<item>')
-            
-            # Extract first pubDate inside an <item> (most recent talk)
-            # Use regex with DOTALL to match across newlines
-            last_talk_date = ""
-            pub_match = re.search(r'<item>.*?<pubDate>([^<]+)</pubDate>', content, re.DOTALL)
-            if pub_match:
-                last_talk_date = parse_rss_date(pub_match.group(1))
-            
-            return (count, last_talk_date)
-            
-        except requests.RequestException as e:
-            if attempt == max_retries - 1:
-                print(f"  Warning: Failed to fetch RSS for teacher {teacher_id}: {e}")
-            else:
-                time.sleep(2)
-    return (0, "")
+            return scan_rss_feed(r.iter_content(RSS_CHUNK_SIZE), latest_only=latest_only)
+        finally:
+            r.close()
+    
+    result = request_with_retry(SESSION, url, LIMITER, handle, max_retries=max_retries,
+                                label=f"RSS for teacher {teacher_id}", stream=latest_only)
+    return result if result is not None else (0, "")
+
 
+def configure_session_pool(concurrency: int):
+    """Size the SESSION connection pool for `concurrency` workers (see the talks scraper)."""
+    install_cache(SESSION, HTTP_CACHE, pool_size=max(10, concurrency))
 
-def count_talks_per_teacher(teacher_ids: List[int], save_to_file: bool = True) -> Dict[int, dict]:
+
+def count_talks_per_teacher(teacher_ids: List[int], save_to_file: bool = True,
+                            concurrency: int = DEFAULT_CONCURRENCY,
+                            latest_only: bool = False) -> Dict[int, dict]:
     """
     Count talks per teacher by fetching their RSS feeds.
     This is more accurate than the API which doesn't include all talks.
+    With latest_only, only the last talk dates are refreshed (each feed is
+    read up to its first item) and the counts come from the cached file;
+    teachers missing from it get a full count.
     Returns dict with {teacher_id: {"count": N, "last_talk_date": "YYYY-MM-DD"}}.
     """
-    print(f"Counting talks via RSS feeds for {len(teacher_ids)} teachers...")
+    what = "latest talk dates" if latest_only else "talks"
+    print(f"Counting {what} via RSS feeds for {len(teacher_ids)} teachers "
+          f"({concurrency} concurrent)...")
     
+    cached = load_talk_counts() if latest_only else {}
+    if latest_only:
+        missing = sum(1 for tid in teacher_ids if tid not in cached)
+        if missing:
+            print(f"  {missing} teachers not in the cached counts, counting them in full")
     results: Dict[int, dict] = {}
     total_talks = 0
     
-    for i, teacher_id in enumerate(teacher_ids):
-        count, last_talk_date = count_talks_from_rss(teacher_id)
-        if count > 0:
-            results[teacher_id] = {"count": count, "last_talk_date": last_talk_date}
-            total_talks += count
-        
-        if (i + 1) % 50 == 0:
-            print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers, {total_talks} talks found")
-        
-        time.sleep(0.1)
+    def fetch(teacher_id: int) -> tuple[int, str]:
+        # A teacher missing from the cached counts needs a full count first
+        return count_talks_from_rss(teacher_id, latest_only=teacher_id in cached)
     
+    configure_session_pool(concurrency)
+    with METRICS.phase("rss_fetch"):
+        for i, (teacher_id, (count, last_talk_date)) in enumerate(
+                map_concurrently(fetch, teacher_ids, concurrency)):
+            if teacher_id in cached:
+                count = cached[teacher_id].get("count", 0)
+            if count > 0:
+                results[teacher_id] = {"count": count, "last_talk_date": last_talk_date}
+                total_talks += count
+            
+            if (i + 1) % 50 == 0:
+                print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers, {total_talks} talks found")
+    
+    # Completion order is arbitrary; keep the file in teacher list order
+    results = {tid: results[tid] for tid in teacher_ids if tid in results}
     print(f"  Done: {total_talks} talks for {len(results)} teachers")
     
     if save_to_file:
@@ -342,46 +445,61 @@ def load_talk_counts() -> Dict[int, int]:
         return {}
 
 
-def load_talk_stats_from_talks_json() -> Dict[int, dict]:
+def load_talk_stats_from_talks_json(talks_file: Optional[str] = None) -> Dict[int, dict]:
     """
-    Load talk counts and last talk dates from dharmaseed_talks.json.
+    Load talk counts and last talk dates from dharmaseed_talks.json
+    (or `talks_file`).
     This is MUCH faster than fetching RSS feeds for each teacher.
     Returns dict with {teacher_id: {"count": N, "last_talk_date": "YYYY-MM-DD"}}.
     """
-    talks_file = os.path.join(SCRIPT_DIR, "dharmaseed_talks.json")
+    if talks_file is None:
+        talks_file = os.path.join(SCRIPT_DIR, "dharmaseed_talks.json")
     
     try:
         print(f"Loading talks from {talks_file}...")
-        with open(talks_file, "r", encoding="utf-8") as f:
-            talks = json.load(f)
+        # Only the teacher and date columns are needed: skip the descriptions
+        with METRICS.phase("load"):
+            talks = TalkColumns.load(talks_file, descriptions=False)
         print(f"  Loaded {len(talks)} talks")
     except FileNotFoundError:
         print(f"  ERROR: {talks_file} not found!")
         return {}
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"  ERROR: Failed to parse {talks_file}: {e}")
         return {}
     
-    # Aggregate stats per teacher
+    return talk_stats_from_talks(talks)
+
+
+def talk_stats_from_talks(talks: Union[TalkColumns, List[Dict[str, Any]]]) -> Dict[int, dict]:
+    """
+    Aggregate talk counts and last talk dates per teacher from talk records
+    (read straight from the columns when given a TalkColumns).
+    Returns dict with {teacher_id: {"count": N, "last_talk_date": "YYYY-MM-DD"}}.
+    """
     teacher_stats: Dict[int, dict] = {}
     
-    for talk in talks:
-        teacher_id = talk.get("teacher_id")
-        if not teacher_id:
-            continue
-        
-        # Extract date from rec_date (format: "2026-01-26 19:30:00" -> "2026-01-26")
-        rec_date = talk.get("rec_date", "")
-        talk_date = rec_date.split(" ")[0] if rec_date else ""
-        
-        if teacher_id not in teacher_stats:
-            teacher_stats[teacher_id] = {"count": 0, "last_talk_date": ""}
-        
-        teacher_stats[teacher_id]["count"] += 1
-        
-        # Update last_talk_date if this talk is more recent
-        if talk_date and talk_date > teacher_stats[teacher_id]["last_talk_date"]:
-            teacher_stats[teacher_id]["last_talk_date"] = talk_date
+    if isinstance(talks, TalkColumns):
+        pairs = zip(talks.teacher_ids, talks.rec_dates)
+    else:
+        pairs = ((talk.get("teacher_id"), talk.get("rec_date", "")) for talk in talks)
+    
+    with METRICS.phase("stats"):
+        for teacher_id, rec_date in pairs:
+            if not teacher_id:
+                continue
+            
+            # Extract date from rec_date (format: "2026-01-26 19:30:00" -> "2026-01-26")
+            talk_date = rec_date.split(" ")[0] if rec_date else ""
+            
+            if teacher_id not in teacher_stats:
+                teacher_stats[teacher_id] = {"count": 0, "last_talk_date": ""}
+            
+            teacher_stats[teacher_id]["count"] += 1
+            
+            # Update last_talk_date if this talk is more recent
+            if talk_date and talk_date > teacher_stats[teacher_id]["last_talk_date"]:
+                teacher_stats[teacher_id]["last_talk_date"] = talk_date
     
     print(f"  Found stats for {len(teacher_stats)} teachers")
     total_talks = sum(s["count"] for s in teacher_stats.values())
@@ -407,14 +525,31 @@ def fetch_teachers(limit: Optional[int] = None, talk_stats: Optional[Dict[int, d
     return teachers
 
 
-def fetch_teachers_with_local_counts(limit: Optional[int] = None) -> List[Teacher]:
+def load_talk_stats_from_store(db_path: str) -> Dict[int, dict]:
+    """
+    Load talk counts and last talk dates from the SQLite store.
+    Same result as load_talk_stats_from_talks_json(), computed as an indexed
+    GROUP BY instead of a pass over the whole talks file.
+    """
+    from talks_store import TalkStore
+    print(f"Loading talk stats from {db_path}...")
+    with TalkStore(db_path) as store:
+        teacher_stats = store.talk_stats()
+    print(f"  Found stats for {len(teacher_stats)} teachers")
+    return teacher_stats
+
+
+def fetch_teachers_with_local_counts(limit: Optional[int] = None,
+                                     talk_stats: Optional[Dict[int, dict]] = None) -> List[Teacher]:
     """
     Fetch all teachers using local talks.json for counts (FAST).
     Only calls API for teacher details (name, photo, bio).
     This is much faster than the RSS-based approach.
+    Pass `talk_stats` to use stats computed elsewhere (e.g. the SQLite store).
     """
     # Step 1: Load talk stats from local file (instant)
-    talk_stats = load_talk_stats_from_talks_json()
+    if talk_stats is None:
+        talk_stats = load_talk_stats_from_talks_json()
     
     if not talk_stats:
         print("WARNING: No talk stats available, falling back to API-only (no counts)")
@@ -427,30 +562,116 @@ def fetch_teachers_with_local_counts(limit: Optional[int] = None) -> List[Teache
     print(f"Fetching {len(teacher_ids)} teachers from API (using local talk counts)...")
     teachers = []
     
-    for i, teacher_id in enumerate(teacher_ids):
-        # Fetch teacher details from API
-        data = fetch_item_details("teachers", teacher_id)
-        if not data:
-            continue
-        
-        # Get pre-computed stats from local file
-        stats = talk_stats.get(teacher_id, {"count": 0, "last_talk_date": ""})
-        
-        # Parse and add teacher
-        teacher = parse_teacher(data, stats.get("count", 0), stats.get("last_talk_date", ""))
-        teachers.append(teacher)
-        
-        if (i + 1) % 50 == 0:
-            print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers")
-        
-        time.sleep(0.1)  # Rate limiting for API
+    with METRICS.phase("detail_fetch"):
+        for i, teacher_id in enumerate(teacher_ids):
+            # Fetch teacher details from API
+            data = fetch_item_details("teachers", teacher_id)
+            if not data:
+                METRICS.inc("scrape_items_total", kind="teacher", result="failed")
+                continue
+            
+            # Get pre-computed stats from local file
+            stats = talk_stats.get(teacher_id, {"count": 0, "last_talk_date": ""})
+            
+            # Parse and add teacher
+            with METRICS.phase("parse"):
+                teacher = parse_teacher(data, stats.get("count", 0), stats.get("last_talk_date", ""))
+            teachers.append(teacher)
+            
+            if (i + 1) % 50 == 0:
+                print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers")
     
     print(f"  Done: {len(teachers)} teachers fetched")
     teachers.sort(key=lambda t: (t.name.lower(), t.id))
     return teachers
 
 
-def fetch_teachers_with_counts(limit: Optional[int] = None) -> List[Teacher]:
+def load_teachers_baseline(filename: str) -> Dict[int, Dict[str, Any]]:
+    """Load the previous teachers artifact as {teacher_id: record}."""
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return {t["id"]: t for t in json.load(f).get("teachers", [])}
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, KeyError) as e:
+        print(f"  Warning: Could not load previous teachers file: {e}")
+        return {}
+
+
+def fetch_teachers_incremental(filename: str, talk_stats: Optional[Dict[int, dict]] = None,
+                               reverify: int = DEFAULT_REVERIFY,
+                               concurrency: int = DEFAULT_CONCURRENCY,
+                               limit: Optional[int] = None) -> List[Teacher]:
+    """
+    Refresh teachers against the previous artifact in `filename`.
+    Details are fetched only for new teacher IDs plus a rotating sample of
+    `reverify` existing ones (cursor kept in the .state.json file next to
+    the artifact, as for talks); everyone else keeps their previous record.
+    Talk stats are merged locally for all teachers, and teachers no longer
+    listed by the API are dropped. Without a baseline this is a full fetch.
+    """
+    if talk_stats is None:
+        talk_stats = load_talk_stats_from_talks_json()
+    if not talk_stats:
+        print("WARNING: No talk stats available, falling back to API-only (no counts)")
+    
+    with METRICS.phase("load"):
+        baseline = load_teachers_baseline(filename)
+    teacher_ids = fetch_item_ids("teachers")
+    if limit:
+        teacher_ids = teacher_ids[:limit]
+    
+    state = load_scrape_state(filename)
+    new_ids = [tid for tid in teacher_ids if tid not in baseline]
+    existing_ids = set(teacher_ids) & baseline.keys()
+    sample_ids, state["verify_cursor"] = pick_reverify_ids(existing_ids, state["verify_cursor"], reverify)
+    removed = len(baseline.keys() - set(teacher_ids))
+    print(f"Teachers: {len(teacher_ids)} listed, {len(new_ids)} new, {removed} removed, "
+          f"re-verifying {len(sample_ids)} of {len(existing_ids)} existing")
+    
+    fresh: Dict[int, Dict[str, Any]] = {}
+    changed = 0
+    fetch_ids = new_ids + sample_ids
+    configure_session_pool(concurrency)
+    with METRICS.phase("detail_fetch"):
+        for i, (teacher_id, result) in enumerate(
+                map_concurrently(fetch_teacher_details_checked, fetch_ids, concurrency)):
+            if result:
+                fresh[teacher_id], modified = result
+                changed += modified and teacher_id in baseline
+            
+            if (i + 1) % 50 == 0:
+                print(f"  Progress: {i + 1}/{len(fetch_ids)} teachers")
+    print(f"  Fetched {len(fresh)}/{len(fetch_ids)} teachers ({changed} existing changed)")
+    METRICS.inc("scrape_items_total", len(fresh.keys() - baseline.keys()), kind="teacher", result="new")
+    METRICS.inc("scrape_items_total", changed, kind="teacher", result="updated")
+    METRICS.inc("scrape_items_total", len(fetch_ids) - len(fresh), kind="teacher", result="failed")
+    METRICS.inc("scrape_items_total", removed, kind="teacher", result="deleted")
+    
+    record_fields = {f.name for f in fields(Teacher)}
+    teachers = []
+    with METRICS.phase("parse"):
+        for teacher_id in teacher_ids:
+            stats = talk_stats.get(teacher_id, {"count": 0, "last_talk_date": ""})
+            if teacher_id in fresh:
+                teacher = parse_teacher(fresh[teacher_id], stats.get("count", 0), stats.get("last_talk_date", ""))
+            elif teacher_id in baseline:
+                record = {k: v for k, v in baseline[teacher_id].items() if k in record_fields}
+                teacher = Teacher(**record)
+                teacher.talk_count = stats.get("count", 0)
+                teacher.last_talk_date = stats.get("last_talk_date", "")
+            else:
+                # New teacher whose details could not be fetched; picked up next run
+                continue
+            teachers.append(teacher)
+    
+    save_scrape_state(state, filename)
+    teachers.sort(key=lambda t: (t.name.lower(), t.id))
+    return teachers
+
+
+def fetch_teachers_with_counts(limit: Optional[int] = None,
+                               concurrency: int = DEFAULT_CONCURRENCY) -> List[Teacher]:
     """
     Legacy: Fetch all teachers with talk counts via RSS feeds (SLOW).
     Use fetch_teachers_with_local_counts() instead for faster results.
@@ -459,28 +680,32 @@ def fetch_teachers_with_counts(limit: Optional[int] = None) -> List[Teacher]:
     if limit:
         teacher_ids = teacher_ids[:limit]
     
-    print(f"Fetching {len(teacher_ids)} teachers with talk counts via RSS (slow)...")
+    print(f"Fetching {len(teacher_ids)} teachers with talk counts via RSS "
+          f"({concurrency} concurrent)...")
     teachers = []
     total_talks = 0
     
-    for i, teacher_id in enumerate(teacher_ids):
+    def fetch(teacher_id: int):
         # Fetch teacher details from API
         data = fetch_item_details("teachers", teacher_id)
         if not data:
-            continue
-        
+            return None
         # Count talks and get last talk date from RSS feed
-        talk_count, last_talk_date = count_talks_from_rss(teacher_id)
-        total_talks += talk_count
-        
-        # Parse and add teacher
-        teacher = parse_teacher(data, talk_count, last_talk_date)
-        teachers.append(teacher)
-        
-        if (i + 1) % 50 == 0:
-            print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers, {total_talks} talks")
-        
-        time.sleep(0.1)  # Rate limiting
+        return data, count_talks_from_rss(teacher_id)
+    
+    configure_session_pool(concurrency)
+    with METRICS.phase("detail_fetch"):
+        for i, (teacher_id, result) in enumerate(map_concurrently(fetch, teacher_ids, concurrency)):
+            if result:
+                data, (talk_count, last_talk_date) = result
+                total_talks += talk_count
+                
+                # Parse and add teacher
+                teacher = parse_teacher(data, talk_count, last_talk_date)
+                teachers.append(teacher)
+            
+            if (i + 1) % 50 == 0:
+                print(f"  Progress: {i + 1}/{len(teacher_ids)} teachers, {total_talks} talks")
     
     print(f"  Done: {len(teachers)} teachers, {total_talks} total talks")
     teachers.sort(key=lambda t: (t.name.lower(), t.id))
@@ -518,47 +743,155 @@ def save_to_json(data: List, filename: str, source_type: str):
         "api": ENDPOINTS.get(source_type, ""),
         source_type: [asdict(item) for item in data]
     }
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
+    with METRICS.phase("save"):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(db, f, ensure_ascii=False, indent=2)
+        stamp_source(filename)
     print(f"OK: {len(data)} {source_type} -> {filename}")
 
 
+def save_teachers_to_store(teachers: List[Teacher], db_path: str):
+    """Mirror the teachers artifact into the SQLite store."""
+    from talks_store import TalkStore
+    with METRICS.phase("save"), TalkStore(db_path) as store:
+        store.sync_teachers([asdict(t) for t in teachers], BASE, ENDPOINTS["teachers"])
+    print(f"OK: {len(teachers)} teachers -> {db_path}")
+
+
 def main():
     """
     Main entry point - fetches teachers using local talks.json for counts (FAST).
+    With --sqlite [PATH], talk stats are read from the SQLite store and the
+    teachers are written back to it as well.
+    The RSS modes (--counts-only, --rss) fetch --concurrency N feeds at a time;
+    --counts-only --latest-only refreshes just the last talk dates.
+    By default only new teachers and --reverify N existing ones are re-fetched
+    (see fetch_teachers_incremental); --full re-fetches every teacher.
+    --metrics FILE writes the run metrics (see metrics.py), in every mode.
+    --profile [MODES] and --profile-dir DIR profile the run (see profiling.py).
     """
-    import sys
-    
-    # Check command line args
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--counts-only":
-            # Only update talk counts - need teacher IDs first
-            print("Updating talk counts only...")
-            print("Fetching teacher IDs...")
-            teacher_ids = fetch_item_ids("teachers")
-            print(f"  Found {len(teacher_ids)} teachers")
-            count_talks_per_teacher(teacher_ids, save_to_file=True)
-            return
-        elif sys.argv[1] == "--teachers-only":
-            # Only update teachers using cached counts
-            print("Updating teachers only (using cached talk counts)...")
-            talk_counts = load_talk_counts()
-            teachers = fetch_teachers(talk_stats=talk_counts)
-            output_file = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
-            save_to_json(teachers, output_file, "teachers")
-            return
-        elif sys.argv[1] == "--rss":
-            # Legacy mode: use RSS feeds for counting (slow)
-            print("Using RSS feeds for talk counts (legacy mode - slow)...")
-            teachers = fetch_teachers_with_counts()
-            output_file = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
-            save_to_json(teachers, output_file, "teachers")
-            return
-    
-    # Default: use local talks.json for counts (FAST)
-    teachers = fetch_teachers_with_local_counts()
+    import argparse
+    from talks_store import DEFAULT_DB
+    
+    parser = argparse.ArgumentParser(description="Scrape Dharmaseed teachers with talk counts")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--counts-only",
+        dest="mode",
+        action="store_const",
+        const="counts-only",
+        help="Only refresh dharmaseed_talk_counts.json from the RSS feeds"
+    )
+    mode.add_argument(
+        "--teachers-only",
+        dest="mode",
+        action="store_const",
+        const="teachers-only",
+        help="Only refresh the teachers, using the cached talk counts"
+    )
+    mode.add_argument(
+        "--rss",
+        dest="mode",
+        action="store_const",
+        const="rss",
+        help="Count talks from the RSS feeds (legacy mode - slow)"
+    )
+    parser.add_argument(
+        "--sqlite",
+        nargs="?",
+        const=DEFAULT_DB,
+        default=None,
+        help=f"Read talk stats from and write teachers to the SQLite store (default path: {DEFAULT_DB})"
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Requests kept in flight (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--latest-only",
+        action="store_true",
+        help="With --counts-only, refresh just the last talk dates"
+    )
+    parser.add_argument(
+        "--reverify", "-r",
+        type=int,
+        default=DEFAULT_REVERIFY,
+        help=f"Existing teachers to re-check per run (default: {DEFAULT_REVERIFY})"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch every teacher instead of refreshing incrementally"
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        help="Write run metrics (latency, status codes, retries, phases) to this file; "
+             ".prom for Prometheus text, JSON otherwise"
+    )
+    add_profile_arguments(parser)
+    
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.reverify < 0:
+        parser.error("--reverify must not be negative")
+    try:
+        profile_modes = parse_profile_modes(args.profile) if args.profile else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    with profile_run("scrape_teachers", profile_modes, args.profile_dir):
+        try:
+            run(args)
+        finally:
+            METRICS.set("rate_limiter_rate", LIMITER.rate)
+            METRICS.print_summary()
+            if args.metrics:
+                save_metrics(args.metrics)
+
+
+def run(args):
+    """Run the mode selected with the parsed command-line options (see main)."""
+    if args.mode == "counts-only":
+        # Only update talk counts - need teacher IDs first
+        print("Updating talk counts only...")
+        print("Fetching teacher IDs...")
+        teacher_ids = fetch_item_ids("teachers")
+        print(f"  Found {len(teacher_ids)} teachers")
+        count_talks_per_teacher(teacher_ids, save_to_file=True,
+                                concurrency=args.concurrency, latest_only=args.latest_only)
+        return
+    elif args.mode == "teachers-only":
+        # Only update teachers using cached counts
+        print("Updating teachers only (using cached talk counts)...")
+        talk_counts = load_talk_counts()
+        teachers = fetch_teachers(talk_stats=talk_counts)
+        output_file = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
+        save_to_json(teachers, output_file, "teachers")
+        return
+    elif args.mode == "rss":
+        # Legacy mode: use RSS feeds for counting (slow)
+        print("Using RSS feeds for talk counts (legacy mode - slow)...")
+        teachers = fetch_teachers_with_counts(concurrency=args.concurrency)
+        output_file = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
+        save_to_json(teachers, output_file, "teachers")
+        return
+    
+    # Default: use local talks.json (or the SQLite store) for counts (FAST)
+    talk_stats = load_talk_stats_from_store(args.sqlite) if args.sqlite else None
     output_file = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
+    if args.full:
+        teachers = fetch_teachers_with_local_counts(talk_stats=talk_stats)
+    else:
+        teachers = fetch_teachers_incremental(output_file, talk_stats=talk_stats,
+                                              reverify=args.reverify, concurrency=args.concurrency)
     save_to_json(teachers, output_file, "teachers")
+    if args.sqlite:
+        save_teachers_to_store(teachers, args.sqlite)
     
     # Example: find Joseph Goldstein
     jg = [t for t in teachers if "joseph goldstein" in t.name.lower()]
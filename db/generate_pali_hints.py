@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Generate pali_search_hints.json from the talk corpus
+
+Counts, for each term of the Pali glossary (pali_glossary.json), the talks
+that the `categories=` filter of netlify/functions/talks.js would return for
+it, and writes the most frequent terms as the category hints shown in the UI.
+
+Matching follows talks.js: a term is split on whitespace and every word must
+occur (as a diacritic-folded substring) in the title or the description;
+"dana" does not count inside "vedana". All words of the glossary are found
+in one pass per talk with a single compiled alternation (see WordMatcher).
+
+Usage:
+  python generate_pali_hints.py               # glossary and talks in db/
+  python generate_pali_hints.py --top 30
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Set
+
+from corpus import SCRIPT_DIR, TALKS_JSON, fold_text, load_talks
+
+GLOSSARY_JSON = os.path.join(SCRIPT_DIR, "pali_glossary.json")
+HINTS_JSON = os.path.join(SCRIPT_DIR, "pali_search_hints.json")
+TOP_TERMS = 50
+
+# Words that must not match right after a given prefix, as in talks.js
+# ("dana" should not match inside "vedana")
+EXCLUDED_AFTER = {"dana": "ve"}
+
+
+def _word_pattern(word: str) -> str:
+    prefix = EXCLUDED_AFTER.get(word)
+    if prefix:
+        return f"(?<!{re.escape(prefix)}){re.escape(word)}"
+    return re.escape(word)
+
+
+class WordMatcher:
+    """
+    Finds which of a fixed set of words occur as substrings of a text.
+
+    One regex alternation is wrapped in a lookahead, so finditer() tries
+    every position and reports overlapping occurrences ("sati" inside
+    "anapanasati"). At a given position the alternation stops at the
+    shortest word that matches; words extending it ("satipatthana" after
+    "sati") are then checked at the same position.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        words = sorted(set(words), key=lambda w: (len(w), w))
+        self.pattern = re.compile("(?=(" + "|".join(_word_pattern(w) for w in words) + "))")
+        self.single = {w: re.compile(_word_pattern(w)) for w in words}
+        self.extensions = {w: [x for x in words if x != w and x.startswith(w)] for w in words}
+
+    def find(self, text: str) -> Set[str]:
+        found = set()
+        for match in self.pattern.finditer(text):
+            word = match.group(1)
+            found.add(word)
+            for longer in self.extensions[word]:
+                if longer not in found and self.single[longer].match(text, match.start()):
+                    found.add(longer)
+        return found
+
+
+def load_glossary(filename: str = GLOSSARY_JSON) -> List[Dict]:
+    """Glossary entries: [{"pali": ..., "english": ...}, ...]"""
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f).get("terms", [])
+
+
+def glossary_words(glossary: List[Dict]) -> Dict[str, List[str]]:
+    """{pali: folded words} - the words the categories filter looks for."""
+    return {entry["pali"]: fold_text(entry["pali"]).split() for entry in glossary}
+
+
+def matched_words(talks: Iterable[Dict], words: Iterable[str]) -> Iterator[Set[str]]:
+    """For each talk, the subset of `words` (folded) found in its title or description."""
+    matcher = WordMatcher(words)
+    # talks.js also tests the lowercased original text; for plain substrings
+    # that is implied by the folded test, but not for the exclusion rules
+    raw_checks = {w: matcher.single[w] for w in matcher.single if w in EXCLUDED_AFTER}
+
+    for talk in talks:
+        title = (talk.get("title") or "").lower()
+        desc = (talk.get("description") or "").lower()
+        # Words never contain whitespace, so the newline keeps the fields apart
+        found = matcher.find(fold_text(title) + "\n" + fold_text(desc))
+        for word, pattern in raw_checks.items():
+            if word not in found and (pattern.search(title) or pattern.search(desc)):
+                found.add(word)
+        yield found
+
+
+def count_terms(talks: List[Dict], glossary: List[Dict]) -> Dict[str, int]:
+    """Number of talks matching each glossary term, keyed by its "pali" form."""
+    term_words = glossary_words(glossary)
+    counts = {pali: 0 for pali in term_words}
+    for found in matched_words(talks, (w for words in term_words.values() for w in words)):
+        for pali, words in term_words.items():
+            if words and all(w in found for w in words):
+                counts[pali] += 1
+    return counts
+
+
+def build_hints(talks: List[Dict], glossary: List[Dict], top: int = TOP_TERMS) -> Dict:
+    """The hints document: most frequent glossary terms first (glossary order on ties)."""
+    counts = count_terms(talks, glossary)
+    ranked = sorted((e for e in glossary if counts[e["pali"]] > 0), key=lambda e: -counts[e["pali"]])
+    terms = [{"pali": e["pali"], "english": e.get("english", ""), "count": counts[e["pali"]]}
+             for e in ranked[:top]]
+    return {
+        "description": f"Top {len(terms)} Pali terms from {len(talks):,} Dharma talks for search hints",
+        "terms": terms,
+    }
+
+
+def save_hints(hints: Dict, filename: str = HINTS_JSON):
+    """Write the hints file in its one-term-per-line layout."""
+    lines = ",\n".join(
+        "    { " + ", ".join(f"{json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}" for k, v in term.items()) + " }"
+        for term in hints["terms"])
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f"  \"description\": {json.dumps(hints['description'], ensure_ascii=False)},\n")
+        f.write(f"  \"terms\": [\n{lines}\n  ]\n")
+        f.write("}\n")
+    os.replace(tmp_filename, filename)
+    print(f"Saved {len(hints['terms'])} Pali hints -> {filename}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate pali_search_hints.json from the talk corpus")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--glossary", default=GLOSSARY_JSON, help=f"Pali glossary (default: {GLOSSARY_JSON})")
+    parser.add_argument("--output", "-o", default=HINTS_JSON, help=f"Output file (default: {HINTS_JSON})")
+    parser.add_argument("--top", type=int, default=TOP_TERMS, help=f"Terms to keep (default: {TOP_TERMS})")
+    args = parser.parse_args()
+
+    talks = load_talks(args.talks)
+    glossary = load_glossary(args.glossary)
+    print(f"Counting {len(glossary)} glossary terms over {len(talks)} talks...")
+    save_hints(build_hints(talks, glossary, args.top), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,19 @@
 """
 Generate Netlify _redirects file from teachers JSON.
 Creates vanity URLs like /jamesbaraz -> /?teacher=86
+
+Usage:
+  python generate_redirects.py
+  python generate_redirects.py --profile cpu,memory   # see profiling.py
 """
 
 import json
 import re
 import os
 
+from metrics import METRICS
+from profiling import add_profile_arguments, parse_profile_modes, profile_run
+
 def slugify(name: str) -> str:
     """Convert teacher name to URL slug."""
     # Remove special characters, lowercase, replace spaces with nothing
@@ -16,52 +23,59 @@ def slugify(name: str) -> str:
     slug = re.sub(r'\s+', '', slug)  # Remove all spaces
     return slug
 
-def generate_redirects():
+def generate_redirects(teachers=None, redirects_path=None):
+    """
+    Write _redirects for `teachers` (records as in the teachers JSON).
+    Reads dharmaseed_teachers.json when no teachers are passed in.
+    """
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_path = os.path.join(script_dir, 'dharmaseed_teachers.json')
 
     # Output to parent directory (project root)
-    redirects_path = os.path.join(script_dir, '..', '_redirects')
-
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if redirects_path is None:
+        redirects_path = os.path.join(script_dir, '..', '_redirects')
 
-    teachers = data.get('teachers', [])
+    if teachers is None:
+        with METRICS.phase('load'), open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        teachers = data.get('teachers', [])
 
     # Track used slugs to handle duplicates
     used_slugs = {}
     redirects = []
 
-    for t in teachers:
-        if t.get('talk_count', 0) == 0:
-            continue  # Skip teachers with no talks
+    with METRICS.phase('build'):
+        for t in teachers:
+            if t.get('talk_count', 0) == 0:
+                continue  # Skip teachers with no talks
 
-        name = t.get('name', '')
-        tid = t.get('id')
+            name = t.get('name', '')
+            tid = t.get('id')
 
-        if not name or not tid:
-            continue
+            if not name or not tid:
+                continue
 
-        slug = slugify(name)
+            slug = slugify(name)
 
-        if not slug:
-            continue
+            if not slug:
+                continue
 
-        # Handle duplicates by appending ID
-        if slug in used_slugs:
-            slug = f"{slug}{tid}"
+            # Handle duplicates by appending ID
+            if slug in used_slugs:
+                slug = f"{slug}{tid}"
 
-        used_slugs[slug] = tid
+            used_slugs[slug] = tid
 
-        # Redirect to query param URL (SPA style)
-        redirects.append(f"/{slug}  /?teacher={tid}  302")
+            # Redirect to query param URL (SPA style)
+            redirects.append(f"/{slug}  /?teacher={tid}  302")
 
     # Sort alphabetically
-    redirects.sort()
+    with METRICS.phase('sort'):
+        redirects.sort()
 
     # Write _redirects file
-    with open(redirects_path, 'w', encoding='utf-8') as f:
+    with METRICS.phase('save'), open(redirects_path, 'w', encoding='utf-8') as f:
         f.write("# Teacher vanity URLs - auto-generated\n")
         f.write("# Format: /slug -> /#teacher/id\n\n")
         for redirect in redirects:
@@ -74,5 +88,19 @@ def generate_redirects():
     for r in redirects[:5]:
         print(f"  {r}")
 
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the Netlify _redirects file from the teachers JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    try:
+        profile_modes = parse_profile_modes(args.profile) if args.profile else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    with profile_run('redirects', profile_modes, args.profile_dir):
+        generate_redirects()
+
 if __name__ == "__main__":
-    generate_redirects()
+    main()
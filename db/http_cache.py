@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Conditional HTTP cache for the scrapers
+
+A requests transport adapter that keeps GET responses on disk together with
+their ETag / Last-Modified validators. When a cached entry exists, the next
+request for the same URL is sent with If-None-Match / If-Modified-Since, and
+a 304 answer is turned back into a normal 200 response built from disk.
+
+Responses served this way carry `from_cache = True`; everything else has
+`from_cache = False`, so callers can tell whether a resource changed.
+
+Entries are one file each (<sha256(url)>.cache: a JSON header line followed
+by the raw body). The directory is bounded by size; the least recently used
+entries (by file mtime) are evicted first. Streamed requests (stream=True)
+are passed through without caching.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Response headers worth keeping with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+class HTTPCache:
+    """Size-bounded on-disk store of validated responses."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._sizes: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def _load_sizes(self) -> Dict[str, int]:
+        # Scanned lazily, once per process
+        if self._sizes is None:
+            self._sizes = {}
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(".cache"):
+                        path = os.path.join(self.directory, name)
+                        self._sizes[path] = os.path.getsize(path)
+        return self._sizes
+
+    def get(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """Return (meta, body) for a cached URL, or None."""
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def count(self, hit: bool):
+        """Count a revalidated (hit) or fetched (miss) response; safe across worker threads."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def touch(self, url: str):
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes):
+        """Store a response body with its validators, then enforce the size bound."""
+        meta = {"url": url, "headers": headers}
+        data = json.dumps(meta).encode("utf-8") + b"\n" + body
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(url)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            sizes = self._load_sizes()
+            sizes[path] = len(data)
+            self._evict(sizes)
+
+    def _evict(self, sizes: Dict[str, int]):
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        def mtime(path: str) -> float:
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+        for path in sorted(sizes, key=mtime):
+            if total <= self.max_bytes:
+                break
+            total -= sizes.pop(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GETs against an HTTPCache."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        if request.method != "GET" or stream:
+            response = super().send(request, stream=stream, **kwargs)
+            response.from_cache = False
+            return response
+
+        cached = self.cache.get(request.url)
+        if cached:
+            meta, _ = cached
+            if meta["headers"].get("ETag"):
+                request.headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                request.headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and cached:
+            self.cache.count(hit=True)
+            meta, body = cached
+            # Fresh validators from the 304 take precedence, and are stored so
+            # the next request revalidates against them
+            headers = dict(meta["headers"])
+            headers.update((h, response.headers[h]) for h in STORED_HEADERS if h in response.headers)
+            if headers != meta["headers"]:
+                self.cache.put(request.url, headers, body)
+            else:
+                self.cache.touch(request.url)
+            return self._build_cached_response(request, response, {**meta, "headers": headers}, body)
+
+        self.cache.count(hit=False)
+        response.from_cache = False
+        if response.status_code == 200 and (
+                response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            headers = {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+            self.cache.put(request.url, headers, response.content)
+        return response
+
+    def _build_cached_response(self, request: requests.PreparedRequest, not_modified: requests.Response,
+                               meta: Dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        not_modified.close()
+        return response
+
+
+def install_cache(session: requests.Session, cache: HTTPCache, pool_size: int = 10) -> CachingAdapter:
+    """Mount a CachingAdapter for http(s) on `session` and return it."""
+    adapter = CachingAdapter(cache, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
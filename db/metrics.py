@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Run metrics
+
+A small thread-safe registry of counters, gauges and histograms shared by
+the scrapers (via rate_limiter.request_with_retry) and server.py. Each
+series is a metric name plus labels:
+
+  METRICS.inc("http_responses_total", endpoint="/api/1/talks/:id/", status="200")
+  METRICS.observe("http_request_duration_seconds", 0.12, endpoint="/api/1/talks/:id/")
+  with METRICS.phase("detail_fetch"):
+      ...
+
+phase() adds wall time to phase_seconds_total{phase=...}, so a phase that is
+entered many times (e.g. parse, once per talk) reports its total. Phases may
+nest: parse time is also part of detail_fetch.
+
+Reports are JSON (with estimated p50/p90/p99 per histogram) or Prometheus
+text exposition format, picked by the file extension in save_metrics().
+
+Usage:
+  python db/dharmaseed_scrape_talks.py --metrics talks_metrics.json
+  python db/dharmaseed_scrape_teachers.py --metrics teachers_metrics.prom
+  python db/pipeline.py talks teachers --metrics run.json
+  curl localhost:8080/metrics                     # server.py
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Seconds; covers local stub responses up to slow upstream RSS feeds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.9, 0.99)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Counts per bucket (the last one is +Inf), plus the count and sum of all values."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.buckets + (math.inf,), self.counts):
+            cumulative += n
+            buckets[_format_value(bound)] = cumulative
+        result = {"count": self.count, "sum": round(self.sum, 6), "buckets": buckets}
+        for q in QUANTILES:
+            value = self.quantile(q)
+            result[f"p{round(q * 100)}"] = round(value, 6) if value is not None else None
+        return result
+
+
+class Metrics:
+    """Registry of labelled counters, gauges and histograms."""
+
+    def __init__(self, namespace: str = "dharmaseed"):
+        self.namespace = namespace
+        self.started = time.time()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        """Attach a HELP line to a metric in the Prometheus output."""
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def add(self, name: str, amount: float, **labels):
+        """Move a gauge up or down (e.g. in-flight requests)."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter or gauge series (0 if never set)."""
+        key = _labels(labels)
+        with self._lock:
+            for kind in (self._counters, self._gauges):
+                if key in kind.get(name, {}):
+                    return kind[name][key]
+        return 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to phase_seconds_total{phase=name}."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.inc("phase_seconds_total", time.perf_counter() - started, phase=name)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the wall time of the block in histogram `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        def series(kind: Dict[str, Dict[Labels, Any]], render) -> Dict[str, List[Dict[str, Any]]]:
+            return {
+                name: [{"labels": dict(key), **render(value)} for key, value in sorted(values.items())]
+                for name, values in sorted(kind.items())
+            }
+
+        with self._lock:
+            return {
+                "meta": {
+                    "namespace": self.namespace,
+                    "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec="seconds"),
+                    "elapsed_s": round(time.time() - self.started, 3),
+                },
+                "counters": series(self._counters, lambda v: {"value": round(v, 6)}),
+                "gauges": series(self._gauges, lambda v: {"value": round(v, 6)}),
+                "histograms": series(self._histograms, Histogram.to_dict),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        def header(name: str, full: str, kind: str):
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, values in sorted(metrics.items()):
+                    full = f"{self.namespace}_{name}"
+                    header(name, full, kind)
+                    for key, value in sorted(values.items()):
+                        lines.append(f"{full}{_format_labels(key)} {_format_value(value)}")
+            for name, values in sorted(self._histograms.items()):
+                full = f"{self.namespace}_{name}"
+                header(name, full, "histogram")
+                for key, hist in sorted(values.items()):
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets + (math.inf,), hist.counts):
+                        cumulative += n
+                        lines.append(f"{full}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {cumulative}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {_format_value(hist.sum)}")
+                    lines.append(f"{full}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        """One line per phase and per endpoint, for the end of a scraper run."""
+        report = self.to_dict()
+        phases = report["counters"].get("phase_seconds_total", [])
+        if phases:
+            print("Phases: " + ", ".join(f"{p['labels']['phase']} {p['value']:.1f}s" for p in phases))
+        for entry in report["histograms"].get("http_request_duration_seconds", []):
+            endpoint = entry["labels"].get("endpoint", "")
+            statuses = [s for s in report["counters"].get("http_responses_total", [])
+                        if s["labels"].get("endpoint") == endpoint]
+            codes = ", ".join(f"{s['labels']['status']}: {int(s['value'])}" for s in statuses)
+            p50 = entry["p50"] * 1000 if entry["p50"] is not None else 0
+            p99 = entry["p99"] * 1000 if entry["p99"] is not None else 0
+            print(f"  {endpoint}: {entry['count']} requests, p50 {p50:.0f} ms, p99 {p99:.0f} ms ({codes})")
+
+
+METRICS = Metrics()
+
+
+def save_metrics(filename: str, metrics: Metrics = METRICS):
+    """Write a report: Prometheus text for .prom/.txt, JSON otherwise."""
+    text = metrics.to_prometheus() if filename.endswith((".prom", ".txt")) else metrics.to_json() + "\n"
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"Saved metrics -> {filename}")
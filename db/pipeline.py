@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Data pipeline
+
+Runs the scrapers and artifact builders in one process, in a fixed order of
+named stages, sharing the parsed corpus between them:
+
+  talks           scrape new/changed talks     -> dharmaseed_talks.json
+  teacher-stats   talk count / last date per teacher (in memory)
+  teachers        scrape teachers, merge stats -> dharmaseed_teachers.json
+  redirects       teacher vanity URLs          -> ../_redirects
+  search-index    inverted index               -> dharmaseed_search_index.json
+  shards          recent pages / per teacher   -> shards/
+  pali-hints      Pali category counts         -> pali_search_hints.json
+  categories      per-talk category bitmasks   -> dharmaseed_categories.json
+  binary-corpus   talks + teachers, binary     -> dharmaseed_corpus.bin
+  precompress     .gz/.br of the large JSON    -> *.json.gz, *.json.br (not committed)
+
+Each JSON file is parsed at most once per run: scraping stages hand their
+result to later stages, other stages load the artifact lazily.
+
+Derived stages are skipped when the content of their inputs (and of the
+script that builds them) is unchanged since they last ran; the fingerprints
+are kept in pipeline.state.json. Scraping stages always run when selected.
+
+Every run ends by writing the hashes of the talks and teachers JSON to
+dharmaseed_sources.json, which talks.js checks the derived artifacts against.
+
+Usage:
+  python pipeline.py                                  # all stages
+  python pipeline.py talks search-index shards -c 4   # a subset, in pipeline order
+  python pipeline.py --force redirects                # ignore fingerprints
+  python pipeline.py talks --metrics run.prom         # request/phase/stage metrics (see metrics.py)
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from corpus import SCRIPT_DIR, TALKS_JSON, TEACHERS_JSON, file_fingerprint, load_talks, load_teachers, stamp_source
+from metrics import METRICS, save_metrics
+
+STATE_JSON = os.path.join(SCRIPT_DIR, "pipeline.state.json")
+REDIRECTS_FILE = os.path.join(SCRIPT_DIR, "..", "_redirects")
+
+
+def _script(name: str) -> str:
+    return os.path.join(SCRIPT_DIR, name)
+
+
+class Pipeline:
+    """Options and the corpus shared by all stages of one run."""
+
+    def __init__(self, options: Dict[str, Any], force: bool = False, state_file: str = STATE_JSON):
+        self.options = options
+        self.force = force
+        self.state_file = state_file
+        self.state: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(state_file):
+            with open(state_file, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        self._talks: Optional[List[Dict]] = None
+        self._teachers: Optional[List[Dict]] = None
+        self.teacher_stats: Optional[Dict[int, dict]] = None
+        self._fingerprints: Dict[str, str] = {}
+
+    @property
+    def talks(self) -> List[Dict]:
+        if self._talks is None:
+            print(f"Loading {TALKS_JSON}...")
+            self._talks = load_talks(TALKS_JSON)
+        return self._talks
+
+    @talks.setter
+    def talks(self, talks: List[Dict]):
+        self._talks = talks
+        self._fingerprints.pop(TALKS_JSON, None)
+
+    @property
+    def teachers(self) -> List[Dict]:
+        if self._teachers is None:
+            print(f"Loading {TEACHERS_JSON}...")
+            self._teachers = load_teachers(TEACHERS_JSON)
+        return self._teachers
+
+    @teachers.setter
+    def teachers(self, teachers: List[Dict]):
+        self._teachers = teachers
+        self._fingerprints.pop(TEACHERS_JSON, None)
+
+    def fingerprint(self, path: str) -> str:
+        # Cached until a stage rewrites the file (see the setters above)
+        if path not in self._fingerprints:
+            self._fingerprints[path] = file_fingerprint(path)
+        return self._fingerprints[path]
+
+    def input_fingerprints(self, stage: "Stage") -> Dict[str, str]:
+        return {os.path.basename(path): self.fingerprint(path) for path in stage.inputs}
+
+    def is_current(self, stage: "Stage") -> bool:
+        """True if the stage's inputs and outputs are unchanged since its last run."""
+        if stage.always_run or self.force:
+            return False
+        if not all(os.path.exists(path) for path in stage.outputs):
+            return False
+        return self.state.get(stage.name) == self.input_fingerprints(stage)
+
+    def record(self, stage: "Stage"):
+        if not stage.always_run:
+            self.state[stage.name] = self.input_fingerprints(stage)
+
+    def save_state(self):
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+# --- stages ---
+
+def run_talks(p: Pipeline):
+    from dharmaseed_scrape_talks import fetch_talks_incremental, compact_talks
+    limit = p.options["limit"]
+    talks = fetch_talks_incremental(
+        filename=TALKS_JSON,
+        limit=limit if limit > 0 else None,
+        concurrency=p.options["concurrency"],
+    )
+    compact_talks(talks, TALKS_JSON)
+    p.talks = talks
+
+
+def run_teacher_stats(p: Pipeline):
+    from dharmaseed_scrape_teachers import talk_stats_from_talks
+    print("Aggregating talk stats per teacher...")
+    p.teacher_stats = talk_stats_from_talks(p.talks)
+
+
+def run_teachers(p: Pipeline):
+    from dharmaseed_scrape_teachers import fetch_teachers_incremental, save_to_json
+    if p.teacher_stats is None:
+        run_teacher_stats(p)
+    teachers = fetch_teachers_incremental(TEACHERS_JSON, talk_stats=p.teacher_stats,
+                                          concurrency=p.options["concurrency"])
+    save_to_json(teachers, TEACHERS_JSON, "teachers")
+    p.teachers = [asdict(t) for t in teachers]
+
+
+def run_redirects(p: Pipeline):
+    from generate_redirects import generate_redirects
+    generate_redirects(p.teachers, REDIRECTS_FILE)
+
+
+def run_search_index(p: Pipeline):
+    from build_search_index import INDEX_JSON, build_search_index, save_search_index
+    print(f"Indexing {len(p.talks)} talks...")
+    index = build_search_index(p.talks, p.teachers, p.fingerprint(TALKS_JSON), p.fingerprint(TEACHERS_JSON))
+    save_search_index(index, INDEX_JSON)
+
+
+def run_shards(p: Pipeline):
+    from build_shards import SHARDS_DIR, build_shards
+    build_shards(p.talks, SHARDS_DIR, source_sha256=p.fingerprint(TALKS_JSON))
+
+
+def run_pali_hints(p: Pipeline):
+    from generate_pali_hints import GLOSSARY_JSON, HINTS_JSON, build_hints, load_glossary, save_hints
+    glossary = load_glossary(GLOSSARY_JSON)
+    print(f"Counting {len(glossary)} glossary terms over {len(p.talks)} talks...")
+    save_hints(build_hints(p.talks, glossary), HINTS_JSON)
+
+
+def run_categories(p: Pipeline):
+    from build_categories import CATEGORIES_JSON, build_category_index, save_category_index
+    from generate_pali_hints import GLOSSARY_JSON, load_glossary
+    index = build_category_index(p.talks, load_glossary(GLOSSARY_JSON), p.fingerprint(TALKS_JSON))
+    save_category_index(index, CATEGORIES_JSON)
+
+
+def run_binary_corpus(p: Pipeline):
+    from binary_corpus import CORPUS_BIN, build_binary_corpus, save_binary_corpus
+    print(f"Encoding {len(p.talks)} talks and {len(p.teachers)} teachers...")
+    data = build_binary_corpus(p.talks, p.teachers, p.fingerprint(TALKS_JSON), p.fingerprint(TEACHERS_JSON))
+    save_binary_corpus(data, CORPUS_BIN)
+
+
+def run_precompress(p: Pipeline):
+    from precompress import DEFAULT_FILES, precompress
+    for name in DEFAULT_FILES:
+        path = _script(name)
+        if os.path.exists(path):
+            print(f"Compressing {name}...")
+            precompress(path)
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[Pipeline], None]
+    inputs: Tuple[str, ...] = ()    # files whose content decides whether to re-run
+    outputs: Tuple[str, ...] = ()   # files that must exist for the stage to be skipped
+    always_run: bool = False        # scraping stages: their input is the remote API
+
+
+STAGES = [
+    Stage("talks", run_talks, always_run=True),
+    # Cheap and only kept in memory; the teachers stage runs it if needed
+    Stage("teacher-stats", run_teacher_stats, always_run=True),
+    Stage("teachers", run_teachers, always_run=True),
+    Stage("redirects", run_redirects,
+          inputs=(TEACHERS_JSON, _script("generate_redirects.py")),
+          outputs=(REDIRECTS_FILE,)),
+    Stage("search-index", run_search_index,
+          inputs=(TALKS_JSON, TEACHERS_JSON, _script("build_search_index.py"), _script("corpus.py")),
+          outputs=(_script("dharmaseed_search_index.json"),)),
+    Stage("shards", run_shards,
+          inputs=(TALKS_JSON, _script("build_shards.py"), _script("corpus.py")),
+          outputs=(_script(os.path.join("shards", "index.json")),)),
+    Stage("pali-hints", run_pali_hints,
+          inputs=(TALKS_JSON, _script("pali_glossary.json"), _script("generate_pali_hints.py"), _script("corpus.py")),
+          outputs=(_script("pali_search_hints.json"),)),
+    Stage("categories", run_categories,
+          inputs=(TALKS_JSON, _script("pali_glossary.json"), _script("build_categories.py"),
+                  _script("generate_pali_hints.py"), _script("corpus.py")),
+          outputs=(_script("dharmaseed_categories.json"),)),
+    Stage("binary-corpus", run_binary_corpus,
+          inputs=(TALKS_JSON, TEACHERS_JSON, _script("binary_corpus.py"), _script("corpus.py")),
+          outputs=(_script("dharmaseed_corpus.bin"),)),
+    Stage("precompress", run_precompress,
+          inputs=(TALKS_JSON, TEACHERS_JSON, _script("dharmaseed_search_index.json"), _script("precompress.py")),
+          outputs=(TALKS_JSON + ".gz",)),
+]
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+
+def run_pipeline(p: Pipeline, selected: List[str]):
+    """Run the selected stages in pipeline order."""
+    for stage in STAGES:
+        if stage.name not in selected:
+            continue
+        if p.is_current(stage):
+            print(f"== {stage.name}: inputs unchanged, skipped")
+            METRICS.set("stage_seconds", 0, stage=stage.name, status="skipped")
+            continue
+        print(f"== {stage.name}")
+        started = time.perf_counter()
+        stage.run(p)
+        p.record(stage)
+        p.save_state()
+        elapsed = time.perf_counter() - started
+        METRICS.set("stage_seconds", elapsed, stage=stage.name, status="ran")
+        print(f"== {stage.name}: done in {elapsed:.1f}s")
+
+    # The scrapers stamp what they write; this also covers hand-edited files
+    for path in (TALKS_JSON, TEACHERS_JSON):
+        if os.path.exists(path):
+            stamp_source(path, p.fingerprint(path))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the data pipeline stages in one process")
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help=f"Stages to run (default: all): {', '.join(STAGE_NAMES)}")
+    parser.add_argument("--force", "-f", action="store_true",
+                        help="Run derived stages even if their inputs are unchanged")
+    parser.add_argument("--limit", "-l", type=int, default=100,
+                        help="Maximum number of NEW talks to fetch (default: 100, use 0 for all)")
+    parser.add_argument("--concurrency", "-c", type=int, default=1,
+                        help="Requests kept in flight by the scraping stages (default: 1)")
+    parser.add_argument("--metrics", "-m",
+                        help="Write run metrics here: .prom for Prometheus text, JSON otherwise")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.stages if name not in STAGE_NAMES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGE_NAMES)})")
+    selected = args.stages or STAGE_NAMES
+
+    p = Pipeline({"limit": args.limit, "concurrency": args.concurrency}, force=args.force)
+    try:
+        run_pipeline(p, selected)
+    finally:
+        METRICS.print_summary()
+        if args.metrics:
+            save_metrics(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
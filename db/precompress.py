@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Precompress the large JSON artifacts
+
+Writes .gz (and .br, if the optional `brotli` package is installed) siblings
+next to the JSON files in db/, so server.py can send them compressed without
+compressing on every request. Siblings older than their source are ignored
+by the server, so a stale one is never served, and each sibling is written
+to a temp file and renamed so the server never sees a partial one.
+
+The siblings are not committed (see .gitignore); run the `precompress`
+stage of pipeline.py (part of a plain `python pipeline.py`) or this script
+after updating the data locally.
+
+Usage:
+  python precompress.py                 # default artifacts
+  python precompress.py some.json ...   # specific files
+"""
+
+import gzip
+import os
+from typing import List
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_FILES = [
+    "dharmaseed_talks.json",
+    "dharmaseed_teachers.json",
+    "dharmaseed_search_index.json",
+]
+
+
+def _write_atomic(filename: str, data: bytes):
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(data)
+    os.replace(tmp_filename, filename)
+
+
+def precompress(path: str) -> List[str]:
+    """Write compressed siblings of `path`; returns the files written."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    written = []
+    # mtime=0 keeps the output byte-identical for identical input
+    gz_path = f"{path}.gz"
+    _write_atomic(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    if brotli is not None:
+        br_path = f"{path}.br"
+        _write_atomic(br_path, brotli.compress(data, quality=11))
+        written.append(br_path)
+
+    for out in written:
+        print(f"  {os.path.basename(out)}: {len(data) / 1024:.0f} KB -> {os.path.getsize(out) / 1024:.0f} KB")
+    return written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for the large JSON artifacts")
+    parser.add_argument("files", nargs="*", help="Files to compress (default: the db/ JSON artifacts)")
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join(SCRIPT_DIR, name) for name in DEFAULT_FILES]
+    if brotli is None:
+        print("Note: brotli not installed, writing .gz only (pip install brotli)")
+    for path in files:
+        if not os.path.exists(path):
+            print(f"Skipping {path} (not found)")
+            continue
+        print(f"Compressing {path}...")
+        precompress(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Profiling mode for the db scripts
+
+--profile [MODES] on dharmaseed_scrape_talks.py, dharmaseed_scrape_teachers.py
+and generate_redirects.py wraps the run in profile_run(), which reports:
+
+  time     wall time per phase (the phase timers of metrics.py) and the time
+           spent waiting on HTTP responses - always on
+  cpu      cProfile: <name>.pstats plus the top functions by cumulative and
+           by own time
+  memory   tracemalloc: peak traced memory and the top allocation sites
+           close to the peak (a snapshot is taken whenever traced memory
+           grows 10% past the last one, checked every 50 ms)
+
+cProfile only sees the main thread: time the worker threads spend on the
+network shows up as the main thread waiting on their futures.
+
+The summary is printed and written to <name>.profile.txt in --profile-dir.
+
+Usage:
+  python dharmaseed_scrape_talks.py --profile
+  python dharmaseed_scrape_teachers.py --profile cpu,memory --profile-dir /tmp/prof
+  python -m pstats /tmp/prof/scrape_teachers.pstats
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set
+
+from metrics import METRICS
+
+PROFILE_MODES = ("time", "cpu", "memory")
+TOP_N = 25
+
+
+def parse_profile_modes(value: Optional[str]) -> Set[str]:
+    """Modes from a --profile value ("cpu,memory", "all"); "time" is always included."""
+    modes = {"time"}
+    for mode in (value or "").split(","):
+        mode = mode.strip()
+        if mode == "all":
+            modes.update(PROFILE_MODES)
+        elif mode:
+            if mode not in PROFILE_MODES:
+                raise ValueError(f"unknown profile mode {mode!r} (choose from {', '.join(PROFILE_MODES)}, all)")
+            modes.add(mode)
+    return modes
+
+
+def add_profile_arguments(parser):
+    """Add --profile and --profile-dir to an argparse parser."""
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="time",
+        default=None,
+        metavar="MODES",
+        help=f"Report time per phase; add cpu and/or memory (comma-separated) for cProfile "
+             f"and tracemalloc summaries of the top {TOP_N} functions and allocation sites"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=".",
+        help="Directory for the .pstats and .profile.txt files (default: current directory)"
+    )
+
+
+def _phase_lines(wall: float) -> List[str]:
+    report = METRICS.to_dict()
+    phases = sorted(report["counters"].get("phase_seconds_total", []), key=lambda p: -p["value"])
+    lines = [f"Wall time: {wall:.2f}s", "", "Phases (nested phases are also part of their parent):"]
+    for p in phases:
+        share = p["value"] / wall if wall > 0 else 0
+        lines.append(f"  {p['labels']['phase']:<16} {p['value']:9.2f}s  {share:6.1%}")
+    if not phases:
+        lines.append("  (none recorded)")
+    requests = report["histograms"].get("http_request_duration_seconds", [])
+    if requests:
+        waited = sum(r["sum"] for r in requests)
+        count = sum(r["count"] for r in requests)
+        lines.append(f"  {'http requests':<16} {waited:9.2f}s  ({count} requests, summed over workers)")
+    return lines
+
+
+def _pstats_lines(profiler: cProfile.Profile, path: str, top: int) -> List[str]:
+    profiler.dump_stats(path)
+    lines = [f"cProfile stats -> {path}"]
+    for key, title in (("cumulative", "cumulative time"), ("tottime", "own time")):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats(key).print_stats(top)
+        # Drop the header lines before the table
+        text = stream.getvalue()
+        table = text[text.index("   ncalls"):] if "   ncalls" in text else text
+        lines += ["", f"Top {top} functions by {title}:", table.rstrip()]
+    return lines
+
+
+class PeakSnapshots:
+    """
+    Keeps the tracemalloc snapshot taken closest to peak memory: a
+    background thread snapshots whenever traced memory is `growth` above
+    the last snapshot.
+    """
+
+    def __init__(self, interval: float = 0.05, growth: float = 1.1):
+        self.interval = interval
+        self.growth = growth
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        tracemalloc.start()
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if self.snapshot is None or current > self.snapshot_size * self.growth:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def stop(self) -> int:
+        """Stop sampling (with a last check) and return the peak traced memory."""
+        self._stop.set()
+        self._thread.join()
+        self.check()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    def lines(self, peak: int, top: int) -> List[str]:
+        lines = [f"Peak traced memory: {peak / 2**20:.1f} MB", "",
+                 f"Top {top} allocation sites at {self.snapshot_size / 2**20:.1f} MB traced:"]
+        snapshot = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 2**20:8.2f} MB {stat.count:>9} blocks  "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        return lines
+
+
+@contextmanager
+def profile_run(name: str, modes: Optional[Set[str]], output_dir: str = ".", top: int = TOP_N) -> Iterator[None]:
+    """
+    Profile the block with `modes` (see parse_profile_modes); a no-op when
+    modes is None. The report is written even if the block raises.
+    """
+    if modes is None:
+        yield
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile() if "cpu" in modes else None
+    memory = PeakSnapshots() if "memory" in modes else None
+    if memory:
+        memory.start()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - started
+        peak = memory.stop() if memory else 0
+
+        lines = [f"Profile: {name} ({', '.join(sorted(modes))})", ""] + _phase_lines(wall)
+        if profiler:
+            lines += [""] + _pstats_lines(profiler, os.path.join(output_dir, f"{name}.pstats"), top)
+        if memory:
+            lines += [""] + memory.lines(peak, top)
+
+        report_path = os.path.join(output_dir, f"{name}.profile.txt")
+        text = "\n".join(lines) + "\n"
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print()
+        print(text, end="")
+        print(f"Saved profile -> {report_path}")
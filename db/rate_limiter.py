@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+
+Shared request pacing for the Dharmaseed scrapers.
+
+A token bucket hands out request slots at the current rate. The rate adapts
+AIMD-style (additive increase, multiplicative decrease):
+  - every healthy response nudges the rate up (about +increase req/s per second)
+  - a 429 or 5xx response cuts the rate by `decrease` and, if the server sent
+    Retry-After, pauses every worker until that time has passed
+
+request_with_retry() wraps a single GET with the limiter and jittered
+exponential backoff, so callers only deal with the parsed result. It records
+every attempt in metrics.METRICS, per endpoint (the URL path with numeric IDs
+replaced by :id): latency, status codes, bytes received, retries and 429s.
+map_concurrently() runs many such calls on a bounded window of workers.
+"""
+
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+
+from metrics import METRICS
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = 30  # seconds, unless the caller passes timeout=
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket with AIMD rate adaptation."""
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        burst: float = 1.0
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        """Set the current rate, clamped to [min_rate, max_rate]."""
+        with self._lock:
+            self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Block until a request slot is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._pause_until:
+                    wait_time = self._pause_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def on_success(self):
+        """Additive increase: roughly +increase req/s per second of healthy traffic."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / max(self.rate, 1.0))
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease, plus a shared pause when the server asks for one."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._pause_until = max(self._pause_until, time.monotonic() + retry_after)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date) into seconds.
+    Returns None if missing or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def endpoint_of(url: str) -> str:
+    """Metric label for a URL: its path with numeric IDs replaced by :id (/api/1/ kept)."""
+    return re.sub(r"(?<!/api)/\d+(?=/|$)", "/:id", urlsplit(url).path) or "/"
+
+
+def _record_response(endpoint: str, r: requests.Response, elapsed: float, stream: bool):
+    from_cache = getattr(r, "from_cache", False)
+    METRICS.observe("http_request_duration_seconds", elapsed, endpoint=endpoint)
+    METRICS.inc("http_responses_total", endpoint=endpoint, status="304" if from_cache else r.status_code)
+    if from_cache:
+        return
+    # Streamed bodies are read by the handler; count what the server announced
+    size = int(r.headers.get("Content-Length") or 0) if stream else len(r.content)
+    METRICS.inc("http_response_bytes_total", size, endpoint=endpoint)
+
+
+def request_with_retry(
+    session: requests.Session,
+    url: str,
+    limiter: AdaptiveRateLimiter,
+    handle: Callable[[requests.Response], Any] = lambda r: r,
+    max_retries: int = 5,
+    label: str = "",
+    **kwargs
+) -> Optional[Any]:
+    """
+    GET `url` through the limiter and return handle(response).
+
+    Retries with jittered exponential backoff on connection errors, 429/5xx
+    (honoring Retry-After) and on errors raised by `handle` (e.g. truncated
+    JSON). Other HTTP errors raised by `handle` (404, 403, ...) are final.
+    Returns None once retries are exhausted.
+    """
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    label = label or url
+    endpoint = endpoint_of(url)
+
+    for attempt in range(max_retries):
+        if attempt:
+            METRICS.inc("http_retries_total", endpoint=endpoint)
+        limiter.acquire()
+        r = None
+        try:
+            started = time.perf_counter()
+            try:
+                r = session.get(url, **kwargs)
+            except requests.RequestException as e:
+                METRICS.observe("http_request_duration_seconds", time.perf_counter() - started, endpoint=endpoint)
+                METRICS.inc("http_errors_total", endpoint=endpoint, error=type(e).__name__)
+                raise
+            _record_response(endpoint, r, time.perf_counter() - started, kwargs.get("stream", False))
+            if r.status_code in RETRYABLE_STATUS:
+                retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                limiter.on_throttle(retry_after)
+                if r.status_code == 429:
+                    METRICS.inc("http_throttled_total", endpoint=endpoint)
+                r.close()
+                if attempt == max_retries - 1:
+                    print(f"  Warning: Failed to fetch {label}: HTTP {r.status_code}")
+                    METRICS.inc("http_failures_total", endpoint=endpoint)
+                    return None
+                wait_time = retry_after if retry_after is not None else backoff_delay(attempt)
+                print(f"  HTTP {r.status_code} for {label}, waiting {wait_time:.1f}s "
+                      f"(rate now {limiter.rate:.2f} req/s)...")
+                time.sleep(wait_time)
+                continue
+            result = handle(r)
+            limiter.on_success()
+            return result
+        except requests.HTTPError as e:
+            # Non-retryable status raised by the handler
+            print(f"  Warning: Failed to fetch {label}: {e}")
+            METRICS.inc("http_failures_total", endpoint=endpoint)
+            return None
+        except (requests.RequestException, ValueError) as e:
+            if r is not None:
+                # Raised by the handler (truncated body, bad JSON)
+                METRICS.inc("http_errors_total", endpoint=endpoint, error=type(e).__name__)
+            if attempt == max_retries - 1:
+                print(f"  Warning: Failed to fetch {label}: {e}")
+            else:
+                time.sleep(backoff_delay(attempt))
+    METRICS.inc("http_failures_total", endpoint=endpoint)
+    return None
+
+
+def map_concurrently(fn: Callable[[Any], Any], items: Iterable[Any],
+                     concurrency: int = 4) -> Iterator[Tuple[Any, Any]]:
+    """
+    Run fn(item) for each item with up to `concurrency` calls in flight.
+    The request rate is still governed by the limiter fn uses, not by the
+    number of workers.
+    Yields (item, result) in completion order.
+    """
+    concurrency = max(1, concurrency)
+    
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Keep a bounded window of pending futures instead of submitting everything at once
+        pending = {}
+        for item in items:
+            pending[executor.submit(fn, item)] = item
+            if len(pending) >= concurrency * 2:
+                break
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                yield item, future.result()
+                next_item = next(items, None)
+                if next_item is not None:
+                    pending[executor.submit(fn, next_item)] = next_item
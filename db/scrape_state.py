@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Incremental scrape state
+
+Both scrapers keep a small JSON file next to their output
+(dharmaseed_talks.state.json, dharmaseed_teachers.state.json) with the last
+seen list edition and the position of the rolling re-verify cursor, so each
+run re-fetches the next slice of existing records to pick up edits.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Set, Tuple
+
+
+def state_path_for(filename: str) -> str:
+    """dharmaseed_talks.json -> dharmaseed_talks.state.json"""
+    return os.path.splitext(filename)[0] + ".state.json"
+
+
+def load_scrape_state(filename: str) -> Dict[str, Any]:
+    """
+    Load the scraper state kept next to the data file:
+    {"edition": last seen list edition, "verify_cursor": rolling re-verify position}
+    """
+    state = {"edition": "", "verify_cursor": 0}
+    try:
+        with open(state_path_for(filename), 'r', encoding='utf-8') as f:
+            state.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError as e:
+        print(f"  Warning: Could not load scraper state: {e}")
+    return state
+
+
+def save_scrape_state(state: Dict[str, Any], filename: str):
+    """Save the scraper state next to the data file."""
+    with open(state_path_for(filename), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+        f.write("\n")
+
+
+def pick_reverify_ids(existing_ids: Set[int], cursor: int, budget: int) -> Tuple[List[int], int]:
+    """
+    Pick the next `budget` existing IDs to re-verify, walking newest to oldest
+    and wrapping around, so every record is re-checked once per full cycle.
+    Returns (IDs, new cursor).
+    """
+    ordered = sorted(existing_ids, reverse=True)
+    if not ordered or budget <= 0:
+        return [], cursor
+    cursor %= len(ordered)
+    budget = min(budget, len(ordered))
+    picked = (ordered + ordered)[cursor:cursor + budget]
+    return picked, (cursor + budget) % len(ordered)
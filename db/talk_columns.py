@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory talk corpus
+
+TalkColumns holds the talks artifact column by column instead of as one
+dict per talk (~1 KB each with its keys and values):
+
+  ids, teacher_ids, venue_ids, retreat_ids, language_ids   array('q')
+  durations                                                array('d')
+  rec_dates, recording_types                               interned str
+  titles, audio_urls                                       list of str
+  descriptions                                             zlib blocks
+
+Aggregation passes read the columns directly (e.g. zip(teacher_ids,
+rec_dates)); descriptions are only decompressed, a block of talks at a
+time, when a whole record is needed. Records are still exposed as dicts
+(indexing and iteration build them on the fly), so a TalkColumns can be
+passed where a list of talk dicts is read.
+
+Records that do not have exactly the Talk fields with the usual types
+(None venue/retreat, an int duration, ...) are kept verbatim on the side,
+so records round-trip unchanged. load() parses the JSON array one talk at
+a time, so the full list of dicts never exists.
+"""
+
+import json
+import math
+import sys
+import zlib
+from json.encoder import encode_basestring
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FIELDS = ("id", "title", "teacher_id", "description", "rec_date", "duration_in_minutes",
+          "venue_id", "retreat_id", "language_id", "recording_type", "audio_url")
+
+BLOCK_SIZE = 64              # talks per compressed description block
+NONE = -1                    # venue_id / retreat_id None
+READ_CHUNK = 1024 * 1024     # characters read at a time by iter_json_array()
+
+# One regular record as json.dump(..., indent=2) writes it inside the list
+RECORD_JSON = ('{\n    "id": %d,\n    "title": %s,\n    "teacher_id": %d,\n    "description": %s,\n'
+               '    "rec_date": %s,\n    "duration_in_minutes": %r,\n    "venue_id": %s,\n'
+               '    "retreat_id": %s,\n    "language_id": %d,\n    "recording_type": %s,\n'
+               '    "audio_url": %s\n  }')
+
+
+def iter_json_array(f: TextIO, chunk_size: int = READ_CHUNK) -> Iterator[Any]:
+    """Yield the elements of the JSON array in `f` one by one, reading it in chunks."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    started = after_element = after_comma = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            raise ValueError("unexpected end of JSON array")
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise ValueError("expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if char == "]" and not after_comma:
+            return
+        if after_element:
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            after_element, after_comma = False, True
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # The element may continue past the buffer: read more and retry
+            if eof or not fill():
+                raise
+            continue
+        if (end == len(buffer) or buffer[end] not in " \t\r\n,]") and not eof and fill():
+            # A number cut at the chunk boundary decodes as a shorter one
+            continue
+        pos = end
+        after_element, after_comma = True, False
+        yield item
+
+
+def _regular(talk: Dict[str, Any]) -> bool:
+    """True if the record fits the columns exactly (Talk fields, usual types)."""
+    if tuple(talk) != FIELDS:
+        return False
+    venue_id, retreat_id = talk["venue_id"], talk["retreat_id"]
+    duration = talk["duration_in_minutes"]
+    return (type(talk["id"]) is int and type(talk["teacher_id"]) is int
+            and type(talk["language_id"]) is int and type(duration) is float and math.isfinite(duration)
+            and type(talk["title"]) is str and type(talk["description"]) is str
+            and type(talk["rec_date"]) is str and type(talk["recording_type"]) is str
+            and type(talk["audio_url"]) is str
+            and (venue_id is None or (type(venue_id) is int and venue_id >= 0))
+            and (retreat_id is None or (type(retreat_id) is int and retreat_id >= 0)))
+
+
+def _int_or_zero(value: Any) -> int:
+    return value if type(value) is int else 0
+
+
+class TalkColumns:
+    """Column-oriented talk list; see the module docstring."""
+
+    def __init__(self, descriptions: bool = True):
+        self.ids = array("q")
+        self.teacher_ids = array("q")
+        self.venue_ids = array("q")
+        self.retreat_ids = array("q")
+        self.language_ids = array("q")
+        self.durations = array("d")
+        self.rec_dates: List[str] = []
+        self.recording_types: List[str] = []
+        self.titles: List[str] = []
+        self.audio_urls: List[str] = []
+        self.has_descriptions = descriptions
+        # Description of the talk at position p: block _desc_blocks[p], item
+        # _desc_offsets[p]. Blocks are immutable, so merge() shares them.
+        self._blocks: List[bytes] = []
+        self._desc_blocks = array("l")
+        self._desc_offsets = array("H")
+        self._pending: List[str] = []            # descriptions not packed into a block yet
+        self._irregular: Dict[int, Dict] = {}    # position -> verbatim record
+        self._cached_block: Tuple[int, List[str]] = (-1, [])
+        self._positions: Optional[Dict[int, int]] = None
+
+    # --- building ---
+
+    @classmethod
+    def from_records(cls, talks: Iterable[Dict], descriptions: bool = True) -> "TalkColumns":
+        columns = cls(descriptions)
+        for talk in talks:
+            columns.append(talk)
+        return columns
+
+    @classmethod
+    def load(cls, filename: str, descriptions: bool = True) -> "TalkColumns":
+        """Read a talks artifact without materializing its list of dicts."""
+        with open(filename, "r", encoding="utf-8") as f:
+            return cls.from_records(iter_json_array(f), descriptions)
+
+    def append(self, talk: Dict):
+        position = len(self.ids)
+        if _regular(talk):
+            venue_id, retreat_id = talk["venue_id"], talk["retreat_id"]
+            self.ids.append(talk["id"])
+            self.teacher_ids.append(talk["teacher_id"])
+            self.venue_ids.append(NONE if venue_id is None else venue_id)
+            self.retreat_ids.append(NONE if retreat_id is None else retreat_id)
+            self.language_ids.append(talk["language_id"])
+            self.durations.append(talk["duration_in_minutes"])
+            self.rec_dates.append(sys.intern(talk["rec_date"]))
+            self.recording_types.append(sys.intern(talk["recording_type"]))
+            self.titles.append(talk["title"])
+            self.audio_urls.append(talk["audio_url"])
+            description = talk["description"]
+        else:
+            # Columns get what they can use for aggregation; the record
+            # itself is served from _irregular
+            self._irregular[position] = talk
+            get = talk.get
+            title, rec_date = get("title"), get("rec_date")
+            self.ids.append(_int_or_zero(get("id")))
+            self.teacher_ids.append(_int_or_zero(get("teacher_id")))
+            self.venue_ids.append(NONE)
+            self.retreat_ids.append(NONE)
+            self.language_ids.append(0)
+            self.durations.append(0.0)
+            self.rec_dates.append(sys.intern(rec_date) if isinstance(rec_date, str) else "")
+            self.recording_types.append("")
+            self.titles.append(title if isinstance(title, str) else "")
+            self.audio_urls.append("")
+            description = ""
+        if self.has_descriptions:
+            pending = self._pending
+            self._desc_blocks.append(len(self._blocks))
+            self._desc_offsets.append(len(pending))
+            pending.append(description)
+            if len(pending) == BLOCK_SIZE:
+                self._flush()
+        if self._positions is not None:
+            self._positions[self.ids[position]] = position
+
+    def _flush(self):
+        """Pack the pending descriptions into a block."""
+        if self._pending:
+            data = json.dumps(self._pending, ensure_ascii=False).encode("utf-8")
+            self._blocks.append(zlib.compress(data, 1))  # nearly the ratio of level 6 in a third of the time
+            self._pending = []
+
+    def _copy(self, source: "TalkColumns", position: int):
+        """Append row `position` of `source`, whose blocks must be in self._blocks."""
+        if position in source._irregular:
+            self._irregular[len(self.ids)] = source._irregular[position]
+        self.ids.append(source.ids[position])
+        self.teacher_ids.append(source.teacher_ids[position])
+        self.venue_ids.append(source.venue_ids[position])
+        self.retreat_ids.append(source.retreat_ids[position])
+        self.language_ids.append(source.language_ids[position])
+        self.durations.append(source.durations[position])
+        self.rec_dates.append(source.rec_dates[position])
+        self.recording_types.append(source.recording_types[position])
+        self.titles.append(source.titles[position])
+        self.audio_urls.append(source.audio_urls[position])
+        if self.has_descriptions:
+            self._desc_blocks.append(source._desc_blocks[position])
+            self._desc_offsets.append(source._desc_offsets[position])
+
+    # --- reading ---
+
+    def write_json(self, f: TextIO):
+        """Write the talks as json.dump(list(self), f, indent=2, ensure_ascii=False) would."""
+        if not self.ids:
+            f.write("[]")
+            return
+        f.write("[\n  ")
+        for position in range(len(self.ids)):
+            if position:
+                f.write(",\n  ")
+            if position in self._irregular:
+                f.write(json.dumps(self._irregular[position], indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                continue
+            venue_id, retreat_id = self.venue_ids[position], self.retreat_ids[position]
+            f.write(RECORD_JSON % (
+                self.ids[position],
+                encode_basestring(self.titles[position]),
+                self.teacher_ids[position],
+                encode_basestring(self.description(position)),
+                encode_basestring(self.rec_dates[position]),
+                self.durations[position],
+                "null" if venue_id == NONE else venue_id,
+                "null" if retreat_id == NONE else retreat_id,
+                self.language_ids[position],
+                encode_basestring(self.recording_types[position]),
+                encode_basestring(self.audio_urls[position]),
+            ))
+        f.write("\n]")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def description(self, position: int) -> str:
+        if not self.has_descriptions:
+            raise ValueError("talks were loaded without descriptions")
+        if position in self._irregular:
+            return self._irregular[position].get("description")
+        block, offset = self._desc_blocks[position], self._desc_offsets[position]
+        if block == len(self._blocks):
+            return self._pending[offset]
+        if self._cached_block[0] != block:
+            self._cached_block = (block, json.loads(zlib.decompress(self._blocks[block])))
+        return self._cached_block[1][offset]
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """The talk at `position` as a dict, as it was appended."""
+        if position in self._irregular:
+            return dict(self._irregular[position])
+        venue_id, retreat_id = self.venue_ids[position], self.retreat_ids[position]
+        return {
+            "id": self.ids[position],
+            "title": self.titles[position],
+            "teacher_id": self.teacher_ids[position],
+            "description": self.description(position),
+            "rec_date": self.rec_dates[position],
+            "duration_in_minutes": self.durations[position],
+            "venue_id": None if venue_id == NONE else venue_id,
+            "retreat_id": None if retreat_id == NONE else retreat_id,
+            "language_id": self.language_ids[position],
+            "recording_type": self.recording_types[position],
+            "audio_url": self.audio_urls[position],
+        }
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("talk position out of range")
+        return self.record(position)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self.record(position)
+
+    def position(self, talk_id: int) -> Optional[int]:
+        """Position of a talk ID (the lookup table is built on first use)."""
+        if self._positions is None:
+            self._positions = {talk_id: i for i, talk_id in enumerate(self.ids)}
+        return self._positions.get(talk_id)
+
+    def get(self, talk_id: int) -> Optional[Dict[str, Any]]:
+        position = self.position(talk_id)
+        return None if position is None else self.record(position)
+
+    # --- merging ---
+
+    def merge(self, records: Iterable[Dict]) -> "TalkColumns":
+        """
+        A new TalkColumns with journal-style records applied (later records
+        win, {"id": N, "_deleted": true} removes N), sorted by ID descending.
+        Same result as talks_journal.apply_journal() on the dicts. Unchanged
+        talks are copied column by column; their descriptions stay packed.
+        """
+        by_id: Dict[int, Any] = {talk_id: position for position, talk_id in enumerate(self.ids)}
+        for record in records:
+            if record.get("_deleted"):
+                by_id.pop(record["id"], None)
+            else:
+                by_id[record["id"]] = record
+        self._flush()
+        merged = TalkColumns(self.has_descriptions)
+        merged._blocks = list(self._blocks)
+        for talk_id in sorted(by_id, reverse=True):
+            source = by_id[talk_id]
+            if isinstance(source, int):
+                merged._copy(self, source)
+            else:
+                merged.append(source)
+        return merged
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Append-only talk journal
+
+Newly fetched talks are appended to a JSONL file next to the talks JSON
+instead of rewriting the whole multi-megabyte artifact at every checkpoint.
+A checkpoint only flushes and fsyncs the journal, so it costs O(new talks).
+
+Once a run finishes, the scraper merges the journal into the sorted JSON
+file (apply_journal, or TalkColumns.merge with the same rules) and removes
+it. If a run dies before that, the next run replays the journal on start
+and picks up where it left off.
+
+Each line is one talk dict. A record {"id": N, "_deleted": true} is a
+tombstone that removes talk N when replayed.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+
+def journal_path_for(filename: str) -> str:
+    """dharmaseed_talks.json -> dharmaseed_talks.journal.jsonl"""
+    return os.path.splitext(filename)[0] + ".journal.jsonl"
+
+
+class TalkJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self.pending = 0  # records appended since the last checkpoint
+
+    def replay(self) -> List[Dict]:
+        """
+        Read all complete records from the journal.
+        A torn last line (crash mid-write) is ignored and cut off the file,
+        so the next append() starts on a fresh line.
+        """
+        if not os.path.exists(self.path):
+            return []
+        self._truncate_torn_tail()
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"  Warning: Ignoring torn journal record at line {line_no}")
+        return records
+
+    def _truncate_torn_tail(self):
+        """Truncate the file after its last newline if it ends mid-record."""
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan back in blocks for the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 64 * 1024)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            print(f"  Warning: Truncating torn journal record ({size - end} bytes)")
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, record: Dict):
+        """Append one record. Durable only after the next checkpoint()."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.pending += 1
+
+    def checkpoint(self):
+        """Flush and fsync appended records to disk."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal after its records were compacted into the JSON file."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def apply_journal(talks: List[Dict], records: List[Dict]) -> List[Dict]:
+    """
+    Merge journal records into a talk list (later records win, tombstones
+    delete) and return it sorted by ID descending (newest first).
+    """
+    by_id: Dict[int, Dict] = {t["id"]: t for t in talks}
+    for record in records:
+        if record.get("_deleted"):
+            by_id.pop(record["id"], None)
+        else:
+            by_id[record["id"]] = record
+    merged = list(by_id.values())
+    merged.sort(key=lambda t: t["id"], reverse=True)
+    return merged
+
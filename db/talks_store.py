@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+SQLite store for talks and teachers
+
+An optional, indexed copy of the data the scrapers produce. Each row keeps
+the exact record that goes into the JSON artifacts (the `data` column), plus
+the columns we query on:
+  - talks: teacher_id, rec_date, recording_type (indexed), title/description
+    (full-text indexed with FTS5, diacritics folded)
+  - teachers: name, talk_count, last_talk_date
+
+The JSON files stay the published artifacts; `export` regenerates them
+byte-for-byte from the store.
+
+Usage:
+  python talks_store.py import              # build the store from the JSON files
+  python talks_store.py export              # rewrite the JSON files from the store
+  python talks_store.py search "metta"      # full-text search (title/description)
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+from corpus import stamp_source
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(SCRIPT_DIR, "dharmaseed.sqlite3")
+TALKS_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_talks.json")
+TEACHERS_JSON = os.path.join(SCRIPT_DIR, "dharmaseed_teachers.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS talks (
+    id INTEGER PRIMARY KEY,
+    teacher_id INTEGER NOT NULL,
+    rec_date TEXT NOT NULL DEFAULT '',
+    recording_type TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS talks_teacher_id ON talks(teacher_id, rec_date);
+CREATE INDEX IF NOT EXISTS talks_rec_date ON talks(rec_date);
+CREATE INDEX IF NOT EXISTS talks_recording_type ON talks(recording_type, rec_date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS talks_fts USING fts5(
+    title, description,
+    content='talks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS talks_ai AFTER INSERT ON talks BEGIN
+    INSERT INTO talks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS talks_ad AFTER DELETE ON talks BEGIN
+    INSERT INTO talks_fts(talks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS talks_au AFTER UPDATE ON talks BEGIN
+    INSERT INTO talks_fts(talks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO talks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS teachers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    talk_count INTEGER NOT NULL DEFAULT 0,
+    last_talk_date TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS teachers_name ON teachers(name COLLATE NOCASE, id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class TalkStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- talks ---
+
+    def upsert_talks(self, talks: Iterable[Dict[str, Any]]):
+        """Insert or replace talk records."""
+        rows = (
+            (t["id"], t.get("teacher_id") or 0, t.get("rec_date") or "", t.get("recording_type") or "",
+             t.get("title") or "", t.get("description") or "", json.dumps(t, ensure_ascii=False))
+            for t in talks
+        )
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO talks (id, teacher_id, rec_date, recording_type, title, description, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET teacher_id=excluded.teacher_id, rec_date=excluded.rec_date, "
+                "recording_type=excluded.recording_type, title=excluded.title, "
+                "description=excluded.description, data=excluded.data "
+                "WHERE data != excluded.data",
+                rows,
+            )
+
+    def delete_talks(self, talk_ids: Iterable[int]):
+        with self.conn:
+            self.conn.executemany("DELETE FROM talks WHERE id = ?", ((i,) for i in talk_ids))
+
+    def sync_talks(self, talks: List[Dict[str, Any]]):
+        """Make the talks table match `talks` exactly (upsert changed, delete missing)."""
+        keep = {t["id"] for t in talks}
+        stored = {row[0] for row in self.conn.execute("SELECT id FROM talks")}
+        self.delete_talks(stored - keep)
+        self.upsert_talks(talks)
+
+    def get_talk(self, talk_id: int) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT data FROM talks WHERE id = ?", (talk_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def talks_by_teacher(self, teacher_id: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT data FROM talks WHERE teacher_id = ? ORDER BY rec_date DESC, id DESC LIMIT ? OFFSET ?",
+            (teacher_id, limit, offset),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def search_talks(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Full-text search over title/description; every term must match (as a prefix)."""
+        terms = [t.replace('"', '""') for t in query.split()]
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"*' for t in terms)
+        rows = self.conn.execute(
+            "SELECT talks.data FROM talks_fts JOIN talks ON talks.id = talks_fts.rowid "
+            "WHERE talks_fts MATCH ? ORDER BY talks.rec_date DESC, talks.id DESC LIMIT ?",
+            (match, limit),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def talk_stats(self) -> Dict[int, dict]:
+        """
+        Talk count and most recent talk date per teacher, as an indexed aggregate.
+        Same shape as load_talk_stats_from_talks_json():
+        {teacher_id: {"count": N, "last_talk_date": "YYYY-MM-DD"}}
+        """
+        rows = self.conn.execute(
+            "SELECT teacher_id, COUNT(*), MAX(rec_date) FROM talks "
+            "WHERE teacher_id != 0 GROUP BY teacher_id"
+        )
+        return {
+            teacher_id: {"count": count, "last_talk_date": (last or "").split(" ")[0]}
+            for teacher_id, count, last in rows
+        }
+
+    # --- teachers ---
+
+    def sync_teachers(self, teachers: List[Dict[str, Any]], source: str, api: str):
+        """Replace the teachers table with `teachers` (dicts in artifact order)."""
+        rows = [
+            (t["id"], t.get("name") or "", t.get("talk_count") or 0, t.get("last_talk_date") or "",
+             json.dumps(t, ensure_ascii=False))
+            for t in teachers
+        ]
+        with self.conn:
+            self.conn.execute("DELETE FROM teachers")
+            self.conn.executemany(
+                "INSERT INTO teachers (id, name, talk_count, last_talk_date, data) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("teachers_source", source), ("teachers_api", api)],
+            )
+
+    def _meta(self, key: str, default: str = "") -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # --- import / export ---
+
+    def import_json(self, talks_file: str = TALKS_JSON, teachers_file: str = TEACHERS_JSON):
+        """Load the JSON artifacts into the store."""
+        if os.path.exists(talks_file):
+            with open(talks_file, "r", encoding="utf-8") as f:
+                talks = json.load(f)
+            self.sync_talks(talks)
+            print(f"Imported {len(talks)} talks from {talks_file}")
+        if os.path.exists(teachers_file):
+            with open(teachers_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.sync_teachers(data.get("teachers", []), data.get("source", ""), data.get("api", ""))
+            print(f"Imported {len(data.get('teachers', []))} teachers from {teachers_file}")
+
+    def export_talks_json(self, filename: str = TALKS_JSON):
+        """Write dharmaseed_talks.json exactly as save_talks_to_json() does (ID descending)."""
+        talks = [json.loads(row[0]) for row in self.conn.execute("SELECT data FROM talks ORDER BY id DESC")]
+        _write_json(talks, filename)
+        print(f"Exported {len(talks)} talks -> {filename}")
+
+    def export_teachers_json(self, filename: str = TEACHERS_JSON):
+        """Write dharmaseed_teachers.json exactly as save_to_json() does (name, then ID)."""
+        teachers = [json.loads(row[0]) for row in self.conn.execute("SELECT data FROM teachers")]
+        teachers.sort(key=lambda t: (t.get("name", "").lower(), t["id"]))
+        db = {
+            "source": self._meta("teachers_source"),
+            "api": self._meta("teachers_api"),
+            "teachers": teachers,
+        }
+        _write_json(db, filename)
+        print(f"Exported {len(teachers)} teachers -> {filename}")
+
+
+def _write_json(data: Any, filename: str):
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_filename, filename)
+    stamp_source(filename)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite store for Dharmaseed talks and teachers")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite database (default: {DEFAULT_DB})")
+    parser.add_argument("--talks", default=TALKS_JSON, help="Talks JSON artifact")
+    parser.add_argument("--teachers", default=TEACHERS_JSON, help="Teachers JSON artifact")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Build the store from the JSON artifacts")
+    sub.add_parser("export", help="Regenerate the JSON artifacts from the store")
+    search = sub.add_parser("search", help="Full-text search over talk titles and descriptions")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with TalkStore(args.db) as store:
+        if args.command == "import":
+            store.import_json(args.talks, args.teachers)
+        elif args.command == "export":
+            store.export_talks_json(args.talks)
+            store.export_teachers_json(args.teachers)
+        elif args.command == "search":
+            for talk in store.search_talks(args.query, limit=args.limit):
+                print(f"{talk['id']:>7}  {talk.get('rec_date', '')[:10]}  {talk.get('title', '')}")
+
+
+if __name__ == "__main__":
+    main()
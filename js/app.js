@@ -54,7 +54,7 @@ function isCacheStale(timestamp, maxAge = CACHE_MAX_AGE) {
 // Background refresh: update cache without disrupting playback
 async function refreshTeachersInBackground() {
     try {
-        const response = await fetch('db/dharmaseed_teachers.json', { cache: 'no-store' });
+        const response = await fetch('db/dharmaseed_teachers.json', { cache: 'no-cache' });
         const data = await response.json();
         setTeachersCache(data.teachers);
         console.log('Teachers cache refreshed in background');
@@ -2549,8 +2549,8 @@ async function init() {
     loadPaliHints();
     
     try {
-        // Always fetch fresh data (bypass browser cache)
-        const response = await fetch('db/dharmaseed_teachers.json', { cache: 'no-store' });
+        // Always revalidate (a 304 reuses the browser's copy)
+        const response = await fetch('db/dharmaseed_teachers.json', { cache: 'no-cache' });
         const data = await response.json();
         TEACHERS_DB = data.teachers;
         setTeachersCache(data.teachers);
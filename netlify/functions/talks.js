@@ -1,9 +1,21 @@
 const fs = require('fs');
 const path = require('path');
 
-// Load talks data once at cold start
+// Deployed, the function only has the binary corpus and the indexes
+// (netlify.toml included_files), and the workflows verify the corpus before
+// committing it. The JSON files and shards are fallbacks for local runs
+// where the corpus has not been built.
 let talksData = null;
 let teachersMap = null;
+let talksById = null;
+let searchIndex = null;
+let shardIndex = null;
+let categoryIndex = null;
+let binaryCorpus = null;
+const shardCache = new Map();
+let sourceHashes = null;
+
+const foldText = text => text.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
 
 function loadTalks() {
     if (!talksData) {
@@ -14,6 +26,460 @@ function loadTalks() {
     return talksData;
 }
 
+// sha256 of a JSON file in db/, as stamped at build time in
+// dharmaseed_sources.json (see db/corpus.py). Derived artifacts record the
+// hash of the files they were built from; a mismatch means stale.
+function sourceHash(name) {
+    if (!sourceHashes) {
+        try {
+            const filePath = path.join(__dirname, '../../db/dharmaseed_sources.json');
+            sourceHashes = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+        } catch (error) {
+            sourceHashes = {};
+        }
+    }
+    return sourceHashes[name] || null;
+}
+
+function loadTalksById() {
+    if (!talksById) {
+        talksById = new Map();
+        loadTalks().forEach(t => talksById.set(t.id, t));
+    }
+    return talksById;
+}
+
+const CORPUS_MAGIC = 'DSCORPUS';
+const CORPUS_I32_NULL = -0x80000000;
+const CORPUS_REF_NULL = 0xFFFFFFFF;
+const littleEndian = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+// Index of `key` in an ascending typed array (binary search), or -1
+function findKey(keys, key) {
+    let lo = 0;
+    let hi = keys.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (keys[mid] < key) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo < keys.length && keys[lo] === key ? lo : -1;
+}
+
+// Value at a row position of a binary corpus column (see db/binary_corpus.py)
+function decodeColumn(type, values, string) {
+    if (type === 'i32') {
+        return p => (values[p] === CORPUS_I32_NULL ? null : values[p]);
+    } else if (type === 'f64') {
+        return p => (Number.isNaN(values[p]) ? null : values[p]);
+    } else if (type === 'str') {
+        return p => (values[p] === CORPUS_REF_NULL ? null : string(values[p]));
+    }
+    return p => JSON.parse(string(values[p]));
+}
+
+// One table of the binary corpus: typed-array views on its columns, and
+// records decoded on demand
+function openCorpusTable(buffer, base, layout, string) {
+    const view = (Type, offset) => new Type(buffer.buffer, buffer.byteOffset + base + offset, layout.count);
+    const types = { i32: Int32Array, f64: Float64Array, str: Uint32Array, json: Uint32Array };
+    const columns = {};
+    const decoders = {};
+    layout.columns.forEach(c => {
+        const values = columns[c.name] = view(types[c.type], c.offset);
+        decoders[c.name] = decodeColumn(c.type, values, string);
+    });
+    const raw = layout.raw === null ? null : view(Uint32Array, layout.raw);
+    const index = layout.index && {
+        ids: new Int32Array(buffer.buffer, buffer.byteOffset + base + layout.index.ids, layout.index.count),
+        positions: new Uint32Array(buffer.buffer, buffer.byteOffset + base + layout.index.positions, layout.index.count)
+    };
+    return {
+        count: layout.count,
+        types: Object.fromEntries(layout.columns.map(c => [c.name, c.type])),
+        columns,
+        // Records the columns cannot reproduce are stored whole, as JSON
+        isRaw: position => raw !== null && raw[position] !== CORPUS_REF_NULL,
+        record(position) {
+            if (this.isRaw(position)) {
+                return JSON.parse(string(raw[position]));
+            }
+            const record = {};
+            layout.columns.forEach(c => {
+                record[c.name] = decoders[c.name](position);
+            });
+            return record;
+        },
+        // One field of a record, without decoding the others
+        value(position, name) {
+            return this.isRaw(position) ? this.record(position)[name] : decoders[name](position);
+        },
+        // Row of the record with this id, or -1
+        position(id) {
+            const i = index ? findKey(index.ids, id) : -1;
+            return i >= 0 ? index.positions[i] : -1;
+        },
+        get(id) {
+            const position = this.position(id);
+            return position >= 0 ? this.record(position) : null;
+        }
+    };
+}
+
+// Date order of the talks table and its rank lists per teacher and recording
+// type; a rank is an index in `date` (rows, most recent first)
+function openCorpusOrder(buffer, base, layout, count) {
+    const view = (Type, offset, length) => new Type(buffer.buffer, buffer.byteOffset + base + offset, length);
+    const groups = (groupLayout, KeyType) => {
+        const starts = view(Uint32Array, groupLayout.starts, groupLayout.count + 1);
+        return {
+            keys: view(KeyType, groupLayout.keys, groupLayout.count),
+            starts,
+            ranks: view(Uint32Array, groupLayout.ranks, starts[groupLayout.count])
+        };
+    };
+    return {
+        date: view(Uint32Array, layout.date, count),
+        ranks: view(Uint32Array, layout.ranks, count),
+        teachers: groups(layout.teachers, Int32Array),
+        recordingTypes: groups(layout.recording_types, Uint32Array)
+    };
+}
+
+// Ranks listed for one key of a rank-list group, ascending (empty if none)
+function groupRanks(groups, key) {
+    const i = findKey(groups.keys, key);
+    return i >= 0 ? groups.ranks.subarray(groups.starts[i], groups.starts[i + 1]) : new Uint32Array(0);
+}
+
+// The ranks in `lists` (in any order), ascending: a linear sweep instead of a sort
+function sweepRanks(count, lists) {
+    const marks = new Uint8Array(count);
+    lists.forEach(list => list.forEach(rank => {
+        marks[rank] = 1;
+    }));
+    const ranks = [];
+    for (let rank = 0; rank < count; rank++) {
+        if (marks[rank]) {
+            ranks.push(rank);
+        }
+    }
+    return ranks;
+}
+
+// Binary corpus built by db/binary_corpus.py (null if missing or built from
+// other JSON files). Only the header is parsed; a query decodes the records it returns.
+function loadBinaryCorpus() {
+    if (binaryCorpus === null) {
+        binaryCorpus = false;
+        try {
+            const dbDir = path.join(__dirname, '../../db');
+            let buffer = fs.readFileSync(path.join(dbDir, 'dharmaseed_corpus.bin'));
+            if (buffer.byteOffset % 8 !== 0) {
+                // Typed-array views need aligned offsets
+                buffer = Buffer.from(Uint8Array.from(buffer).buffer);
+            }
+            const headerLength = buffer.readUInt32LE(8);
+            const header = buffer.toString('latin1', 0, 8) === CORPUS_MAGIC
+                ? JSON.parse(buffer.toString('utf8', 16, 16 + headerLength))
+                : {};
+            if (header.version !== 2 || !littleEndian) {
+                console.warn('Binary corpus unsupported, using the JSON files');
+            } else if (header.talks_source_sha256 !== sourceHash('dharmaseed_talks.json') ||
+                       header.teachers_source_sha256 !== sourceHash('dharmaseed_teachers.json')) {
+                console.warn('Binary corpus is stale, using the JSON files');
+            } else {
+                const base = 16 + headerLength;
+                const strings = header.strings;
+                const stringOffsets = new Uint32Array(buffer.buffer, buffer.byteOffset + base + strings.offsets,
+                                                      strings.count + 1);
+                const stringData = base + strings.data;
+                const string = ref => buffer.toString('utf8', stringData + stringOffsets[ref],
+                                                      stringData + stringOffsets[ref + 1]);
+                const talks = openCorpusTable(buffer, base, header.tables.talks, string);
+                const teachers = openCorpusTable(buffer, base, header.tables.teachers, string);
+                const expected = [
+                    [talks, { id: 'i32', teacher_id: 'i32', title: 'str', description: 'str', rec_date: 'str', recording_type: 'str' }],
+                    [teachers, { id: 'i32', name: 'str' }]
+                ];
+                if (expected.every(([table, types]) => Object.keys(types).every(name => table.types[name] === types[name]))) {
+                    const order = openCorpusOrder(buffer, base, header.tables.talks.order, talks.count);
+                    binaryCorpus = { talks, teachers, order, string };
+                } else {
+                    console.warn('Binary corpus has unexpected columns, using the JSON files');
+                }
+            }
+        } catch (error) {
+            console.warn('Binary corpus unavailable, using the JSON files');
+        }
+    }
+    return binaryCorpus || null;
+}
+
+// Inverted index built by db/build_search_index.py (null if missing or stale)
+function loadSearchIndex() {
+    if (searchIndex === null) {
+        searchIndex = false;
+        try {
+            const filePath = path.join(__dirname, '../../db/dharmaseed_search_index.json');
+            const parsed = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+            if (parsed.version === 1 && parsed.talks_source_sha256 === sourceHash('dharmaseed_talks.json') &&
+                    parsed.teachers_source_sha256 === sourceHash('dharmaseed_teachers.json')) {
+                searchIndex = {
+                    order: parsed.order,
+                    terms: parsed.terms,
+                    vocab: Object.keys(parsed.terms),
+                    termCache: new Map()
+                };
+            } else {
+                console.warn('Search index is stale, falling back to full scan');
+            }
+        } catch (error) {
+            console.warn('Search index unavailable, falling back to full scan');
+        }
+    }
+    return searchIndex || null;
+}
+
+// Ranks (positions in index.order) of talks matching one folded search term.
+// A term matches a talk if it is a substring of any of the talk's tokens.
+function searchTermRanks(index, term) {
+    if (index.termCache.has(term)) {
+        return index.termCache.get(term);
+    }
+    const hits = new Uint8Array(index.order.length);
+    for (const token of index.vocab) {
+        if (token.includes(term)) {
+            let rank = 0;
+            for (const delta of index.terms[token]) {
+                rank += delta;
+                hits[rank] = 1;
+            }
+        }
+    }
+    if (index.termCache.size >= 500) {
+        index.termCache.clear();
+    }
+    index.termCache.set(term, hits);
+    return hits;
+}
+
+// Talks matching all search terms, most recent first
+function searchWithIndex(index, searchTerms) {
+    const byId = loadTalksById();
+    const matches = searchTerms.map(term => searchTermRanks(index, foldText(term)));
+    const results = [];
+    for (let rank = 0; rank < index.order.length; rank++) {
+        const talk = matches.every(hits => hits[rank]) && byId.get(index.order[rank]);
+        if (talk) {
+            results.push(talk);
+        }
+    }
+    return results;
+}
+
+// Shards built by db/build_shards.py (null if missing or built from another talks file)
+function loadShardIndex() {
+    if (shardIndex === null) {
+        shardIndex = false;
+        try {
+            const dbDir = path.join(__dirname, '../../db');
+            const parsed = JSON.parse(fs.readFileSync(path.join(dbDir, 'shards/index.json'), 'utf8'));
+            if (parsed.version === 2 && parsed.source_sha256 === sourceHash('dharmaseed_talks.json')) {
+                shardIndex = parsed;
+            } else {
+                console.warn('Shards are stale, using the full talks file');
+            }
+        } catch (error) {
+            console.warn('Shards unavailable, using the full talks file');
+        }
+    }
+    return shardIndex || null;
+}
+
+function loadShard(relativePath) {
+    if (!shardCache.has(relativePath)) {
+        const filePath = path.join(__dirname, '../../db/shards', relativePath);
+        shardCache.set(relativePath, fs.existsSync(filePath) ? JSON.parse(fs.readFileSync(filePath, 'utf8')) : []);
+    }
+    return shardCache.get(relativePath);
+}
+
+const recentPagePath = page => `recent/${String(page).padStart(4, '0')}.json`;
+
+function findTalkInShards(shards, talkId) {
+    const page = shards.id_pages[talkId];
+    if (page === undefined) {
+        return null;
+    }
+    return loadShard(recentPagePath(page)).find(t => t.id === talkId) || null;
+}
+
+// Most recent talks [offset, offset + limit) from the fixed-size recent pages.
+// Pages are numbered from the oldest talk, so rank r is on page (count - 1 - r) / page_size.
+function recentTalksFromShards(shards, offset, limit) {
+    const count = shards.talk_count;
+    const end = Math.min(offset + limit, count);
+    if (offset >= end) {
+        return [];
+    }
+    const pageOf = rank => Math.floor((count - 1 - rank) / shards.page_size);
+    const first = pageOf(offset);
+    let talks = [];
+    for (let page = first; page >= pageOf(end - 1); page--) {
+        talks = talks.concat(loadShard(recentPagePath(page)));
+    }
+    // Rank of the most recent talk on the first page
+    const start = offset - (count - Math.min((first + 1) * shards.page_size, count));
+    return talks.slice(start, start + (end - offset));
+}
+
+// Category bitmasks built by db/build_categories.py (null if missing or built from another talks file)
+function loadCategoryIndex() {
+    if (categoryIndex === null) {
+        categoryIndex = false;
+        try {
+            const dbDir = path.join(__dirname, '../../db');
+            const parsed = JSON.parse(fs.readFileSync(path.join(dbDir, 'dharmaseed_categories.json'), 'utf8'));
+            if (parsed.version === 1 && parsed.source_sha256 === sourceHash('dharmaseed_talks.json')) {
+                categoryIndex = {
+                    bits: new Map(parsed.words.map((word, bit) => [word, bit])),
+                    lanes: parsed.lanes,
+                    masks: Uint32Array.from(parsed.masks),
+                    postings: parsed.postings,
+                    positionCache: new Map(),
+                    positionById: null
+                };
+            } else {
+                console.warn('Category index is stale, falling back to text matching');
+            }
+        } catch (error) {
+            console.warn('Category index unavailable, falling back to text matching');
+        }
+    }
+    return categoryIndex || null;
+}
+
+// Positions (in the talks file) of the talks matching one category word, ascending
+function categoryPositions(index, word) {
+    if (!index.positionCache.has(word)) {
+        const positions = [];
+        let position = 0;
+        for (const delta of index.postings[word]) {
+            position += delta;
+            positions.push(position);
+        }
+        index.positionCache.set(word, positions);
+    }
+    return index.positionCache.get(word);
+}
+
+// Test of a talk position (in the talks file) against every (folded) category word
+function categoryMatcher(index, words) {
+    const required = new Uint32Array(index.lanes);
+    words.forEach(word => {
+        const bit = index.bits.get(word);
+        required[bit >>> 5] |= 1 << (bit & 31);
+    });
+    return position => {
+        for (let lane = 0; lane < index.lanes; lane++) {
+            const need = required[lane];
+            if (((index.masks[position * index.lanes + lane] & need) >>> 0) !== need) {
+                return false;
+            }
+        }
+        return true;
+    };
+}
+
+// Positions of all talks matching every category word, ascending: walk the
+// shortest posting list and check the other words in the masks
+function categoryIndexPositions(index, words) {
+    const shortest = words
+        .map(word => categoryPositions(index, word))
+        .reduce((a, b) => (b.length < a.length ? b : a));
+    return shortest.filter(categoryMatcher(index, words));
+}
+
+// Talks from `filtered` matching every (folded) category word; `talks` is the full talks file
+function filterByCategoryIndex(index, talks, filtered, words) {
+    if (filtered === talks) {
+        return categoryIndexPositions(index, words).map(position => talks[position]);
+    }
+    
+    if (!index.positionById) {
+        index.positionById = new Map();
+        talks.forEach((t, position) => index.positionById.set(t, position));
+    }
+    const hasAll = categoryMatcher(index, words);
+    return filtered.filter(t => hasAll(index.positionById.get(t)));
+}
+
+// Recording type filter: talk, meditation (incl. guided) or other
+function recordingTypeMatches(type, recordingType) {
+    type = (type || '').toLowerCase();
+    if (recordingType === 'talk') {
+        return type === 'talk';
+    } else if (recordingType === 'meditation') {
+        return type === 'meditation' || type === 'guided meditation';
+    } else if (recordingType === 'other') {
+        return type !== 'talk' && type !== 'meditation' && type !== 'guided meditation';
+    }
+    return true;
+}
+
+// Category filter without the index: all terms must match in title OR description (AND logic)
+function categoryTermsMatch(title, desc, categoryTerms) {
+    // Helper function to check if term matches, with special exclusion rules
+    // e.g., "dana" should not match inside "vedana"
+    const matchesTerm = (text, textNorm, term, termNorm) => {
+        // Special case: "dana" should not match "vedana"
+        if (termNorm === 'dana') {
+            // Use regex with negative lookbehind to exclude "vedana"
+            const danaRegex = /(?<!ve)dana/gi;
+            return danaRegex.test(text) || danaRegex.test(textNorm);
+        }
+        // Default: simple substring match
+        return text.includes(term) || textNorm.includes(termNorm);
+    };
+    
+    title = (title || '').toLowerCase();
+    const titleNorm = title.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    desc = (desc || '').toLowerCase();
+    const descNorm = desc.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    
+    return categoryTerms.every(term => {
+        const termNorm = term.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+        return matchesTerm(title, titleNorm, term, termNorm) ||
+               matchesTerm(desc, descNorm, term, termNorm);
+    });
+}
+
+// Search without the index: all terms must match in title, description, teacher name OR date (AND logic)
+function searchTermsMatch(title, desc, teacherName, date, searchTerms) {
+    title = (title || '').toLowerCase();
+    const titleNorm = title.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    desc = (desc || '').toLowerCase();
+    const descNorm = desc.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    teacherName = (teacherName || '').toLowerCase();
+    const teacherNorm = teacherName.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    date = (date || '').toLowerCase();
+    
+    return searchTerms.every(term => {
+        const termNorm = term.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+        return title.includes(term) || 
+               titleNorm.includes(termNorm) ||
+               desc.includes(term) ||
+               descNorm.includes(termNorm) ||
+               teacherName.includes(term) ||
+               teacherNorm.includes(termNorm) ||
+               date.includes(term);
+    });
+}
+
 function loadTeachers() {
     if (!teachersMap) {
         const filePath = path.join(__dirname, '../../db/dharmaseed_teachers.json');
@@ -28,6 +494,110 @@ function loadTeachers() {
     return teachersMap;
 }
 
+// Talks matching the filters, from the binary corpus. Candidates are kept
+// as ascending date ranks, so every filter preserves the order clients get
+// and no request sorts. The same filters, in the same order, as the JSON
+// path in the handler.
+function queryCorpus(corpus, { teacherId, recordingType, searchTerms, categoryTerms }, offset, limit) {
+    const { talks, order } = corpus;
+    let ranks = null; // null: every talk
+    const filter = test => {
+        if (ranks) {
+            return ranks.filter(rank => test(order.date[rank]));
+        }
+        const matching = [];
+        for (let rank = 0; rank < talks.count; rank++) {
+            if (test(order.date[rank])) {
+                matching.push(rank);
+            }
+        }
+        return matching;
+    };
+    const ranksOf = positions => sweepRanks(talks.count, [positions.map(position => order.ranks[position])]);
+    
+    const index = searchTerms.length > 0 ? loadSearchIndex() : null;
+    if (index) {
+        const matches = searchTerms.map(term => searchTermRanks(index, foldText(term)));
+        const positions = [];
+        for (let rank = 0; rank < index.order.length; rank++) {
+            const position = matches.every(hits => hits[rank]) ? talks.position(index.order[rank]) : -1;
+            if (position >= 0) {
+                positions.push(position);
+            }
+        }
+        ranks = ranksOf(positions);
+    }
+    
+    if (teacherId) {
+        ranks = ranks
+            ? filter(position => talks.value(position, 'teacher_id') === teacherId)
+            : groupRanks(order.teachers, teacherId);
+    }
+    
+    if (recordingType) {
+        const types = order.recordingTypes;
+        const matchesRow = position => recordingTypeMatches(talks.value(position, 'recording_type'), recordingType);
+        // Few distinct recording types: test each string once
+        const typeMatches = new Map();
+        const matchesRef = ref => {
+            if (!typeMatches.has(ref)) {
+                typeMatches.set(ref, recordingTypeMatches(corpus.string(ref), recordingType));
+            }
+            return typeMatches.get(ref);
+        };
+        if (ranks) {
+            const refs = talks.columns.recording_type;
+            ranks = filter(position => (talks.isRaw(position) || refs[position] === CORPUS_REF_NULL
+                ? matchesRow(position)
+                : matchesRef(refs[position])));
+        } else {
+            const lists = [];
+            for (let i = 0; i < types.keys.length; i++) {
+                const list = types.ranks.subarray(types.starts[i], types.starts[i + 1]);
+                if (types.keys[i] === CORPUS_REF_NULL) {
+                    // No (or no valid) recording_type string: test each talk
+                    lists.push(list.filter(rank => matchesRow(order.date[rank])));
+                } else if (matchesRef(types.keys[i])) {
+                    lists.push(list);
+                }
+            }
+            ranks = lists.length === 1 ? lists[0] : sweepRanks(talks.count, lists);
+        }
+    }
+    
+    if (categoryTerms.length > 0) {
+        const categoryWords = categoryTerms.map(term => foldText(term));
+        const catIndex = loadCategoryIndex();
+        if (catIndex && categoryWords.every(word => catIndex.bits.has(word))) {
+            ranks = ranks
+                ? filter(categoryMatcher(catIndex, categoryWords))
+                : ranksOf(categoryIndexPositions(catIndex, categoryWords));
+        } else {
+            ranks = filter(position =>
+                categoryTermsMatch(talks.value(position, 'title'), talks.value(position, 'description'), categoryTerms));
+        }
+    }
+    
+    if (searchTerms.length > 0 && !index) {
+        const teachers = corpus.teachers;
+        ranks = filter(position => {
+            const teacher = teachers.position(talks.value(position, 'teacher_id'));
+            const teacherName = teacher >= 0 ? teachers.value(teacher, 'name') : '';
+            return searchTermsMatch(talks.value(position, 'title'), talks.value(position, 'description'),
+                                    teacherName, talks.value(position, 'rec_date'), searchTerms);
+        });
+    }
+    
+    // Paging is a slice of the ranks; only the returned talks are decoded
+    const positions = ranks
+        ? Array.from(ranks.slice(offset, offset + limit), rank => order.date[rank])
+        : Array.from(order.date.slice(offset, offset + limit));
+    return {
+        total: ranks ? ranks.length : talks.count,
+        paginated: positions.map(position => talks.record(position))
+    };
+}
+
 exports.handler = async (event, context) => {
     const headers = {
         'Access-Control-Allow-Origin': '*',
@@ -42,8 +612,6 @@ exports.handler = async (event, context) => {
     }
 
     try {
-        const talks = loadTalks();
-        const teachers = loadTeachers();
         const params = event.queryStringParameters || {};
         
         // Parse parameters
@@ -54,9 +622,19 @@ exports.handler = async (event, context) => {
         const categories = params.categories ? params.categories.toLowerCase() : null; // Pali categories (title/desc only)
         const talkId = params.id ? parseInt(params.id) : null;
         
+        const corpus = loadBinaryCorpus();
+        const shards = corpus ? null : loadShardIndex();
+        
         // If requesting a specific talk by ID
         if (talkId) {
-            const talk = talks.find(t => t.id === talkId);
+            let talk;
+            if (corpus) {
+                talk = corpus.talks.get(talkId);
+            } else if (shards) {
+                talk = findTalkInShards(shards, talkId);
+            } else {
+                talk = loadTalksById().get(talkId);
+            }
             if (talk) {
                 return {
                     statusCode: 200,
@@ -72,92 +650,100 @@ exports.handler = async (event, context) => {
             }
         }
         
+        const searchTerms = search ? search.split(/\s+/).filter(term => term.length > 0) : [];
+        const categoryTerms = categories ? categories.split(/\s+/).filter(term => term.length > 0) : [];
+        const recordingType = params.recording_type ? params.recording_type.toLowerCase() : null;
+        
+        // Listings from the binary corpus when available: pre-sorted, filtered
+        // over its columns, and only the returned page is decoded
+        if (corpus) {
+            const { total, paginated } = queryCorpus(corpus, { teacherId, recordingType, searchTerms, categoryTerms },
+                                                     offset, limit);
+            return {
+                statusCode: 200,
+                headers,
+                body: JSON.stringify({
+                    talks: paginated,
+                    total,
+                    limit,
+                    offset,
+                    hasMore: offset + limit < total
+                })
+            };
+        }
+        
+        // Unfiltered and teacher-only listings are otherwise served from shards (already date sorted)
+        if (shards && !search && !categories && !params.recording_type && offset >= 0 && limit > 0) {
+            let paginated;
+            let total;
+            if (teacherId) {
+                const teacherTalks = loadShard(`teachers/${teacherId}.json`);
+                total = teacherTalks.length;
+                paginated = teacherTalks.slice(offset, offset + limit);
+            } else {
+                total = shards.talk_count;
+                paginated = recentTalksFromShards(shards, offset, limit);
+            }
+            return {
+                statusCode: 200,
+                headers,
+                body: JSON.stringify({
+                    talks: paginated,
+                    total,
+                    limit,
+                    offset,
+                    hasMore: offset + limit < total
+                })
+            };
+        }
+        
+        const talks = loadTalks();
+        const teachers = loadTeachers();
+        
         // Filter talks
         let filtered = talks;
         
+        // Search via the inverted index when available (see the full-scan fallback below)
+        const index = searchTerms.length > 0 ? loadSearchIndex() : null;
+        if (index) {
+            filtered = searchWithIndex(index, searchTerms);
+        }
+        
         if (teacherId) {
             filtered = filtered.filter(t => t.teacher_id === teacherId);
         }
         
         // Filter by recording type (talk, meditation, other)
-        const recordingType = params.recording_type ? params.recording_type.toLowerCase() : null;
         if (recordingType) {
-            filtered = filtered.filter(t => {
-                const type = (t.recording_type || '').toLowerCase();
-                if (recordingType === 'talk') {
-                    return type === 'talk';
-                } else if (recordingType === 'meditation') {
-                    return type === 'meditation' || type === 'guided meditation';
-                } else if (recordingType === 'other') {
-                    return type !== 'talk' && type !== 'meditation' && type !== 'guided meditation';
-                }
-                return true;
-            });
+            filtered = filtered.filter(t => recordingTypeMatches(t.recording_type, recordingType));
         }
         
         // Filter by categories (Pali terms - search in title and description ONLY)
-        if (categories) {
-            const categoryTerms = categories.split(/\s+/).filter(term => term.length > 0);
+        if (categoryTerms.length > 0) {
+            const categoryWords = categoryTerms.map(term => foldText(term));
+            const catIndex = loadCategoryIndex();
             
-            // Helper function to check if term matches, with special exclusion rules
-            // e.g., "dana" should not match inside "vedana"
-            const matchesTerm = (text, textNorm, term, termNorm) => {
-                // Special case: "dana" should not match "vedana"
-                if (termNorm === 'dana') {
-                    // Use regex with negative lookbehind to exclude "vedana"
-                    const danaRegex = /(?<!ve)dana/gi;
-                    return danaRegex.test(text) || danaRegex.test(textNorm);
-                }
-                // Default: simple substring match
-                return text.includes(term) || textNorm.includes(termNorm);
-            };
-            
-            filtered = filtered.filter(t => {
-                const title = (t.title || '').toLowerCase();
-                const titleNorm = title.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                const desc = (t.description || '').toLowerCase();
-                const descNorm = desc.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                
-                // All category terms must match in title OR description (AND logic)
-                return categoryTerms.every(term => {
-                    const termNorm = term.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                    return matchesTerm(title, titleNorm, term, termNorm) ||
-                           matchesTerm(desc, descNorm, term, termNorm);
-                });
-            });
+            if (catIndex && categoryWords.every(word => catIndex.bits.has(word))) {
+                filtered = filterByCategoryIndex(catIndex, talks, filtered, categoryWords);
+            } else {
+                filtered = filtered.filter(t => categoryTermsMatch(t.title, t.description, categoryTerms));
+            }
         }
         
         // Filter by search (searches in title, description, teacher name, AND date)
-        if (search) {
-            const searchTerms = search.split(/\s+/).filter(term => term.length > 0);
-            
-            filtered = filtered.filter(t => {
-                const title = (t.title || '').toLowerCase();
-                const titleNorm = title.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                const desc = (t.description || '').toLowerCase();
-                const descNorm = desc.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                const teacherName = (teachers[t.teacher_id] || '').toLowerCase();
-                const teacherNorm = teacherName.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                const date = (t.rec_date || '').toLowerCase();
-                
-                // All search terms must match (AND logic)
-                return searchTerms.every(term => {
-                    const termNorm = term.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
-                    return title.includes(term) || 
-                           titleNorm.includes(termNorm) ||
-                           desc.includes(term) ||
-                           descNorm.includes(termNorm) ||
-                           teacherName.includes(term) ||
-                           teacherNorm.includes(termNorm) ||
-                           date.includes(term);
-                });
-            });
+        if (searchTerms.length > 0 && !index) {
+            filtered = filtered.filter(t =>
+                searchTermsMatch(t.title, t.description, teachers[t.teacher_id], t.rec_date, searchTerms));
         }
         
         // Get total count before pagination
         const total = filtered.length;
         
-        // Sort by date (most recent first)
+        // Sort by date (most recent first); never in place on the loaded talks,
+        // whose file order the category index positions refer to
+        if (filtered === talks) {
+            filtered = talks.slice();
+        }
         filtered.sort((a, b) => (b.rec_date || '').localeCompare(a.rec_date || ''));
         
         // Apply pagination
@@ -2,77 +2,755 @@
 """
 Local development server with proxy for Dharmaseed
 Serves static files and proxies /feeds/* and /api/* requests to dharmaseed.org
+
+Requests are handled by a bounded pool of worker threads, so a slow feed
+does not block static files, and upstream requests reuse keep-alive
+connections to dharmaseed.org. Proxied bodies are streamed through as they
+arrive, with Range/206, Content-Encoding, ETag and cache headers passed on.
+Small responses are also kept in an in-memory cache (TTL per path prefix,
+LRU-bounded, stale-while-revalidate); the X-Cache response header reports
+HIT, STALE or MISS.
+
+/.netlify/functions/talks is answered natively with the same query contract
+as netlify/functions/talks.js, from indexes built once over db/*.json.
+
+db/*.json files are served with a content-hash ETag (304 on If-None-Match)
+and, when db/precompress.py has written .br/.gz siblings, compressed
+according to Accept-Encoding.
+
+/metrics reports request latency and status codes per route, upstream
+latency of proxied requests, proxy cache hits and in-flight requests, in
+Prometheus text format (JSON with ?format=json).
 """
 
+import hashlib
+import http.client
 import http.server
+import queue
+import re
+import shutil
 import socketserver
-import urllib.request
+import threading
+import time
 import urllib.parse
 import json
 import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+from db.corpus import date_order, fold_text
+from db.metrics import Metrics
+
 PORT = 8080
-DHARMASEED_BASE = "https://www.dharmaseed.org"
+WORKERS = 16
+UPSTREAM_CONNECTIONS = 8
+DHARMASEED_BASE = os.environ.get("DHARMASEED_BASE", "https://www.dharmaseed.org")
+TALKS_API_PATH = "/.netlify/functions/talks"
+METRICS_PATH = "/metrics"
+
+# Precompressed siblings written by db/precompress.py, in order of preference
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Proxy cache: seconds a response is fresh, per request path prefix
+CACHE_TTLS = {
+    '/feeds/': 300,
+    '/api/': 60,
+}
+# How long past its TTL a response may still be served while it is refreshed
+CACHE_STALE_SECONDS = 3600
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Proxied bodies are relayed in chunks of this size as they arrive
+STREAM_CHUNK_SIZE = 64 * 1024
+# Request headers forwarded upstream; any of the last four bypasses the cache
+FORWARDED_REQUEST_HEADERS = ('Accept-Encoding', 'Range', 'If-Range', 'If-None-Match', 'If-Modified-Since')
+UNCACHED_REQUEST_HEADERS = ('Range', 'If-Range', 'If-None-Match', 'If-Modified-Since')
+# Upstream response headers relayed to the client
+FORWARDED_RESPONSE_HEADERS = ('Content-Type', 'Content-Length', 'Content-Range', 'Content-Encoding',
+                              'Accept-Ranges', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires')
+
+
+class UpstreamError(Exception):
+    def __init__(self, code, reason):
+        super().__init__(f"{code} {reason}")
+        self.code = code
+        self.reason = reason
+
+
+class UpstreamResponse:
+    """
+    An upstream response whose body is read incrementally.
+    The connection goes back to the pool once the body was read to the end;
+    a response abandoned halfway closes its connection instead.
+    """
+
+    def __init__(self, pool, pool_key, conn, response):
+        self._pool = pool
+        self._pool_key = pool_key
+        self._conn = conn
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def iter_chunks(self, chunk_size=STREAM_CHUNK_SIZE):
+        """Yield body chunks as soon as they arrive."""
+        while True:
+            chunk = self._response.read1(chunk_size)
+            if not chunk:
+                # read1 returns b'' on a premature close rather than raising
+                if self._response.length:
+                    raise http.client.IncompleteRead(b'', self._response.length)
+                break
+            yield chunk
+
+    def read_all(self):
+        try:
+            return self._response.read()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._conn is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            self._pool._put(*self._pool_key, self._conn)
+        else:
+            self._conn.close()
+        self._conn = None
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to upstream hosts, at most `max_size` idle per host.
+    Follows redirects (like urllib did) and retries once on a fresh connection
+    when a reused one turns out to have been closed by the server.
+    """
+
+    def __init__(self, max_size=UPSTREAM_CONNECTIONS, timeout=30):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, scheme, host):
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_class(host, timeout=self.timeout)
+
+    def _get(self, scheme, host):
+        """Return (connection, reused) - an idle connection if one is available."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), queue.LifoQueue())
+        try:
+            return idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(scheme, host), False
+
+    def _put(self, scheme, host, conn):
+        idle = self._idle[(scheme, host)]
+        if idle.qsize() < self.max_size:
+            idle.put(conn)
+        else:
+            conn.close()
+
+    def open(self, method, url, body=None, headers=None, max_redirects=5):
+        """Send a request, following redirects, and return the UpstreamResponse (body unread)."""
+        headers = dict(headers or {})
+        for _ in range(max_redirects + 1):
+            parts = urllib.parse.urlsplit(url)
+            path = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+            upstream = self._open(parts.scheme, parts.netloc, method, path, body, headers)
+            location = upstream.headers.get('Location')
+            if upstream.status in (301, 302, 303, 307, 308) and location:
+                upstream.read_all()
+                url = urllib.parse.urljoin(url, location)
+                if upstream.status in (301, 302, 303) and method != 'GET':
+                    method, body = 'GET', None
+                    headers.pop('Content-Type', None)
+                continue
+            return upstream
+        raise UpstreamError(502, 'Too many redirects')
+
+    def request(self, method, url, body=None, headers=None):
+        """Return (status, reason, headers, body) for a request, following redirects."""
+        upstream = self.open(method, url, body, headers)
+        return upstream.status, upstream.reason, upstream.headers, upstream.read_all()
+
+    def _open(self, scheme, host, method, path, body, headers):
+        conn, reused = self._get(scheme, host)
+        try:
+            try:
+                response = self._start(conn, method, path, body, headers)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # Stale keep-alive connection: retry once on a fresh one
+                conn.close()
+                conn = self._new_connection(scheme, host)
+                response = self._start(conn, method, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+        return UpstreamResponse(self, (scheme, host), conn, response)
+
+    @staticmethod
+    def _start(conn, method, path, body, headers):
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+
+UPSTREAM = ConnectionPool()
+
+
+class CachedResponse:
+    __slots__ = ('headers', 'data', 'stored_at', 'ttl')
+
+    def __init__(self, headers, data, ttl):
+        self.headers = headers
+        self.data = data
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of proxied responses, bounded by total body size.
+    get() returns the entry and 'HIT' while it is fresh, 'STALE' for up to
+    `stale_seconds` after its TTL, and (None, 'MISS') otherwise.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, stale_seconds=CACHE_STALE_SECONDS):
+        self.max_bytes = max_bytes
+        self.stale_seconds = stale_seconds
+        self._entries = OrderedDict()
+        self._size = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, 'MISS'
+            age = time.monotonic() - entry.stored_at
+            if age > entry.ttl + self.stale_seconds:
+                self._remove(key)
+                return None, 'MISS'
+            self._entries.move_to_end(key)
+            return entry, ('HIT' if age <= entry.ttl else 'STALE')
+
+    @property
+    def max_entry_bytes(self):
+        """Largest body worth buffering for the cache while streaming it."""
+        return self.max_bytes // 8
+
+    def put(self, key, headers, data, ttl):
+        if len(data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedResponse(headers, data, ttl)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= len(entry.data)
+
+    def stats(self):
+        """(entries, total body bytes) currently cached."""
+        with self._lock:
+            return len(self._entries), self._size
+
+    def refresh_in_background(self, key, fetch, ttl):
+        """Re-fetch a stale entry on a background thread, once per key at a time."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                headers, data = fetch()
+                self.put(key, headers, data, ttl)
+            except Exception as e:
+                print(f"Cache refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+RESPONSE_CACHE = ResponseCache()
+METRICS = Metrics(namespace='dharmaseed_server')
+METRICS.describe('requests_in_flight', 'Requests being handled')
+METRICS.describe('request_duration_seconds', 'Time to handle a request, by route')
+METRICS.describe('upstream_duration_seconds', 'Time to the upstream response headers of a proxied request')
+METRICS.describe('proxy_cache_total', 'Proxy cache lookups by result (BYPASS: not cacheable)')
+METRICS.describe('proxy_cache_hit_ratio', 'Share of cacheable proxy requests served from the cache (HIT or STALE)')
+
+
+def cache_ttl_for(path):
+    """TTL in seconds for a request path, or 0 if it should not be cached."""
+    for prefix, ttl in CACHE_TTLS.items():
+        if path.startswith(prefix):
+            return ttl
+    return 0
+
+
+def request_route(path):
+    """Metric label for a request path: talks, feeds, api, db, metrics or static."""
+    path = urllib.parse.urlsplit(path).path
+    if path.rstrip('/') == TALKS_API_PATH:
+        return 'talks'
+    if path == METRICS_PATH:
+        return 'metrics'
+    for prefix in ('feeds', 'api', 'db'):
+        if path.startswith(f'/{prefix}/'):
+            return prefix
+    return 'static'
+
+
+def forwarded_response_headers(upstream_headers):
+    return [(name, upstream_headers[name]) for name in FORWARDED_RESPONSE_HEADERS if name in upstream_headers]
+
+
+def fetch_upstream(method, target_url, body, headers):
+    """Fetch a complete 200 response; returns (forwarded headers, data) or raises UpstreamError."""
+    status, reason, response_headers, data = UPSTREAM.request(method, target_url, body, headers)
+    if status != 200:
+        raise UpstreamError(status, reason)
+    return forwarded_response_headers(response_headers), data
+
+
+class FileETags:
+    """Content-hash ETags for files, recomputed only when size or mtime change."""
+
+    def __init__(self):
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:20]
+        with self._lock:
+            self._etags[path] = (version, etag)
+        return etag
+
+
+FILE_ETAGS = FileETags()
+
+
+def accepted_encodings(header):
+    """
+    Content codings from an Accept-Encoding header, minus those with q=0.
+    A malformed q-value counts as q=1; other parameters are ignored.
+    """
+    accepted = set()
+    for part in (header or '').split(','):
+        name, *params = part.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    pass
+        if quality == 0:
+            continue
+        if name.strip():
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def js_parse_int(value):
+    """parseInt() semantics: leading integer of a string, or None for NaN."""
+    match = re.match(r'\s*([+-]?\d+)', value or '')
+    return int(match.group(1)) if match else None
+
+
+# One build of the TalksIndex tables, never modified after it is published
+TalksSnapshot = namedtuple('TalksSnapshot', ['mtimes', 'by_id', 'ordered', 'by_teacher', 'text'])
+
+
+class TalksIndex:
+    """
+    In-memory talk corpus for the local /talks endpoint: an id dict, talks in
+    date order, per-teacher lists in date order, and lowercased + folded
+    search text per talk. Rebuilt when the JSON files change on disk; a
+    rebuild replaces the whole snapshot at once, so a query never sees
+    tables from two different builds.
+    """
+
+    DANA_RE = re.compile(r'(?<!ve)dana', re.IGNORECASE)
+
+    def __init__(self, talks_file, teachers_file):
+        self.talks_file = talks_file
+        self.teachers_file = teachers_file
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Return the current snapshot, rebuilding it first if the files changed."""
+        mtimes = (os.path.getmtime(self.talks_file), os.path.getmtime(self.teachers_file))
+        snapshot = self.snapshot
+        if snapshot and snapshot.mtimes == mtimes:
+            return snapshot
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot and snapshot.mtimes == mtimes:
+                return snapshot
+            with open(self.talks_file, 'r', encoding='utf-8') as f:
+                talks = json.load(f)
+            with open(self.teachers_file, 'r', encoding='utf-8') as f:
+                teacher_names = {t['id']: t.get('name') or '' for t in json.load(f).get('teachers', [])}
+            
+            ordered = date_order(talks)
+            by_teacher = {}
+            text = {}
+            for talk in ordered:
+                by_teacher.setdefault(talk.get('teacher_id'), []).append(talk)
+                title = (talk.get('title') or '').lower()
+                desc = (talk.get('description') or '').lower()
+                teacher = teacher_names.get(talk.get('teacher_id'), '').lower()
+                text[talk['id']] = (title, fold_text(title), desc, fold_text(desc),
+                                    teacher, fold_text(teacher), (talk.get('rec_date') or '').lower())
+            
+            by_id = {}
+            for talk in talks:
+                by_id.setdefault(talk['id'], talk)
+            self.snapshot = TalksSnapshot(mtimes, by_id, ordered, by_teacher, text)
+            print(f"[Talks] Indexed {len(talks)} talks")
+            return self.snapshot
+
+    @staticmethod
+    def _recording_type_matches(talk, recording_type):
+        kind = (talk.get('recording_type') or '').lower()
+        if recording_type == 'talk':
+            return kind == 'talk'
+        if recording_type == 'meditation':
+            return kind in ('meditation', 'guided meditation')
+        if recording_type == 'other':
+            return kind not in ('talk', 'meditation', 'guided meditation')
+        return True
+
+    def _category_matches(self, text, text_folded, term, term_folded):
+        # "dana" must not match inside "vedana"
+        if term_folded == 'dana':
+            return bool(self.DANA_RE.search(text) or self.DANA_RE.search(text_folded))
+        return term in text or term_folded in text_folded
+
+    def query(self, params):
+        """Answer a talks.js query; returns (status code, response object)."""
+        index = self._ensure_loaded()
+        limit = min(js_parse_int(params.get('limit')) or 50, 500)
+        offset = js_parse_int(params.get('offset')) or 0
+        teacher_id = js_parse_int(params.get('teacher_id')) if params.get('teacher_id') else None
+        search = params.get('search', '').lower() or None
+        categories = params.get('categories', '').lower() or None
+        talk_id = js_parse_int(params.get('id')) if params.get('id') else None
+        recording_type = params.get('recording_type', '').lower() or None
+        
+        if talk_id:
+            talk = index.by_id.get(talk_id)
+            if talk:
+                return 200, {'talk': talk}
+            return 404, {'error': 'Talk not found'}
+        
+        # Start from the narrowest pre-sorted list
+        filtered = index.by_teacher.get(teacher_id, []) if teacher_id else index.ordered
+        
+        if recording_type:
+            filtered = [t for t in filtered if self._recording_type_matches(t, recording_type)]
+        
+        if categories:
+            terms = [(term, fold_text(term)) for term in categories.split()]
+            def matches_categories(talk):
+                title, title_f, desc, desc_f = index.text[talk['id']][:4]
+                return all(self._category_matches(title, title_f, term, term_f) or
+                           self._category_matches(desc, desc_f, term, term_f)
+                           for term, term_f in terms)
+            filtered = [t for t in filtered if matches_categories(t)]
+        
+        if search:
+            terms = [(term, fold_text(term)) for term in search.split()]
+            def matches_search(talk):
+                title, title_f, desc, desc_f, teacher, teacher_f, date = index.text[talk['id']]
+                return all(term in title or term_f in title_f or term in desc or term_f in desc_f or
+                           term in teacher or term_f in teacher_f or term in date
+                           for term, term_f in terms)
+            filtered = [t for t in filtered if matches_search(t)]
+        
+        total = len(filtered)
+        return 200, {
+            'talks': filtered[offset:offset + limit],
+            'total': total,
+            'limit': limit,
+            'offset': offset,
+            'hasMore': offset + limit < total,
+        }
+
+
+TALKS_INDEX = TalksIndex(
+    os.path.join(Path(__file__).parent, 'db', 'dharmaseed_talks.json'),
+    os.path.join(Path(__file__).parent, 'db', 'dharmaseed_teachers.json'),
+)
+
+
+class PooledHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """HTTP server that handles requests on a fixed-size pool of worker threads."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers=WORKERS):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='worker')
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 class ProxyHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         # Serve from current directory
         super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
     
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+    
+    @contextmanager
+    def track_request(self, route):
+        """Count the request as in flight, then record its latency and status."""
+        self.response_status = None
+        METRICS.add('requests_in_flight', 1)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            METRICS.add('requests_in_flight', -1)
+            METRICS.observe('request_duration_seconds', time.perf_counter() - started, route=route)
+            METRICS.inc('responses_total', route=route, status=self.response_status or 'none')
+    
     def do_GET(self):
-        # Proxy RSS feed requests
-        if self.path.startswith('/feeds/'):
-            self.proxy_request(DHARMASEED_BASE + self.path)
-        # Proxy API requests
-        elif self.path.startswith('/api/'):
-            api_path = self.path[5:]  # Remove '/api/' prefix
-            self.proxy_request(DHARMASEED_BASE + '/api/1/' + api_path)
-        else:
-            # Serve static files
-            super().do_GET()
+        route = request_route(self.path)
+        with self.track_request(route):
+            # Local equivalent of the Netlify talks function
+            if route == 'talks':
+                self.serve_talks_api()
+            elif route == 'metrics':
+                self.serve_metrics()
+            # Proxy RSS feed requests
+            elif route == 'feeds':
+                self.proxy_request(DHARMASEED_BASE + self.path)
+            # Proxy API requests
+            elif route == 'api':
+                api_path = self.path[5:]  # Remove '/api/' prefix
+                self.proxy_request(DHARMASEED_BASE + '/api/1/' + api_path)
+            # Data artifacts: validated and precompressed
+            elif route == 'db' and urllib.parse.urlsplit(self.path).path.endswith('.json'):
+                self.serve_db_json()
+            else:
+                # Serve static files
+                super().do_GET()
     
     def do_POST(self):
-        # Proxy API requests
-        if self.path.startswith('/api/'):
-            api_path = self.path[5:]  # Remove '/api/' prefix
-            self.proxy_request(DHARMASEED_BASE + '/api/1/' + api_path)
+        route = request_route(self.path)
+        with self.track_request(route):
+            # Proxy API requests
+            if route == 'api':
+                api_path = self.path[5:]  # Remove '/api/' prefix
+                self.proxy_request(DHARMASEED_BASE + '/api/1/' + api_path)
+            else:
+                self.send_error(404, "Not Found")
+    
+    def serve_metrics(self):
+        entries, size = RESPONSE_CACHE.stats()
+        METRICS.set('proxy_cache_entries', entries)
+        METRICS.set('proxy_cache_bytes', size)
+        served = METRICS.value('proxy_cache_total', result='HIT') + METRICS.value('proxy_cache_total', result='STALE')
+        lookups = served + METRICS.value('proxy_cache_total', result='MISS')
+        METRICS.set('proxy_cache_hit_ratio', served / lookups if lookups else 0)
+        
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        if query.get('format') == ['json']:
+            data, content_type = METRICS.to_json().encode('utf-8'), 'application/json'
         else:
-            self.send_error(404, "Not Found")
+            data, content_type = METRICS.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', len(data))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def serve_db_json(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().do_GET()
+        
+        # Pick a precompressed sibling the client accepts (ignoring stale ones)
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        encoding, body_path = None, path
+        for name, suffix in PRECOMPRESSED_ENCODINGS:
+            candidate = path + suffix
+            if (name in accepted and os.path.isfile(candidate)
+                    and os.path.getmtime(candidate) >= os.path.getmtime(path)):
+                encoding, body_path = name, candidate
+                break
+        
+        digest = FILE_ETAGS.get(path)
+        etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+        if_none_match = self.headers.get('If-None-Match', '')
+        client_etags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        not_modified = '*' in client_etags or etag in client_etags
+        
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Cache-Control', 'no-cache')
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', os.path.getsize(body_path))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        with open(body_path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile)
+    
+    def serve_talks_api(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        params = {name: values[-1] for name, values in query.items()}
+        try:
+            status, result = TALKS_INDEX.query(params)
+        except Exception as e:
+            print(f"Talks API error: {e}")
+            status, result = 500, {'error': 'Internal server error'}
+        data = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(data))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Cache-Control', 'public, max-age=300')
+        self.end_headers()
+        self.wfile.write(data)
     
     def proxy_request(self, target_url):
+        self.proxy_headers_sent = False
         try:
             # Read POST body if present
             content_length = int(self.headers.get('Content-Length', 0))
             body = self.rfile.read(content_length) if content_length > 0 else None
             
-            # Create request
-            req = urllib.request.Request(target_url, data=body)
-            
             # Copy relevant headers
+            headers = {'User-Agent': 'dharmaseed-player-dev-proxy'}
             if body:
-                content_type = self.headers.get('Content-Type', 'application/x-www-form-urlencoded')
-                req.add_header('Content-Type', content_type)
+                headers['Content-Type'] = self.headers.get('Content-Type', 'application/x-www-form-urlencoded')
+            for name in FORWARDED_REQUEST_HEADERS:
+                if name in self.headers:
+                    headers[name] = self.headers[name]
             
-            # Make request to Dharmaseed
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = response.read()
-                content_type = response.headers.get('Content-Type', 'application/octet-stream')
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', content_type)
-                self.send_header('Content-Length', len(data))
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(data)
+            def fetch():
+                return fetch_upstream(self.command, target_url, body, headers)
+            
+            # Serve from the cache when possible, refreshing stale entries in the background.
+            # Range and conditional requests always go upstream.
+            key = (self.command, target_url, body or b'', headers.get('Accept-Encoding', ''))
+            cacheable = RESPONSE_CACHE.max_bytes > 0 and not any(h in headers for h in UNCACHED_REQUEST_HEADERS)
+            ttl = cache_ttl_for(self.path) if cacheable else 0
+            cached, cache_status = RESPONSE_CACHE.get(key) if ttl else (None, 'MISS')
+            METRICS.inc('proxy_cache_total', result=cache_status if ttl else 'BYPASS')
+            if cached:
+                if cache_status == 'STALE':
+                    RESPONSE_CACHE.refresh_in_background(key, fetch, ttl)
+                response_headers = [(n, v) for n, v in cached.headers if n != 'Content-Length']
+                response_headers.append(('Content-Length', str(len(cached.data))))
+                self.send_proxy_headers(200, response_headers, cache_status)
+                self.wfile.write(cached.data)
+                return
+            
+            # Make request to Dharmaseed over a pooled keep-alive connection and stream it back
+            route = request_route(self.path)
+            with METRICS.timer('upstream_duration_seconds', route=route):
+                upstream = UPSTREAM.open(self.command, target_url, body, headers)
+            METRICS.inc('upstream_responses_total', route=route, status=upstream.status)
+            self.relay_upstream(upstream, key, ttl)
                 
-        except urllib.error.HTTPError as e:
+        except UpstreamError as e:
             self.send_error(e.code, str(e.reason))
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away mid-response
+            pass
         except Exception as e:
             print(f"Proxy error: {e}")
+            if self.proxy_headers_sent:
+                # Too late for an error response: drop the connection so the
+                # client sees a truncated body instead of a 500 glued onto it
+                self.close_connection = True
+                return
             self.send_error(500, str(e))
     
+    def relay_upstream(self, upstream, key, ttl):
+        """
+        Pass an upstream response through chunk by chunk (status, range and
+        validator headers included), buffering it for the cache only if it
+        is a small enough 200.
+        """
+        try:
+            if upstream.status >= 400:
+                raise UpstreamError(upstream.status, upstream.reason)
+            response_headers = forwarded_response_headers(upstream.headers)
+            self.send_proxy_headers(upstream.status, response_headers, 'MISS')
+            if upstream.status == 304:
+                return
+            
+            buffered = [] if ttl and upstream.status == 200 else None
+            buffered_size = 0
+            for chunk in upstream.iter_chunks():
+                self.wfile.write(chunk)
+                if buffered is not None:
+                    buffered_size += len(chunk)
+                    if buffered_size > RESPONSE_CACHE.max_entry_bytes:
+                        buffered = None
+                    else:
+                        buffered.append(chunk)
+            if buffered is not None:
+                RESPONSE_CACHE.put(key, response_headers, b''.join(buffered), ttl)
+        finally:
+            upstream.close()
+    
+    def send_proxy_headers(self, status, response_headers, cache_status):
+        # Set first: once a status line is buffered, send_error can no longer be used
+        self.proxy_headers_sent = True
+        self.send_response(status)
+        for name, value in response_headers:
+            self.send_header(name, value)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Cache', cache_status)
+        self.end_headers()
+    
     def do_OPTIONS(self):
         # Handle CORS preflight
         self.send_response(200)
@@ -88,18 +766,42 @@ class ProxyHandler(http.server.SimpleHTTPRequestHandler):
             print(f"[RSS] {path}")
         elif '/api/' in path:
             print(f"[API] {path}")
+        elif TALKS_API_PATH in path:
+            print(f"[Talks] {path}")
+        elif f' {METRICS_PATH}' in path:
+            # Scraped periodically; not worth a line each time
+            pass
         elif not any(x in path for x in ['.js', '.css', '.json', '.svg', '.png', '.ico']):
             print(f"[Static] {path}")
 
 def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Local Dharmaseed player server with proxy")
+    parser.add_argument("--port", "-p", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument("--workers", "-w", type=int, default=WORKERS,
+                        help=f"Worker threads handling requests (default: {WORKERS})")
+    parser.add_argument("--upstream-connections", type=int, default=UPSTREAM_CONNECTIONS,
+                        help=f"Idle keep-alive connections kept to dharmaseed.org (default: {UPSTREAM_CONNECTIONS})")
+    parser.add_argument("--cache-mb", type=float, default=CACHE_MAX_BYTES / (1024 * 1024),
+                        help="Memory cap for cached proxy responses in MB, 0 disables the cache "
+                             f"(default: {CACHE_MAX_BYTES // (1024 * 1024)})")
+    args = parser.parse_args()
+    
     os.chdir(Path(__file__).parent)
+    UPSTREAM.max_size = args.upstream_connections
+    RESPONSE_CACHE.max_bytes = int(args.cache_mb * 1024 * 1024)
     
-    with socketserver.TCPServer(("", PORT), ProxyHandler) as httpd:
+    with PooledHTTPServer(("", args.port), ProxyHandler, workers=args.workers) as httpd:
         print(f"\n🧘 Dharmaseed Player Server")
-        print(f"   http://localhost:{PORT}")
+        print(f"   http://localhost:{args.port}")
         print(f"\n   Static files: ./")
         print(f"   RSS proxy:    /feeds/* → dharmaseed.org/feeds/*")
         print(f"   API proxy:    /api/* → dharmaseed.org/api/1/*")
+        print(f"   Talks API:    {TALKS_API_PATH} (local, from db/*.json)")
+        print(f"   Metrics:      {METRICS_PATH} (Prometheus text, ?format=json)")
+        print(f"   Workers:      {args.workers} threads, {args.upstream_connections} upstream connections")
+        print(f"   Proxy cache:  {args.cache_mb:g} MB")
         print(f"\n   Press Ctrl+C to stop\n")
         
         try: